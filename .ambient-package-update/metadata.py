@@ -44,5 +44,8 @@ METADATA = PackageMetadata(
         RuffIgnoredInspection(key="TD003", comment="Missing issue link on the line following this TODO"),
         RuffIgnoredInspection(key="PERF401", comment="Use `list.extend` to create a transformed list"),
     ],
-    script_executables=[ScriptExecutable(name="boa-restrictor", import_path="boa_restrictor.cli.main:main")],
+    script_executables=[
+        ScriptExecutable(name="boa-restrictor", import_path="boa_restrictor.cli.main:main"),
+        ScriptExecutable(name="boa-restrictor-client", import_path="boa_restrictor.cli.client:main"),
+    ],
 )
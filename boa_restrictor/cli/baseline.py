@@ -0,0 +1,110 @@
+import hashlib
+import json
+import os
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+
+from boa_restrictor.cli.path_filter import RelativePathResolver
+from boa_restrictor.exceptions.baseline import InvalidBaselineError
+from boa_restrictor.projections.occurrence import Occurrence
+
+# Bump whenever the fingerprints change, so outdated baselines are rejected instead of suppressing nothing
+BASELINE_VERSION = 1
+
+
+class Baseline:
+    """
+    The fingerprints of known occurrences, which aren't reported anymore.
+
+    A fingerprint hashes the rule ID, the file's path relative to the configuration's directory, the identifier and
+    the content of the occurrence's line (ignoring whitespace), but not the line number, so occurrences stay known
+    while lines are added or removed around them. If several occurrences share all of these, the fingerprint of each
+    one includes how many of them came before, so a new duplicate of a known occurrence is still reported.
+    """
+
+    def __init__(self, *, relative_path_resolver: RelativePathResolver, fingerprints: Iterable[str] = ()):
+        self.relative_path_resolver = relative_path_resolver
+        self.fingerprints = set(fingerprints)
+
+    @classmethod
+    def load(cls, *, path: Path, relative_path_resolver: RelativePathResolver) -> "Baseline":
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError as e:
+            raise InvalidBaselineError(
+                path=str(path), reason='it doesn\'t exist, create it via "--write-baseline"'
+            ) from e
+        except (OSError, ValueError) as e:
+            raise InvalidBaselineError(path=str(path), reason=str(e)) from e
+
+        if not isinstance(data, dict) or data.get("version") != BASELINE_VERSION:
+            raise InvalidBaselineError(path=str(path), reason='it is outdated, recreate it via "--write-baseline"')
+        return cls(relative_path_resolver=relative_path_resolver, fingerprints=data["fingerprints"])
+
+    def save(self, *, path: Path) -> None:
+        # Written to a temporary file first and moved over the baseline, so an interrupted run never leaves a truncated
+        # baseline behind. Unlike `write_json_atomically()`, the file is created with the usual permissions, since it's
+        # meant to be committed.
+        temporary_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            with open(temporary_path, "w", encoding="utf-8") as f:
+                json.dump({"version": BASELINE_VERSION, "fingerprints": sorted(self.fingerprints)}, f, indent=0)
+                f.write("\n")
+            os.replace(temporary_path, path)
+        except BaseException:
+            temporary_path.unlink(missing_ok=True)
+            raise
+
+    def add(self, *, occurrences: Sequence[Occurrence]) -> None:
+        """
+        Add the given occurrences of a single file.
+        """
+        self.fingerprints.update(self.compute_fingerprints(occurrences=occurrences))
+
+    def filter_new_occurrences(self, *, occurrences: Sequence[Occurrence]) -> list[Occurrence]:
+        """
+        Returns the given occurrences of a single file which aren't known.
+        """
+        if not occurrences or not self.fingerprints:
+            return list(occurrences)
+        return [
+            occurrence
+            for occurrence, fingerprint in zip(
+                occurrences, self.compute_fingerprints(occurrences=occurrences), strict=True
+            )
+            if fingerprint not in self.fingerprints
+        ]
+
+    def compute_fingerprints(self, *, occurrences: Sequence[Occurrence]) -> list[str]:
+        """
+        Returns the fingerprints of the given occurrences of a single file.
+        """
+        if not occurrences:
+            return []
+
+        filename = str(occurrences[0].file_path)
+        relative_path = self.relative_path_resolver.get_relative_path(filename=filename)
+        if relative_path is None:
+            relative_path = os.path.normpath(filename).replace(os.sep, "/")
+        lines = _read_lines(filename=filename)
+
+        fingerprints = []
+        seen_keys: dict[tuple, int] = {}
+        for occurrence in occurrences:
+            line = lines[occurrence.line_number - 1] if 0 < occurrence.line_number <= len(lines) else ""
+            key = (occurrence.rule_id, relative_path, occurrence.identifier or "", " ".join(line.split()))
+            duplicate_count = seen_keys.get(key, 0)
+            seen_keys[key] = duplicate_count + 1
+            fingerprints.append(hashlib.blake2b(repr((*key, duplicate_count)).encode(), digest_size=8).hexdigest())
+        return fingerprints
+
+
+def _read_lines(*, filename: str) -> list[str]:
+    # Reading in text mode turns "\r\n" and "\r" into "\n", which are the only line breaks the AST's line numbers
+    # count. `str.splitlines()` would also split on e.g. "\x0c" or "\u2028", shifting all following lines.
+    try:
+        with open(filename, encoding="utf-8", errors="replace") as f:
+            return f.read().split("\n")
+    except OSError:
+        return []
@@ -0,0 +1,257 @@
+import dataclasses
+import hashlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+from boa_restrictor import __version__
+from boa_restrictor.cli.custom_rules import get_custom_rule_source_files
+from boa_restrictor.cli.path_filter import RelativePathResolver
+from boa_restrictor.common.rule import Rule
+from boa_restrictor.projections.occurrence import Occurrence
+
+# Bump whenever the layout of the cache directory or its entries changes
+CACHE_FORMAT_VERSION = 2
+
+# Once all entries together exceed this size, the least recently used ones are evicted
+DEFAULT_CACHE_MAX_SIZE = 64 * 1024 * 1024
+
+# A file modified this shortly before it was looked at might be modified again within the same mtime tick without
+# changing its size. We don't remember the stat of such files, so the next run hashes their content again.
+RACY_MTIME_WINDOW_NS = 2_000_000_000
+
+STAT_INDEX_FILENAME = "stat_index.json"
+ENTRIES_DIRNAME = "entries"
+
+
+def compute_run_fingerprint(*, configuration: dict, rules: tuple[type[Rule], ...]) -> str:
+    """
+    Hash everything besides a file's content which the occurrences of a file depend on: the boa-restrictor and
+    Python versions, the enabled rules, the source code of all custom rules and the effective configuration.
+    """
+    custom_rule_sources = {}
+    for rule_id, source_file in get_custom_rule_source_files(rules=rules).items():
+        try:
+            custom_rule_sources[rule_id] = hashlib.sha256(Path(source_file).read_bytes()).hexdigest()
+        except (OSError, TypeError):
+            # Without a source file, we can't tell whether the rule changed. Never reuse such results.
+            custom_rule_sources[rule_id] = os.urandom(16).hex()
+
+    fingerprint = json.dumps(
+        {
+            "format": CACHE_FORMAT_VERSION,
+            "version": __version__,
+            "python": list(sys.version_info[:2]),
+            "rules": [rule_class.RULE_ID for rule_class in rules],
+            "custom_rule_sources": custom_rule_sources,
+            "configuration": configuration,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(fingerprint.encode()).hexdigest()
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class CacheLookup:
+    """
+    The result of looking up a file in the cache. `occurrences` is None if the file has to be linted.
+    """
+
+    key: str
+    occurrences: list[Occurrence] | None
+
+
+class ResultCache:
+    """
+    On-disk cache of the occurrences of a file, keyed by the file's path relative to the configuration's directory,
+    its content hash, the rules running on it and the fingerprint of the run (see `compute_run_fingerprint()`). Rules
+    may depend on the path of a file, so files with the same content don't share their results.
+
+    A stat index remembers the modification time, size and content hash of every file seen, so unchanged files
+    aren't even read. Entries are bumped on every hit and the least recently used ones are evicted once all entries
+    together exceed `max_size` bytes.
+    """
+
+    def __init__(
+        self,
+        *,
+        cache_dir: Path,
+        run_fingerprint: str,
+        relative_path_resolver: RelativePathResolver,
+        max_size: int = DEFAULT_CACHE_MAX_SIZE,
+    ):
+        self.cache_dir = cache_dir
+        self.run_fingerprint = run_fingerprint
+        self.relative_path_resolver = relative_path_resolver
+        self.max_size = max_size
+        self.entries_dir = cache_dir / ENTRIES_DIRNAME
+
+        self._stat_index = self._load_stat_index()
+        self._updated_stat_records: dict[str, list] = {}
+        self._missing_paths: set[str] = set()
+        self._entries_stored = False
+
+    def lookup(self, *, file_path: Path, rule_ids: tuple[str, ...]) -> CacheLookup:
+        """
+        Look up the occurrences of the given file, linted with the given rules.
+        """
+        content_hash = self._get_content_hash(file_path=file_path)
+        # Files outside the configuration's directory are keyed by their absolute path
+        relative_path = self.relative_path_resolver.get_relative_path(filename=str(file_path)) or os.path.abspath(
+            file_path
+        )
+        key = hashlib.sha256(
+            f"{self.run_fingerprint}:{','.join(rule_ids)}:{relative_path}:{content_hash}".encode()
+        ).hexdigest()
+
+        entry_path = self.entries_dir / f"{key}.json"
+        try:
+            with open(entry_path) as f:
+                serialized_occurrences = json.load(f)
+        except (OSError, ValueError):
+            return CacheLookup(key=key, occurrences=None)
+
+        # Mark the entry as recently used
+        os.utime(entry_path)
+
+        return CacheLookup(
+            key=key,
+            occurrences=[
+                Occurrence(
+                    rule_id=rule_id,
+                    rule_label=rule_label,
+                    filename=file_path.name,
+                    file_path=file_path,
+                    identifier=identifier,
+                    line_number=line_number,
+                )
+                for rule_id, rule_label, identifier, line_number in serialized_occurrences
+            ],
+        )
+
+    def store(self, *, lookup: CacheLookup, occurrences: list[Occurrence]) -> None:
+        """
+        Store the occurrences of the file looked up via `lookup`.
+        Occurrences always refer to the file they were looked up for, so the file's path isn't stored.
+        """
+        serialized_occurrences = [
+            [occurrence.rule_id, occurrence.rule_label, occurrence.identifier, occurrence.line_number]
+            for occurrence in occurrences
+        ]
+        self._ensure_cache_dir()
+        self.entries_dir.mkdir(exist_ok=True)
+        self._write_atomically(path=self.entries_dir / f"{lookup.key}.json", data=serialized_occurrences)
+        self._entries_stored = True
+
+    def save(self) -> None:
+        """
+        Persist the stat index and evict the least recently used entries if the cache grew too big.
+        """
+        if self._updated_stat_records or self._missing_paths:
+            # Other processes might have updated the index in the meantime, don't throw their records away
+            stat_index = self._load_stat_index()
+            stat_index.update(self._updated_stat_records)
+            # Forget the files found deleted or moved during this run. Checking all other files would cost a stat
+            # call per indexed file on every run.
+            for path in self._missing_paths:
+                stat_index.pop(path, None)
+            self._write_atomically(path=self.cache_dir / STAT_INDEX_FILENAME, data=stat_index)
+            self._updated_stat_records = {}
+            self._missing_paths = set()
+
+        if self._entries_stored:
+            self._evict_least_recently_used_entries()
+            self._entries_stored = False
+
+    def _get_content_hash(self, *, file_path: Path) -> str:
+        index_key = os.path.abspath(file_path)
+        try:
+            stat_result = os.stat(file_path)
+        except FileNotFoundError:
+            self._stat_index.pop(index_key, None)
+            self._updated_stat_records.pop(index_key, None)
+            self._missing_paths.add(index_key)
+            raise
+
+        # Fast path: the file didn't change since we hashed it last time
+        stat_record = self._stat_index.get(index_key)
+        if stat_record is not None and stat_record[:2] == [stat_result.st_mtime_ns, stat_result.st_size]:
+            return stat_record[2]
+
+        with open(file_path, "rb") as f:
+            content_hash = hashlib.sha256(f.read()).hexdigest()
+
+        if time.time_ns() - stat_result.st_mtime_ns > RACY_MTIME_WINDOW_NS:
+            stat_record = [stat_result.st_mtime_ns, stat_result.st_size, content_hash]
+            self._stat_index[index_key] = stat_record
+            self._updated_stat_records[index_key] = stat_record
+
+        return content_hash
+
+    def _load_stat_index(self) -> dict[str, list]:
+        try:
+            with open(self.cache_dir / STAT_INDEX_FILENAME) as f:
+                stat_index = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return stat_index if isinstance(stat_index, dict) else {}
+
+    def _evict_least_recently_used_entries(self) -> None:
+        entries = []
+        total_size = 0
+        with os.scandir(self.entries_dir) as directory_entries:
+            for directory_entry in directory_entries:
+                try:
+                    stat_result = directory_entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat_result.st_mtime_ns, stat_result.st_size, directory_entry.path))
+                total_size += stat_result.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total_size <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total_size -= size
+
+    def _write_atomically(self, *, path: Path, data) -> None:
+        ensure_cache_dir(cache_dir=self.cache_dir)
+        write_json_atomically(path=path, data=data)
+
+    def _ensure_cache_dir(self) -> None:
+        ensure_cache_dir(cache_dir=self.cache_dir)
+
+
+def ensure_cache_dir(*, cache_dir: Path) -> None:
+    """
+    Create the given cache directory, unless it exists.
+    """
+    if cache_dir.is_dir():
+        return
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    # Keep the cache out of version control
+    (cache_dir / ".gitignore").write_text("*\n")
+
+
+def write_json_atomically(*, path: Path, data) -> None:
+    """
+    Write the given data as JSON to a temporary file first, so concurrent runs never see a half-written file.
+    """
+    # "tempfile" pulls in "shutil" and "random" along with the compression modules, runs which don't write don't need it
+    import tempfile  # noqa: PLC0415
+
+    file_descriptor, temporary_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(file_descriptor, "w") as f:
+            json.dump(data, f)
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.unlink(temporary_path)
+        raise
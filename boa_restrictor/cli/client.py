@@ -0,0 +1,103 @@
+import argparse
+import hashlib
+import json
+import os
+import socket
+import sys
+import tempfile
+from collections.abc import Sequence
+
+# This is the thin client of the boa-restrictor daemon. It deliberately doesn't import any rules or the configuration
+# handling, so it starts fast. If no daemon is running (or it can't serve the request), it lints in-process instead.
+# The daemon only lints with the options it was started with, so any other option (e.g. "--format" or "--jobs") is
+# handled in-process as well, rather than dropping it silently.
+
+# Seconds to wait for the daemon to accept a connection. The request itself may take as long as linting does.
+CONNECT_TIMEOUT = 1.0
+
+
+def get_socket_dir() -> str:
+    """
+    Returns the directory holding the sockets of the current user's daemons: "$XDG_RUNTIME_DIR/boa-restrictor" if
+    available, a user-specific directory within the temporary directory otherwise. See `ensure_socket_dir()` of
+    `boa_restrictor.cli.daemon` for how the daemon makes sure nobody else can place sockets within it.
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "boa-restrictor")
+    return os.path.join(tempfile.gettempdir(), f"boa-restrictor-{os.getuid()}")
+
+
+def get_default_socket_path(*, config_path: str) -> str:
+    """
+    Returns the socket path of the daemon serving the project configured in the given pyproject.toml.
+    Every user and project gets their own daemon.
+    """
+    config_hash = hashlib.sha256(os.path.abspath(config_path).encode()).hexdigest()[:12]
+    return os.path.join(get_socket_dir(), f"{config_hash}.sock")
+
+
+def request_daemon(*, socket_path: str, request: dict) -> dict | None:
+    """
+    Send the request to the daemon and return its response, or None if no daemon is listening.
+    Sockets owned by another user are never connected to, since their "daemon" could answer anything.
+    """
+    try:
+        if os.stat(socket_path).st_uid != os.getuid():
+            return None
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+            connection.settimeout(CONNECT_TIMEOUT)
+            connection.connect(socket_path)
+            connection.settimeout(None)
+            connection.sendall(json.dumps(request).encode() + b"\n")
+            connection.shutdown(socket.SHUT_WR)
+            response = b"".join(iter(lambda: connection.recv(65536), b""))
+    except OSError:
+        return None
+
+    try:
+        return json.loads(response)
+    except ValueError:
+        return None
+
+
+def main(argv: Sequence[str] | None = None):
+    parser = argparse.ArgumentParser(
+        prog="boa-restrictor-client",
+    )
+    parser.add_argument(
+        "filenames",
+        nargs="*",
+        help="Filenames to process.",
+    )
+    parser.add_argument(
+        "--config",
+        default="pyproject.toml",
+        type=str,
+        help="Location of pyproject.toml configuration file",
+    )
+    parser.add_argument(
+        "--socket",
+        default=None,
+        type=str,
+        help="Socket of the daemon. Defaults to the socket of the daemon serving the given configuration.",
+    )
+    args, remaining_args = parser.parse_known_args(argv)
+
+    response = None
+    if not remaining_args:
+        socket_path = args.socket or get_default_socket_path(config_path=args.config)
+        response = request_daemon(
+            socket_path=socket_path,
+            request={"cwd": os.getcwd(), "config": os.path.abspath(args.config), "filenames": args.filenames},
+        )
+
+    # Without a daemon, if it couldn't serve the request or options were given the daemon doesn't know about, lint
+    # in-process. This also reports any errors exactly like a regular run does.
+    if response is None or "error" in response:
+        from boa_restrictor.cli.main import main as lint_in_process  # noqa: PLC0415
+
+        return lint_in_process(argv=[*args.filenames, "--config", args.config, *remaining_args])
+
+    sys.stdout.write(response["output"])
+    return response["has_occurrences"]
@@ -1,12 +1,14 @@
-import fnmatch
-import re
+import dataclasses
 import tomllib
 import warnings
 from pathlib import Path
 
+from boa_restrictor.cli.path_filter import PathFilter, RelativePathResolver
+from boa_restrictor.cli.per_file_excludes import PerFileExcludes
+from boa_restrictor.common.prefilter import KeywordPrefilter
 from boa_restrictor.common.rule import Rule
 from boa_restrictor.exceptions.configuration import TomlParsingError
-from boa_restrictor.rules import get_rules
+from boa_restrictor.rules import get_rule_registrations
 
 
 def load_configuration(*, file_path: Path | str = "pyproject.toml") -> dict:
@@ -28,48 +30,85 @@ def load_configuration(*, file_path: Path | str = "pyproject.toml") -> dict:
         return {}
 
 
-def is_rule_excluded(*, rule_class: type[Rule], excluded_rules: list, active_rule_ids: set[str] | None = None) -> bool:
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class ExecutionPlan:
     """
-    Check if the given rule is in the exclusion list.
-
-    `active_rule_ids` is the set of all known rule IDs (built-in + any project-level custom rules).
-    If omitted, only built-in rules are considered valid.
+    The linting configuration, compiled once per run: the enabled rules which survived the global exclusions, the
+    path filter, the compiled per-file exclusion patterns and the keyword prefilter. Which rules run on a file only
+    depends on which per-file patterns match it, so the resulting rule sets are cached per combination of matched
+    patterns.
     """
-    if active_rule_ids is None:
-        active_rule_ids = {rule_class.RULE_ID for rule_class in get_rules(use_django_rules=True)}
 
-    # Warn for any invalid IDs in the exclusion list, but still honour the valid ones.
-    # An early return here would mean a single typo silently disabled all exclusions.
-    for invalid_configured_rule in [rule_id for rule_id in excluded_rules if rule_id not in active_rule_ids]:
-        warnings.warn(
-            f'Boa Restrictor: Invalid rule "{invalid_configured_rule}" in configuration detected.',
-            category=UserWarning,
-            stacklevel=2,
-        )
+    rules: tuple[type[Rule], ...]
+    path_filter: PathFilter
+    per_file_excludes: PerFileExcludes
+    keyword_prefilter: KeywordPrefilter
+    _rules_by_matched_patterns: dict[frozenset[int], tuple[type[Rule], ...]] = dataclasses.field(
+        default_factory=dict, repr=False, compare=False
+    )
+
+    def rules_for_file(self, *, filename: str) -> tuple[type[Rule], ...]:
+        """
+        Returns all rules which have to run on the given file, judging by its path alone.
+        """
+        if not self.path_filter.is_included(filename=filename):
+            return ()
+
+        matched_patterns = self.per_file_excludes.get_matched_patterns(filename=filename)
 
-    # Check if the given rule is in the exclusion list
-    return rule_class.RULE_ID in excluded_rules
+        if matched_patterns not in self._rules_by_matched_patterns:
+            excluded_rule_ids = set().union(
+                *(self.per_file_excludes.excluded_rule_ids[index] for index in matched_patterns)
+            )
+            self._rules_by_matched_patterns[matched_patterns] = tuple(
+                rule_class for rule_class in self.rules if rule_class.RULE_ID not in excluded_rule_ids
+            )
+
+        file_path = Path(filename)
+        return tuple(
+            rule_class
+            for rule_class in self._rules_by_matched_patterns[matched_patterns]
+            if rule_class.is_applicable(file_path=file_path)
+        )
 
 
-def is_rule_excluded_per_file(
-    *,
-    filename: str,
-    rule_class: type[Rule],
-    per_file_excluded_rules: dict[str, list],
-    active_rule_ids: set[str] | None = None,
-) -> bool:
+def compile_execution_plan(
+    *, configuration: dict, rules: tuple[type[Rule], ...], config_anchor_dir: Path | None = None
+) -> ExecutionPlan:
     """
-    Check if the given rule is in the per-file-exclusion list.
+    Compile the linter configuration for the given (enabled) rules into an execution plan.
+    Paths are matched relative to `config_anchor_dir`, the directory of the configuration (by default the current
+    directory). Invalid rule IDs in the configuration are reported once, right here.
     """
-    # Iterate per-file rule exclusions
-    for file_path_pattern in per_file_excluded_rules.keys():  # noqa: PLC0206
-        # If the filename matches the pattern...
-        if re.search(fnmatch.translate(file_path_pattern), filename):
-            # Skip linters, which have been excluded for this file path pattern
-            if is_rule_excluded(
-                rule_class=rule_class,
-                excluded_rules=per_file_excluded_rules[file_path_pattern],
-                active_rule_ids=active_rule_ids,
-            ):
-                return True
-    return False
+    # Globally excluded built-in rules are never resolved, but their IDs are still valid
+    active_rule_ids = {rule_class.RULE_ID for rule_class in rules} | {
+        rule_registration.rule_id
+        for rule_registration in get_rule_registrations(use_django_rules=configuration.get("enable_django_rules", True))
+    }
+    globally_excluded_rules = configuration.get("exclude", [])
+    per_file_excluded_rules: dict[str, list[str]] = configuration.get("per-file-excludes", {})
+
+    # Warn for any invalid IDs, but still honour the valid ones
+    for excluded_rules in (globally_excluded_rules, *per_file_excluded_rules.values()):
+        for invalid_configured_rule in [rule_id for rule_id in excluded_rules if rule_id not in active_rule_ids]:
+            warnings.warn(
+                f'Boa Restrictor: Invalid rule "{invalid_configured_rule}" in configuration detected.',
+                category=UserWarning,
+                stacklevel=2,
+            )
+
+    enabled_rules = tuple(rule_class for rule_class in rules if rule_class.RULE_ID not in globally_excluded_rules)
+    # Both path filtering and per-file exclusions match paths relative to the configuration's directory
+    relative_path_resolver = RelativePathResolver(anchor_dir=config_anchor_dir or Path.cwd())
+    return ExecutionPlan(
+        rules=enabled_rules,
+        path_filter=PathFilter(
+            relative_path_resolver=relative_path_resolver,
+            include_paths=configuration.get("include-paths", []),
+            exclude_paths=configuration.get("exclude-paths", []),
+        ),
+        per_file_excludes=PerFileExcludes(
+            patterns=per_file_excluded_rules, relative_path_resolver=relative_path_resolver
+        ),
+        keyword_prefilter=KeywordPrefilter(rule_classes=enabled_rules),
+    )
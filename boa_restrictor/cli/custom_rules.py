@@ -1,14 +1,23 @@
+import ast
+import dataclasses
+import hashlib
 import importlib
+import importlib.util
+import inspect
 import re
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING
 
+from boa_restrictor.cli.path_filter import PathFilter, RelativePathResolver
+from boa_restrictor.common.file_context import FileContext
 from boa_restrictor.common.rule import RESERVED_RULE_ID_PREFIXES, Rule
 from boa_restrictor.exceptions.custom_rules import (
     CustomRuleAttributeMissingError,
     CustomRuleInvalidRuleIdShapeError,
     CustomRuleInvalidRuleIdTypeError,
     CustomRuleInvalidRuleLabelTypeError,
+    CustomRuleMetadataMismatchError,
     CustomRuleMissingRuleIdError,
     CustomRuleMissingRuleLabelError,
     CustomRuleModuleImportFailedError,
@@ -19,15 +28,159 @@ from boa_restrictor.exceptions.custom_rules import (
     CustomRulesNotAListError,
     DuplicateCustomRulePathError,
     DuplicateRuleIdError,
+    InvalidCustomRuleDeclarationError,
     InvalidCustomRulePathError,
+    InvalidRuleEntryPointError,
 )
+from boa_restrictor.projections.occurrence import Occurrence
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from boa_restrictor.cli.plugins import RuleEntryPoint
+    from boa_restrictor.cli.rule_signatures import RuleSignatureFile
 
 # Mirrors the noqa parser's _CODE_PATTERN: a RULE_ID that doesn't match this shape
 # can never be silenced via "# noqa:", so reject it at load time.
 _RULE_ID_SHAPE = re.compile(r"^[A-Z]+\d+$")
 
+# Keys of a custom rule declared as a table, along with its metadata
+_DECLARATION_KEYS = frozenset({"path", "rule_id", "label", "trigger_keywords", "include-paths"})
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class CustomRuleDeclaration:
+    """
+    A custom rule declared along with its metadata in the configuration, e.g.
+    `{ path = "myproject.linting.MyRule", rule_id = "MYP001", include-paths = ["*/models.py"] }`.
+    The optional `label` and `trigger_keywords` stand in for RULE_LABEL and TRIGGER_KEYWORDS of the class.
+    """
+
+    dotted_path: str
+    rule_id: str
+    label: str | None = None
+    trigger_keywords: tuple[str, ...] = ()
+    include_paths: tuple[str, ...] = ()
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class RuleSignature:
+    """
+    The metadata of a rule class which can be declared in the configuration as well (see `CustomRuleDeclaration`).
+    """
+
+    rule_id: str
+    label: str
+    trigger_keywords: tuple[str, ...] = ()
+
+    @classmethod
+    def from_rule_class(cls, *, rule_class: type[Rule]) -> "RuleSignature":
+        return cls(
+            rule_id=rule_class.RULE_ID,
+            label=rule_class.RULE_LABEL,
+            trigger_keywords=tuple(rule_class.TRIGGER_KEYWORDS),
+        )
+
+
+class _LazyCustomRuleType(type):
+    # Anything not known from the declaration is taken from the rule class, which is imported on first access
+    def __getattr__(cls, name: str):
+        if name.startswith("_") or "declaration" not in vars(cls):
+            raise AttributeError(name)
+        return getattr(cls.load(), name)
+
 
-def load_custom_rules(*, paths, anchor_dir: Path) -> tuple[type[Rule], ...]:
+class LazyCustomRule(Rule, metaclass=_LazyCustomRuleType):
+    """
+    Stands in for a declared custom rule (see `CustomRuleDeclaration`) until a file needs it. Its RULE_ID, the paths
+    it applies to and, if declared, its RULE_LABEL and TRIGGER_KEYWORDS are taken from the declaration, so it can be
+    validated, excluded, prefiltered, matched against paths and listed in reports without importing its module. The
+    module is imported when the rule checks a file for the first time.
+
+    With a signature file, the declared metadata is also checked against the one the class had the last time it was
+    imported from the same source code, so a declaration which drifted from its class is detected right away.
+    """
+
+    declaration: CustomRuleDeclaration
+    path_filter: PathFilter
+    signature_file: "RuleSignatureFile | None" = None
+
+    _rule_class: type[Rule] | None = None
+    _source_hash: str | None = None
+
+    @classmethod
+    def is_applicable(cls, *, file_path: Path) -> bool:
+        return cls.path_filter.is_included(filename=str(file_path))
+
+    @classmethod
+    def run_check(
+        cls, *, file_path: Path, source_tree: ast.AST | ast.Module, context: FileContext | None = None
+    ) -> list[Occurrence]:
+        if not cls.is_applicable(file_path=file_path):
+            return []
+        return cls.load().run_check(file_path=file_path, source_tree=source_tree, context=context)
+
+    @classmethod
+    def load(cls) -> type[Rule]:
+        """
+        Import the declared rule class, unless it is imported already, and check it against its declaration.
+        """
+        if cls._rule_class is None:
+            rule_class = _import_custom_rule(dotted_path=cls.declaration.dotted_path)
+            signature = RuleSignature.from_rule_class(rule_class=rule_class)
+            if cls.signature_file is not None and cls.get_source_hash() is not None:
+                cls.signature_file.record(
+                    dotted_path=cls.declaration.dotted_path, source_hash=cls.get_source_hash(), signature=signature
+                )
+            _check_declaration(declaration=cls.declaration, signature=signature)
+            cls._rule_class = rule_class
+        return cls._rule_class
+
+    @classmethod
+    def check_signature(cls) -> None:
+        """
+        Check the declaration against the signature file, without importing the rule class.
+        """
+        if cls.signature_file is None or cls.get_source_hash() is None:
+            return
+        signature = cls.signature_file.get_signature(
+            dotted_path=cls.declaration.dotted_path, source_hash=cls.get_source_hash()
+        )
+        if signature is not None:
+            _check_declaration(declaration=cls.declaration, signature=signature)
+
+    @classmethod
+    def get_source_file(cls) -> str | None:
+        """
+        Returns the source file of the declared rule's module. Only its parent packages are imported to find it.
+        """
+        try:
+            module_spec = importlib.util.find_spec(cls.__module__)
+        except (ImportError, ValueError):
+            return None
+        if module_spec is None or not module_spec.has_location:
+            return None
+        return module_spec.origin
+
+    @classmethod
+    def get_source_hash(cls) -> str | None:
+        """
+        Returns the hash of the source code of the declared rule's module, or None if it can't be read.
+        """
+        if cls._source_hash is None:
+            source_file = cls.get_source_file()
+            if source_file is None:
+                return None
+            try:
+                cls._source_hash = hashlib.sha256(Path(source_file).read_bytes()).hexdigest()
+            except OSError:
+                return None
+        return cls._source_hash
+
+
+def load_custom_rules(
+    *, paths, anchor_dir: Path, signature_file: "RuleSignatureFile | None" = None
+) -> tuple[type[Rule], ...]:
     """
     Import custom rule classes from a list of dotted paths (e.g. "myproject.linting.MyRule").
 
@@ -38,11 +191,15 @@ def load_custom_rules(*, paths, anchor_dir: Path) -> tuple[type[Rule], ...]:
 
     The anchor is canonicalised with `Path.resolve()` so non-canonical inputs (e.g. paths
     containing "..") don't accumulate as duplicate sys.path entries on repeated invocations.
+
+    Entries may also be tables declaring a rule along with its metadata (see `CustomRuleDeclaration`). Such rules
+    are validated right away, but their modules are only imported once a file needs them (see `LazyCustomRule`).
+    Their declarations are checked against the given signature file, if any.
     """
     if not isinstance(paths, list):
         raise CustomRulesNotAListError
     for item in paths:
-        if not isinstance(item, str):
+        if not isinstance(item, str | dict):
             raise CustomRulePathNotAStringError(item)
 
     if not paths:
@@ -54,21 +211,154 @@ def load_custom_rules(*, paths, anchor_dir: Path) -> tuple[type[Rule], ...]:
 
     seen_paths: set[str] = set()
     rules: list[type[Rule]] = []
-    for dotted_path in paths:
+    for item in paths:
+        if isinstance(item, dict):
+            declaration = _parse_custom_rule_declaration(value=item)
+            dotted_path = declaration.dotted_path
+        else:
+            dotted_path = item
+
         if dotted_path in seen_paths:
             raise DuplicateCustomRulePathError(dotted_path)
         seen_paths.add(dotted_path)
-        rules.append(_import_custom_rule(dotted_path=dotted_path))
+
+        if isinstance(item, dict):
+            rules.append(
+                _create_lazy_custom_rule(declaration=declaration, anchor_dir=anchor_dir, signature_file=signature_file)
+            )
+        else:
+            rules.append(_import_custom_rule(dotted_path=dotted_path))
 
     return tuple(rules)
 
 
+def _parse_custom_rule_declaration(*, value: dict) -> CustomRuleDeclaration:
+    unknown_keys = value.keys() - _DECLARATION_KEYS
+    if unknown_keys:
+        raise InvalidCustomRuleDeclarationError(value=value, reason=f"unknown keys {sorted(unknown_keys)}.")
+
+    dotted_path = value.get("path")
+    if not isinstance(dotted_path, str):
+        raise InvalidCustomRuleDeclarationError(value=value, reason='"path" must be a string (dotted import path).')
+    if "." not in dotted_path:
+        raise InvalidCustomRulePathError(dotted_path)
+
+    rule_id = value.get("rule_id")
+    if rule_id is None:
+        raise InvalidCustomRuleDeclarationError(value=value, reason='"rule_id" is required.')
+    if not isinstance(rule_id, str):
+        raise CustomRuleInvalidRuleIdTypeError(dotted_path=dotted_path, value=rule_id)
+    _validate_rule_id(rule_id=rule_id, dotted_path=dotted_path)
+
+    label = value.get("label")
+    if label is not None and (not isinstance(label, str) or not label):
+        raise InvalidCustomRuleDeclarationError(value=value, reason='"label" must be a non-empty string.')
+
+    trigger_keywords = value.get("trigger_keywords", [])
+    if not isinstance(trigger_keywords, list) or not all(
+        isinstance(keyword, str) and keyword for keyword in trigger_keywords
+    ):
+        raise InvalidCustomRuleDeclarationError(
+            value=value, reason='"trigger_keywords" must be a list of non-empty strings.'
+        )
+
+    include_paths = value.get("include-paths", [])
+    if not isinstance(include_paths, list) or not all(isinstance(pattern, str) for pattern in include_paths):
+        raise InvalidCustomRuleDeclarationError(value=value, reason='"include-paths" must be a list of strings.')
+
+    return CustomRuleDeclaration(
+        dotted_path=dotted_path,
+        rule_id=rule_id,
+        label=label,
+        trigger_keywords=tuple(trigger_keywords),
+        include_paths=tuple(include_paths),
+    )
+
+
+def _create_lazy_custom_rule(
+    *, declaration: CustomRuleDeclaration, anchor_dir: Path, signature_file: "RuleSignatureFile | None"
+) -> type[LazyCustomRule]:
+    # The stand-in is named after the declared class, so error messages and the daemon refer to the declared module
+    module_path, _, class_name = declaration.dotted_path.rpartition(".")
+    # Without a declared label, reading RULE_LABEL imports the class
+    declared_label = {"RULE_LABEL": declaration.label} if declaration.label is not None else {}
+    lazy_rule = _LazyCustomRuleType(
+        class_name,
+        (LazyCustomRule,),
+        {
+            "__module__": module_path,
+            "__qualname__": class_name,
+            "RULE_ID": declaration.rule_id,
+            **declared_label,
+            # Without declared keywords, the rule runs on every file it applies to, like any rule without keywords
+            "TRIGGER_KEYWORDS": declaration.trigger_keywords,
+            "declaration": declaration,
+            # Just like "include-paths", the declared paths are relative to the configuration's directory
+            "path_filter": PathFilter(
+                relative_path_resolver=RelativePathResolver(anchor_dir=anchor_dir),
+                include_paths=declaration.include_paths,
+            ),
+            "signature_file": signature_file,
+        },
+    )
+    lazy_rule.check_signature()
+    return lazy_rule
+
+
+def _check_declaration(*, declaration: CustomRuleDeclaration, signature: RuleSignature) -> None:
+    if signature.rule_id != declaration.rule_id:
+        raise CustomRuleMetadataMismatchError(
+            dotted_path=declaration.dotted_path,
+            key="rule_id",
+            declared_value=declaration.rule_id,
+            value=signature.rule_id,
+        )
+    if declaration.label is not None and signature.label != declaration.label:
+        raise CustomRuleMetadataMismatchError(
+            dotted_path=declaration.dotted_path, key="label", declared_value=declaration.label, value=signature.label
+        )
+    # Declaring fewer keywords than the class would skip files it has to check
+    if declaration.trigger_keywords and set(signature.trigger_keywords) != set(declaration.trigger_keywords):
+        raise CustomRuleMetadataMismatchError(
+            dotted_path=declaration.dotted_path,
+            key="trigger_keywords",
+            declared_value=list(declaration.trigger_keywords),
+            value=list(signature.trigger_keywords),
+        )
+
+
+def load_plugin_rules(*, rule_entry_points: "Sequence[RuleEntryPoint]") -> tuple[type[Rule], ...]:
+    """
+    Import the rule classes registered via the given entry points (see `discover_rule_entry_points()`). They are
+    validated just like custom rules.
+    """
+    rules = []
+    for rule_entry_point in rule_entry_points:
+        if not rule_entry_point.module_path or not rule_entry_point.attr_name:
+            raise InvalidRuleEntryPointError(
+                name=rule_entry_point.name,
+                value=rule_entry_point.value,
+                distribution_name=rule_entry_point.distribution_name,
+            )
+        rules.append(
+            _import_rule_class(
+                module_path=rule_entry_point.module_path,
+                attr_name=rule_entry_point.attr_name,
+                dotted_path=rule_entry_point.value,
+            )
+        )
+    return tuple(rules)
+
+
 def _import_custom_rule(*, dotted_path: str) -> type[Rule]:
     if "." not in dotted_path:
         raise InvalidCustomRulePathError(dotted_path)
 
     module_path, _, attr_name = dotted_path.rpartition(".")
+    return _import_rule_class(module_path=module_path, attr_name=attr_name, dotted_path=dotted_path)
 
+
+def _import_rule_class(*, module_path: str, attr_name: str, dotted_path: str) -> type[Rule]:
     try:
         module = importlib.import_module(module_path)
     except Exception as e:
@@ -98,11 +388,15 @@ def _validate_rule_class(*, rule_attr, dotted_path: str) -> None:
         raise CustomRuleMissingRuleLabelError(dotted_path)
     if not isinstance(rule_attr.RULE_LABEL, str):
         raise CustomRuleInvalidRuleLabelTypeError(dotted_path=dotted_path, value=rule_attr.RULE_LABEL)
-    if not _RULE_ID_SHAPE.match(rule_attr.RULE_ID):
-        raise CustomRuleInvalidRuleIdShapeError(dotted_path=dotted_path, rule_id=rule_attr.RULE_ID)
+    _validate_rule_id(rule_id=rule_attr.RULE_ID, dotted_path=dotted_path)
+
+
+def _validate_rule_id(*, rule_id: str, dotted_path: str) -> None:
+    if not _RULE_ID_SHAPE.match(rule_id):
+        raise CustomRuleInvalidRuleIdShapeError(dotted_path=dotted_path, rule_id=rule_id)
 
     for prefix in RESERVED_RULE_ID_PREFIXES:
-        if rule_attr.RULE_ID.startswith(prefix):
+        if rule_id.startswith(prefix):
             raise CustomRuleReservedPrefixError(
                 dotted_path=dotted_path,
                 prefix=prefix,
@@ -123,3 +417,24 @@ def validate_unique_rule_ids(*, rules: tuple[type[Rule], ...]) -> None:
     clashes = {rule_id: classes for rule_id, classes in by_id.items() if len(classes) > 1}
     if clashes:
         raise DuplicateRuleIdError(clashes=clashes)
+
+
+def get_custom_rule_source_files(*, rules: tuple[type[Rule], ...]) -> dict[str, str | None]:
+    """
+    Map the RULE_ID of every custom rule among the given rules to the source file of its module.
+    Built-in rules are skipped; they only change with the boa-restrictor version. If the source file of a custom rule
+    can't be determined (e.g. it was created dynamically), it maps to None.
+    """
+    source_files = {}
+    for rule_class in rules:
+        if rule_class.RULE_ID.startswith(RESERVED_RULE_ID_PREFIXES):
+            continue
+        if issubclass(rule_class, LazyCustomRule):
+            # Don't import declared rules just to find their source file
+            source_files[rule_class.RULE_ID] = rule_class.get_source_file()
+            continue
+        try:
+            source_files[rule_class.RULE_ID] = inspect.getsourcefile(rule_class)
+        except TypeError:
+            source_files[rule_class.RULE_ID] = None
+    return source_files
@@ -0,0 +1,235 @@
+import argparse
+import json
+import os
+import socket
+import socketserver
+import stat
+import sys
+import time
+from collections import OrderedDict
+from collections.abc import Sequence
+from pathlib import Path
+
+from boa_restrictor.cli.cache import RACY_MTIME_WINDOW_NS
+from boa_restrictor.cli.client import get_default_socket_path, get_socket_dir
+from boa_restrictor.cli.configuration import ExecutionPlan, compile_execution_plan, load_configuration
+from boa_restrictor.cli.custom_rules import get_custom_rule_source_files
+from boa_restrictor.cli.linting import format_occurrence, lint_file, resolve_rules
+from boa_restrictor.exceptions.daemon import DaemonAlreadyRunningError, InsecureSocketDirectoryError
+from boa_restrictor.projections.occurrence import Occurrence
+
+# Number of files whose results the daemon keeps in memory
+MAX_WARM_RESULTS = 20_000
+
+# Seconds without any request after which the daemon shuts down
+DEFAULT_IDLE_TIMEOUT = 3 * 60 * 60
+
+
+class DaemonState:
+    """
+    Everything the daemon keeps warm between requests: the resolved rules, the compiled execution plan and the
+    results of recently linted files. It's rebuilt as soon as the configuration or a custom rule module changes.
+    """
+
+    execution_plan: ExecutionPlan
+
+    def __init__(self, *, config_path: str):
+        self.config_path = os.path.abspath(config_path)
+        self.working_dir = os.getcwd()
+
+        self._watched_files: tuple[str, ...] = ()
+        self._watched_files_signature: tuple = ()
+        self._custom_rule_modules: tuple[str, ...] = ()
+        self._warm_results: OrderedDict[str, tuple[int, int, list[Occurrence]]] = OrderedDict()
+
+        self.reload()
+
+    def reload(self) -> None:
+        """
+        Load the configuration and resolve all rules again, re-importing the custom rule modules.
+        """
+        # Forget the custom rule modules, so they are imported again instead of being taken from the module cache
+        for module_name in self._custom_rule_modules:
+            sys.modules.pop(module_name, None)
+
+        configuration = load_configuration(file_path=self.config_path)
+        config_anchor_dir = Path(self.config_path).parent
+        rules = resolve_rules(configuration=configuration, config_anchor_dir=config_anchor_dir)
+        self.execution_plan = compile_execution_plan(
+            configuration=configuration, rules=rules, config_anchor_dir=config_anchor_dir
+        )
+
+        custom_rule_source_files = get_custom_rule_source_files(rules=rules)
+        self._custom_rule_modules = tuple(
+            {rule_class.__module__ for rule_class in rules if rule_class.RULE_ID in custom_rule_source_files}
+        )
+        self._watched_files = (
+            self.config_path,
+            *(source_file for source_file in custom_rule_source_files.values() if source_file is not None),
+        )
+        self._watched_files_signature = self._get_watched_files_signature()
+        self._warm_results.clear()
+
+    def reload_if_changed(self) -> None:
+        """
+        Reload if the configuration or any custom rule module changed since the last reload.
+        """
+        if self._get_watched_files_signature() != self._watched_files_signature:
+            self.reload()
+
+    def lint(self, *, filenames: Sequence[str]) -> list[Occurrence]:
+        """
+        Lint the given files, reusing the results of files which didn't change since they were linted last time.
+        """
+        occurrences = []
+        for filename in filenames:
+            stat_result = os.stat(filename)
+            warm_result = self._warm_results.get(filename)
+            if warm_result is not None and warm_result[:2] == (stat_result.st_mtime_ns, stat_result.st_size):
+                self._warm_results.move_to_end(filename)
+                occurrences.extend(warm_result[2])
+                continue
+
+            file_occurrences = lint_file(filename=filename, execution_plan=self.execution_plan)
+            occurrences.extend(file_occurrences)
+
+            # A file modified right now might be modified again without changing its stat, so don't keep its results
+            if time.time_ns() - stat_result.st_mtime_ns > RACY_MTIME_WINDOW_NS:
+                self._warm_results[filename] = (stat_result.st_mtime_ns, stat_result.st_size, file_occurrences)
+                self._warm_results.move_to_end(filename)
+                if len(self._warm_results) > MAX_WARM_RESULTS:
+                    self._warm_results.popitem(last=False)
+
+        return occurrences
+
+    def _get_watched_files_signature(self) -> tuple:
+        signature = []
+        for path in self._watched_files:
+            try:
+                stat_result = os.stat(path)
+            except FileNotFoundError:
+                signature.append((path, None, None))
+            else:
+                signature.append((path, stat_result.st_mtime_ns, stat_result.st_size))
+        return tuple(signature)
+
+
+def handle_request(*, state: DaemonState, request: dict) -> dict:
+    """
+    Lint the files of a client's request and return the response for the client.
+    Any error is returned to the client, which then lints in-process to report it like a regular run does.
+    """
+    # Relative filenames and per-file exclusions only mean the same for a client working in the daemon's directory
+    if request.get("cwd") != state.working_dir or request.get("config") != state.config_path:
+        return {"error": "The daemon serves a different working directory or configuration."}
+
+    try:
+        state.reload_if_changed()
+        occurrences = state.lint(filenames=request["filenames"])
+    except Exception as e:  # noqa: BLE001
+        return {"error": f"{type(e).__name__}: {e}"}
+
+    return {
+        "output": "".join(format_occurrence(occurrence) for occurrence in occurrences),
+        "has_occurrences": bool(occurrences),
+    }
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        try:
+            request = json.loads(self.rfile.readline())
+        except ValueError:
+            response = {"error": "Invalid request."}
+        else:
+            response = handle_request(state=self.server.state, request=request)
+        self.wfile.write(json.dumps(response).encode())
+
+
+class _DaemonServer(socketserver.UnixStreamServer):
+    def __init__(self, *, socket_path: str, state: DaemonState, idle_timeout: float):
+        super().__init__(socket_path, _RequestHandler)
+        self.state = state
+        self.timeout = idle_timeout
+        self.is_idle = False
+
+    def handle_timeout(self) -> None:
+        self.is_idle = True
+
+
+def ensure_socket_dir(directory: str) -> None:
+    """
+    Create the given socket directory, accessible by the current user only. An existing directory is only accepted if
+    nobody else owns it or can access it, since anybody who can write to it could slip us (or our clients) a socket.
+    """
+    try:
+        os.mkdir(directory, mode=0o700)
+    except FileExistsError:
+        pass
+
+    # Don't follow symlinks, another user might point us to a directory they control
+    stat_result = os.lstat(directory)
+    if (
+        not stat.S_ISDIR(stat_result.st_mode)
+        or stat_result.st_uid != os.getuid()
+        or stat.S_IMODE(stat_result.st_mode) & 0o077
+    ):
+        raise InsecureSocketDirectoryError(directory=directory)
+
+
+def serve(*, state: DaemonState, socket_path: str, idle_timeout: float = DEFAULT_IDLE_TIMEOUT) -> None:
+    """
+    Serve requests on the given socket until the daemon was idle for `idle_timeout` seconds.
+    """
+    if os.path.exists(socket_path):
+        # A socket file which nobody listens on is a leftover of a daemon which didn't shut down cleanly
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+            try:
+                connection.connect(socket_path)
+            except OSError:
+                os.unlink(socket_path)
+            else:
+                raise DaemonAlreadyRunningError(socket_path=socket_path)
+
+    server = _DaemonServer(socket_path=socket_path, state=state, idle_timeout=idle_timeout)
+    try:
+        while not server.is_idle:
+            server.handle_request()
+    finally:
+        server.server_close()
+        os.unlink(socket_path)
+
+
+def main(argv: Sequence[str] | None = None):
+    parser = argparse.ArgumentParser(
+        prog="boa-restrictor daemon",
+    )
+    parser.add_argument(
+        "--config",
+        default="pyproject.toml",
+        type=str,
+        help="Location of pyproject.toml configuration file",
+    )
+    parser.add_argument(
+        "--socket",
+        default=None,
+        type=str,
+        help="Socket to listen on. Defaults to a socket derived from the configuration's location.",
+    )
+    parser.add_argument(
+        "--idle-timeout",
+        default=DEFAULT_IDLE_TIMEOUT,
+        type=float,
+        help="Seconds without any request after which the daemon shuts down.",
+    )
+    args = parser.parse_args(argv)
+
+    state = DaemonState(config_path=args.config)
+    socket_path = args.socket
+    if socket_path is None:
+        ensure_socket_dir(get_socket_dir())
+        socket_path = get_default_socket_path(config_path=args.config)
+    sys.stdout.write(f"boa-restrictor daemon listening on {socket_path}\n")
+    sys.stdout.flush()
+    serve(state=state, socket_path=socket_path, idle_timeout=args.idle_timeout)
+    return False
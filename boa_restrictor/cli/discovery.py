@@ -0,0 +1,263 @@
+import dataclasses
+import os
+import re
+from collections.abc import Iterator, Sequence
+
+from boa_restrictor.cli.globs import translate_glob
+from boa_restrictor.cli.path_filter import PathFilter
+
+# Directories which never contain code worth linting, whether they are ignored by git or not
+SKIPPED_DIRECTORY_NAMES = frozenset({".git", "node_modules", ".venv", "__pycache__"})
+
+GITIGNORE_FILENAME = ".gitignore"
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class GitignorePattern:
+    """
+    A single pattern of a .gitignore file, compiled into a regular expression matching paths relative to the
+    directory of the .gitignore file.
+    """
+
+    regex: re.Pattern
+    is_negated: bool
+    is_directory_only: bool
+
+
+class GitignoreFile:
+    """
+    The patterns of a .gitignore file. See "man 5 gitignore" for their semantics.
+    """
+
+    def __init__(self, *, relative_directory: str, patterns: Sequence[GitignorePattern]):
+        self.relative_directory = relative_directory
+        self.patterns = patterns
+
+    @classmethod
+    def load(cls, *, directory: str, relative_directory: str) -> "GitignoreFile | None":
+        """
+        Load the .gitignore file of the given directory, which lies at `relative_directory` within the repository.
+        Returns None if there is none (or it doesn't contain any patterns).
+        """
+        try:
+            with open(os.path.join(directory, GITIGNORE_FILENAME), encoding="utf-8", errors="replace") as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return None
+
+        patterns = [pattern for pattern in (compile_gitignore_pattern(line) for line in lines) if pattern is not None]
+        return cls(relative_directory=relative_directory, patterns=patterns) if patterns else None
+
+    def match(self, *, path: str, is_directory: bool) -> bool | None:
+        """
+        Returns whether the given path (relative to the directory of this file, separated by "/") is ignored, or None
+        if no pattern matches it. Just like git does, the last matching pattern wins.
+        """
+        for pattern in reversed(self.patterns):
+            if pattern.is_directory_only and not is_directory:
+                continue
+            if pattern.regex.fullmatch(path):
+                return not pattern.is_negated
+        return None
+
+
+def compile_gitignore_pattern(line: str) -> GitignorePattern | None:
+    """
+    Compile a line of a .gitignore file. Returns None for blank lines and comments.
+    """
+    # Trailing spaces are ignored unless they are escaped
+    line = line.rstrip("\n")
+    while line.endswith(" ") and not line.endswith("\\ "):
+        line = line[:-1]
+    if not line or line.startswith("#"):
+        return None
+
+    is_negated = line.startswith("!")
+    if is_negated:
+        line = line[1:]
+    elif line.startswith("\\"):
+        # "\#" and "\!" match a literal "#" or "!"
+        line = line[1:]
+
+    is_directory_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+
+    # Patterns with a slash at the beginning or in the middle are relative to the directory of the .gitignore file,
+    # all others match at any level below it
+    is_anchored = "/" in line
+    regex = translate_glob(line.lstrip("/"))
+    if not is_anchored:
+        regex = "(?:.*/)?" + regex
+
+    return GitignorePattern(regex=re.compile(regex), is_negated=is_negated, is_directory_only=is_directory_only)
+
+
+def find_python_files(
+    *, paths: Sequence[str], path_filter: PathFilter | None = None, visited_directories: list[str] | None = None
+) -> Iterator[str]:
+    """
+    Yield the given files and all Python files within the given directories, as soon as they are found.
+
+    Directories are walked recursively, skipping everything ignored via .gitignore files (including those of parent
+    directories within the same git repository) and directories like ".git" or "node_modules". Files are only yielded
+    once, even if they are reachable via several paths, e.g. symlinks. Explicitly given files are always yielded.
+    Directories excluded by the given path filter aren't even searched. Every searched directory is appended to
+    `visited_directories`, if given.
+    """
+    seen_files = set()
+    for path in paths:
+        if os.path.isdir(path):
+            yield from _walk_directory(
+                directory=path,
+                seen_files=seen_files,
+                path_filter=path_filter,
+                visited_directories=visited_directories,
+            )
+            continue
+
+        try:
+            stat_result = os.stat(path)
+        except OSError:
+            # Let linting report files which don't exist
+            yield path
+            continue
+        file_key = (stat_result.st_dev, stat_result.st_ino)
+        if file_key not in seen_files:
+            seen_files.add(file_key)
+            yield path
+
+
+def _walk_directory(
+    *,
+    directory: str,
+    seen_files: set[tuple[int, int]],
+    path_filter: PathFilter | None,
+    visited_directories: list[str] | None,
+) -> Iterator[str]:
+    # All .gitignore patterns are matched against paths relative to the root of the git repository (or the walked
+    # directory, outside of a repository), so they can be built by appending names while walking
+    root_directory = _find_repository_root(directory=directory) or directory
+    relative_directory = _to_relative_path(path=directory, start=root_directory)
+    gitignore_files = _load_parent_gitignore_files(root_directory=root_directory, relative_directory=relative_directory)
+
+    # Walk depth-first in alphabetical order, so the files of a directory are always yielded in the same order
+    pending_directories = [(directory, relative_directory, gitignore_files)]
+    while pending_directories:
+        current_directory, current_relative_directory, current_gitignore_files = pending_directories.pop()
+        if visited_directories is not None:
+            visited_directories.append(current_directory)
+        gitignore_file = GitignoreFile.load(directory=current_directory, relative_directory=current_relative_directory)
+        if gitignore_file is not None:
+            current_gitignore_files = (*current_gitignore_files, gitignore_file)
+
+        files, subdirectories = _scan_directory(
+            directory=current_directory,
+            relative_directory=current_relative_directory,
+            gitignore_files=current_gitignore_files,
+        )
+        if path_filter is not None:
+            subdirectories = [
+                (subdirectory, relative_subdirectory)
+                for subdirectory, relative_subdirectory in subdirectories
+                if not path_filter.is_directory_excluded(directory=subdirectory)
+            ]
+        for path, file_key in files:
+            if file_key not in seen_files:
+                seen_files.add(file_key)
+                yield path
+
+        pending_directories.extend(
+            (subdirectory, relative_subdirectory, current_gitignore_files)
+            for subdirectory, relative_subdirectory in reversed(subdirectories)
+        )
+
+
+def _scan_directory(
+    *, directory: str, relative_directory: str, gitignore_files: Sequence[GitignoreFile]
+) -> tuple[list[tuple[str, tuple[int, int]]], list[tuple[str, str]]]:
+    # Returns the Python files of the given directory (along with a key identifying them across symlinks) and its
+    # subdirectories (along with their path relative to the repository root), except the ignored ones
+    files = []
+    subdirectories = []
+    try:
+        device = os.stat(directory).st_dev
+        with os.scandir(directory) as directory_entries:
+            sorted_entries = sorted(directory_entries, key=lambda directory_entry: directory_entry.name)
+    except OSError:
+        return files, subdirectories
+
+    for directory_entry in sorted_entries:
+        relative_path = f"{relative_directory}/{directory_entry.name}" if relative_directory else directory_entry.name
+        # Within the current directory, yield "module.py" instead of "./module.py", just like pre-commit passes it
+        path = directory_entry.name if directory == os.curdir else directory_entry.path
+        try:
+            is_directory = directory_entry.is_dir(follow_symlinks=False)
+            if is_directory:
+                if directory_entry.name in SKIPPED_DIRECTORY_NAMES:
+                    continue
+            elif not directory_entry.name.endswith(".py") or not directory_entry.is_file():
+                continue
+
+            if _is_ignored(relative_path=relative_path, is_directory=is_directory, gitignore_files=gitignore_files):
+                continue
+
+            if is_directory:
+                subdirectories.append((path, relative_path))
+            elif directory_entry.is_symlink():
+                # Symlinks are resolved, so a file reachable via several paths is only linted once
+                stat_result = directory_entry.stat()
+                files.append((path, (stat_result.st_dev, stat_result.st_ino)))
+            else:
+                files.append((path, (device, directory_entry.inode())))
+        except OSError:
+            continue
+
+    return files, subdirectories
+
+
+def _is_ignored(*, relative_path: str, is_directory: bool, gitignore_files: Sequence[GitignoreFile]) -> bool:
+    # Patterns of deeper .gitignore files take precedence over those of their parent directories
+    for gitignore_file in reversed(gitignore_files):
+        if gitignore_file.relative_directory:
+            path = relative_path[len(gitignore_file.relative_directory) + 1 :]
+        else:
+            path = relative_path
+        is_ignored = gitignore_file.match(path=path, is_directory=is_directory)
+        if is_ignored is not None:
+            return is_ignored
+    return False
+
+
+def _find_repository_root(*, directory: str) -> str | None:
+    current_directory = os.path.abspath(directory)
+    while not os.path.exists(os.path.join(current_directory, ".git")):
+        parent_directory = os.path.dirname(current_directory)
+        if parent_directory == current_directory:
+            return None
+        current_directory = parent_directory
+    return current_directory
+
+
+def _to_relative_path(*, path: str, start: str) -> str:
+    relative_path = os.path.relpath(os.path.abspath(path), os.path.abspath(start)).replace(os.sep, "/")
+    return "" if relative_path == "." else relative_path
+
+
+def _load_parent_gitignore_files(*, root_directory: str, relative_directory: str) -> tuple[GitignoreFile, ...]:
+    # The .gitignore files of all parent directories up to the root of the git repository apply as well
+    if not relative_directory:
+        return ()
+
+    gitignore_files = []
+    parent_relative_directory = ""
+    for name in ["", *relative_directory.split("/")[:-1]]:
+        parent_relative_directory = f"{parent_relative_directory}/{name}" if parent_relative_directory else name
+        gitignore_file = GitignoreFile.load(
+            directory=os.path.join(root_directory, parent_relative_directory),
+            relative_directory=parent_relative_directory,
+        )
+        if gitignore_file is not None:
+            gitignore_files.append(gitignore_file)
+    return tuple(gitignore_files)
@@ -0,0 +1,123 @@
+import bisect
+import os
+import re
+import subprocess
+import sys
+from collections.abc import Sequence
+
+from boa_restrictor.exceptions.git_diff import GitCommandError
+from boa_restrictor.projections.occurrence import Occurrence
+
+# "@@ -12,3 +14,5 @@" or, for hunks of a single line, "@@ -12 +14 @@"
+_HUNK_HEADER_PATTERN = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+
+
+def run_git_diff(*, arguments: Sequence[str]) -> str:
+    """
+    Run "git diff" with the given arguments in the current directory and return its output.
+    Paths are reported relative to the current directory, just like pre-commit passes them.
+    """
+    return run_git(arguments=["diff", "--relative", "--no-color", "--no-ext-diff", "--no-renames", *arguments])
+
+
+def run_git(*, arguments: Sequence[str]) -> str:
+    """
+    Run git with the given arguments in the current directory and return its output. Paths aren't quoted.
+    """
+    command = ["git", "-c", "core.quotePath=false", *arguments]
+    try:
+        completed_process = subprocess.run(command, capture_output=True, text=True, check=False)
+    except OSError as e:
+        raise GitCommandError(command=" ".join(command), error=str(e)) from e
+
+    if completed_process.returncode != 0:
+        raise GitCommandError(command=" ".join(command), error=completed_process.stderr.strip())
+    return completed_process.stdout
+
+
+def get_changed_files(*, ref: str) -> list[str]:
+    """
+    Returns all Python files which differ between the given git ref and the working tree, except deleted ones, along
+    with all untracked ones (unless ignored).
+    """
+    output = run_git_diff(arguments=["--name-only", "--diff-filter=d", ref, "--", "*.py"])
+    return [filename for filename in output.splitlines() if filename] + get_untracked_files()
+
+
+def get_untracked_files() -> list[str]:
+    """
+    Returns all Python files which aren't tracked by git yet and aren't ignored either, relative to the current
+    directory. "git diff" doesn't know about them.
+    """
+    output = run_git(arguments=["ls-files", "--others", "--exclude-standard", "--", "*.py"])
+    return [filename for filename in output.splitlines() if filename]
+
+
+def get_changed_lines(*, ref: str) -> dict[str, list[tuple[int, int]]]:
+    """
+    Returns the line ranges of all Python files which were added or changed since the given git ref, keyed by their
+    normalized filename (see `os.path.normpath()`). All lines of untracked files count as added.
+    """
+    changed_lines = parse_changed_lines(diff=run_git_diff(arguments=["--unified=0", "--no-prefix", ref, "--", "*.py"]))
+    for filename in get_untracked_files():
+        changed_lines[os.path.normpath(filename)] = [(1, sys.maxsize)]
+    return changed_lines
+
+
+def parse_changed_lines(*, diff: str) -> dict[str, list[tuple[int, int]]]:
+    """
+    Parse a unified diff (without any context lines and path prefixes) into the sorted, inclusive line ranges of the
+    new version of every file which were added or changed, keyed by the normalized filename.
+    """
+    changed_lines = {}
+    line_ranges = None
+    for line in diff.splitlines():
+        if line.startswith("+++ "):
+            # Git terminates paths containing spaces with a tab
+            filename = line[4:].removesuffix("\t")
+            # Deleted files don't have any lines left
+            line_ranges = None if filename == "/dev/null" else changed_lines.setdefault(os.path.normpath(filename), [])
+            continue
+
+        hunk_header = _HUNK_HEADER_PATTERN.match(line)
+        if hunk_header is None or line_ranges is None:
+            continue
+        start = int(hunk_header.group(1))
+        line_count = int(hunk_header.group(2) or 1)
+        # Hunks which only remove lines don't touch any line of the new version
+        if line_count > 0:
+            line_ranges.append((start, start + line_count - 1))
+
+    for line_ranges in changed_lines.values():
+        line_ranges.sort()
+    return changed_lines
+
+
+def select_changed_filenames(*, filenames: Sequence[str], ref: str) -> list[str]:
+    """
+    Returns the given filenames which changed since the given git ref, in their given order. Without any filenames,
+    all changed Python files.
+    """
+    changed_filenames = get_changed_files(ref=ref)
+    if not filenames:
+        return changed_filenames
+
+    normalized_changed_filenames = {os.path.normpath(filename) for filename in changed_filenames}
+    return [filename for filename in filenames if os.path.normpath(filename) in normalized_changed_filenames]
+
+
+def filter_occurrences_on_changed_lines(
+    *, occurrences: Sequence[Occurrence], changed_lines: dict[str, list[tuple[int, int]]]
+) -> list[Occurrence]:
+    """
+    Returns the occurrences which lie on a line which was added or changed, according to the changed lines as returned
+    by `get_changed_lines()`.
+    """
+    filtered_occurrences = []
+    for occurrence in occurrences:
+        line_ranges = changed_lines.get(os.path.normpath(occurrence.file_path), [])
+        # Find the last range starting at or before the occurrence's line
+        index = bisect.bisect_right(line_ranges, (occurrence.line_number, float("inf"))) - 1
+        if index >= 0 and line_ranges[index][1] >= occurrence.line_number:
+            filtered_occurrences.append(occurrence)
+    return filtered_occurrences
@@ -0,0 +1,57 @@
+import re
+from collections.abc import Sequence
+
+
+def translate_glob(pattern: str) -> str:
+    """
+    Translate a glob matching "/"-separated paths into a regular expression. Unlike `fnmatch.translate()`, neither "*"
+    nor "?" match a "/". "**" matches any number of directories if it makes up a whole path segment, e.g. "**/tests"
+    or "src/**/generated" (see "man 5 gitignore").
+    """
+    segments = pattern.split("/")
+    regex_parts = []
+    for index, segment in enumerate(segments):
+        is_last_segment = index == len(segments) - 1
+        if segment == "**":
+            regex_parts.append(".*" if is_last_segment else "(?:.*/)?")
+        else:
+            regex_parts.append(_translate_glob_segment(segment) + ("" if is_last_segment else "/"))
+    return "".join(regex_parts)
+
+
+def compile_globs(patterns: Sequence[str]) -> re.Pattern | None:
+    """
+    Compile the given globs into a single regular expression, matching a path (via `fullmatch()`) if any of them
+    does. Returns None without any globs.
+    """
+    if not patterns:
+        return None
+    return re.compile("|".join(f"(?:{translate_glob(pattern.strip('/'))})" for pattern in patterns))
+
+
+def _translate_glob_segment(segment: str) -> str:
+    regex = ""
+    index = 0
+    while index < len(segment):
+        character = segment[index]
+        index += 1
+        if character == "*":
+            regex += "[^/]*"
+        elif character == "?":
+            regex += "[^/]"
+        elif character == "\\" and index < len(segment):
+            regex += re.escape(segment[index])
+            index += 1
+        elif character == "[":
+            closing_index = segment.find("]", index + 1)
+            if closing_index == -1:
+                regex += re.escape(character)
+                continue
+            character_class = segment[index:closing_index].replace("\\", "\\\\")
+            if character_class.startswith("!"):
+                character_class = "^" + character_class[1:]
+            regex += f"[{character_class}]"
+            index = closing_index + 1
+        else:
+            regex += re.escape(character)
+    return regex
@@ -0,0 +1,361 @@
+import dataclasses
+import itertools
+import warnings
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from pathlib import Path
+
+from boa_restrictor.cli.cache import CacheLookup, ResultCache
+from boa_restrictor.cli.configuration import ExecutionPlan, compile_execution_plan
+from boa_restrictor.cli.custom_rules import load_custom_rules, load_plugin_rules, validate_unique_rule_ids
+from boa_restrictor.cli.plugins import RuleEntryPoint, discover_rule_entry_points
+from boa_restrictor.cli.rule_signatures import RuleSignatureFile
+from boa_restrictor.cli.utils import parse_source_code_or_fail
+from boa_restrictor.common.file_context import FileContext
+from boa_restrictor.common.noqa import SuppressionComments
+from boa_restrictor.common.rule import Rule
+from boa_restrictor.common.suppressions import Suppressions
+from boa_restrictor.projections.occurrence import Occurrence
+from boa_restrictor.rules import get_rules
+
+# Below this number of files, linting in a single process is faster than starting a pool of worker processes.
+# Pre-commit hands over small batches of changed files, so most of its invocations won't ever start a pool.
+PARALLEL_FILE_COUNT_THRESHOLD = 64
+
+# Number of files handed out to a worker process at once, balancing the IPC overhead against uneven file sizes
+PARALLEL_CHUNK_SIZE = 16
+
+# Number of chunks per worker process handed out ahead of the oldest unfinished one. Keeps the workers busy, while
+# neither the discovery of files nor the finished results run arbitrarily far ahead of the output.
+PARALLEL_PENDING_CHUNKS_PER_JOB = 4
+
+# The execution plan of a worker process, built once by `_initialize_worker()`
+_worker_execution_plan: ExecutionPlan | None = None
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class WorkerSetup:
+    """
+    Everything a worker process needs to resolve the rules and compile its own execution plan.
+    """
+
+    configuration: dict
+    config_anchor_dir: Path
+    cache_dir: Path | None = None
+    # Found by the main process already, so the workers don't scan the installed distributions again
+    rule_entry_points: tuple[RuleEntryPoint, ...] = ()
+
+
+def discover_enabled_rule_entry_points(
+    *, configuration: dict, cache_dir: Path | None = None
+) -> tuple[RuleEntryPoint, ...]:
+    """
+    Find the rule classes registered via entry points by the installed packages, unless the configuration disables
+    them. See `discover_rule_entry_points()` for how the result is cached.
+    """
+    if not configuration.get("enable_plugin_rules", True):
+        return ()
+    return discover_rule_entry_points(cache_dir=cache_dir)
+
+
+def resolve_rules(
+    *,
+    configuration: dict,
+    config_anchor_dir: Path,
+    cache_dir: Path | None = None,
+    rule_entry_points: Sequence[RuleEntryPoint] | None = None,
+) -> tuple[type[Rule], ...]:
+    """
+    Resolve all enabled rules, built-in and custom ones and those registered by installed packages via entry points,
+    from the given configuration.
+    Import and validation errors are raised right away, so they fail fast before any file is processed. Globally
+    excluded built-in rules aren't even imported, and neither are custom rules declared along with their metadata
+    (until a file needs them).
+
+    With a cache directory, declared custom rules are checked against the signature file in there. The entry points
+    of the installed packages are discovered unless given, see `discover_enabled_rule_entry_points()`.
+    """
+    builtin_rules = get_rules(
+        use_django_rules=configuration.get("enable_django_rules", True),
+        excluded_rule_ids=frozenset(configuration.get("exclude", [])),
+    )
+    custom_rules = load_custom_rules(
+        paths=configuration.get("custom_rules", []),
+        anchor_dir=config_anchor_dir,
+        signature_file=RuleSignatureFile(cache_dir=cache_dir) if cache_dir is not None else None,
+    )
+    if rule_entry_points is None:
+        rule_entry_points = discover_enabled_rule_entry_points(configuration=configuration, cache_dir=cache_dir)
+    plugin_rules = load_plugin_rules(rule_entry_points=rule_entry_points)
+    enabled_rules = builtin_rules + custom_rules + plugin_rules
+    validate_unique_rule_ids(rules=enabled_rules)
+    return enabled_rules
+
+
+def lint_file(*, filename: str, execution_plan: ExecutionPlan) -> list[Occurrence]:
+    """
+    Run all rules of the execution plan which apply to the given file and return their occurrences.
+    """
+    # Collect all linters which apply to this file. This only depends on the path...
+    active_rules = execution_plan.rules_for_file(filename=filename)
+
+    # ... so we don't even read a file if no linter applies to it
+    if not active_rules:
+        return []
+
+    # Read source code
+    with open(filename) as f:
+        source_code = f.read()
+
+    return lint_source_code(
+        filename=filename, source_code=source_code, execution_plan=execution_plan, active_rules=active_rules
+    )
+
+
+def lint_source_code(
+    *,
+    filename: str,
+    source_code: str,
+    execution_plan: ExecutionPlan,
+    active_rules: Sequence[type[Rule]] | None = None,
+    suppression_comments_getter: Callable[..., SuppressionComments] | None = None,
+) -> list[Occurrence]:
+    """
+    Run all rules of the execution plan which apply to the given file on the given source code, e.g. the unsaved
+    content of an editor, and return their occurrences.
+
+    `active_rules` are the rules applying to the file, if already known. `suppression_comments_getter` replaces
+    `get_suppression_comments()`, e.g. to reuse the comments of a previous version of the source code.
+    """
+    file_path = Path(filename)
+    if active_rules is None:
+        active_rules = execution_plan.rules_for_file(filename=filename)
+
+    # Skip linters whose trigger keywords don't occur in the source code at all...
+    found_keywords = execution_plan.keyword_prefilter.find_keywords(source_code=source_code)
+    active_rules = [
+        rule_class
+        for rule_class in active_rules
+        if execution_plan.keyword_prefilter.is_triggered(rule_class=rule_class, keywords=found_keywords)
+    ]
+
+    # ... so we don't even parse a file if no linter can possibly fire on it
+    if not active_rules:
+        return []
+
+    # Parse code through abstract syntax tree
+    source_tree = parse_source_code_or_fail(filename=filename, source_code=source_code)
+
+    # Collect facts about this file once, so all rules can share them (e.g. the index of all nodes by type)
+    file_context = FileContext(file_path=file_path, source_tree=source_tree)
+
+    # Collect all suppressions (noqa comments and boa directives) once, so checking an occurrence is a single lookup.
+    # The string literals of the node index tell comments apart from strings, so the file doesn't need to be tokenized.
+    suppressions = Suppressions.collect(
+        source_code=source_code,
+        filename=filename,
+        node_index=file_context.node_index,
+        suppression_comments_getter=suppression_comments_getter,
+    )
+    file_context.suppressions = suppressions
+
+    # Rules disabled for the whole file don't need to run at all
+    if suppressions.disabled_rule_ids:
+        active_rules = [
+            rule_class for rule_class in active_rules if rule_class.RULE_ID not in suppressions.disabled_rule_ids
+        ]
+
+    # Iterate over all linters and add their issues to our occurrence list, except the suppressed ones
+    occurrences = []
+    for rule_class in active_rules:
+        occurrences.extend(
+            suppressions.filter_occurrences(
+                occurrences=rule_class.run_check(file_path=file_path, source_tree=source_tree, context=file_context)
+            )
+        )
+
+    return occurrences
+
+
+def lint_files(
+    *,
+    filenames: Iterable[str],
+    execution_plan: ExecutionPlan,
+    worker_setup: WorkerSetup,
+    jobs: int = 1,
+    result_cache: ResultCache | None = None,
+) -> list[Occurrence]:
+    """
+    Lint all given files and return their occurrences in the order of the given filenames.
+    See `iter_file_occurrences()`, which yields them file by file instead.
+    """
+    return [
+        occurrence
+        for file_occurrences in iter_file_occurrences(
+            filenames=filenames,
+            execution_plan=execution_plan,
+            worker_setup=worker_setup,
+            jobs=jobs,
+            result_cache=result_cache,
+        )
+        for occurrence in file_occurrences
+    ]
+
+
+def iter_file_occurrences(
+    *,
+    filenames: Iterable[str],
+    execution_plan: ExecutionPlan,
+    worker_setup: WorkerSetup,
+    jobs: int = 1,
+    result_cache: ResultCache | None = None,
+) -> Iterator[list[Occurrence]]:
+    """
+    Lint all given files and yield the occurrences of every file as soon as it is done, in the order of the given
+    filenames. Nothing is accumulated across files, so memory usage doesn't grow with the number of occurrences.
+
+    The filenames may be a lazy iterable, e.g. of files which are still being discovered. Linting starts right away
+    with the first of them (or, with more than one job, the first batch deciding whether to start a pool), and only a
+    bounded number of files is taken from it ahead of the yielded results.
+
+    With a result cache, files which didn't change since they were linted last time with the same setup aren't
+    linted again. Their occurrences are taken from the cache instead. The cache is saved once all files are done
+    (or linting failed).
+
+    With more than one job and enough files, the files are spread across a pool of worker processes. Every worker
+    resolves the rules (including custom ones) and compiles its execution plan once, from the given worker setup.
+    The results are merged in the order of the given filenames, so the output doesn't differ from a serial run.
+    """
+    try:
+        yield from _iter_occurrences_per_file(
+            filenames=filenames,
+            execution_plan=execution_plan,
+            worker_setup=worker_setup,
+            jobs=jobs,
+            result_cache=result_cache,
+        )
+    finally:
+        # Also keep what was cached (and found missing) before a file failed to lint
+        if result_cache is not None:
+            result_cache.save()
+
+
+def format_occurrence(occurrence: Occurrence) -> str:
+    """
+    Format the given occurrence as a line of the linter's output.
+    """
+    return f'"{occurrence.file_path}:{occurrence.line_number}": ({occurrence.rule_id}) {occurrence.rule_label}\n'
+
+
+def _iter_occurrences_per_file(
+    *,
+    filenames: Iterable[str],
+    execution_plan: ExecutionPlan,
+    worker_setup: WorkerSetup,
+    jobs: int,
+    result_cache: ResultCache | None,
+) -> Iterator[list[Occurrence]]:
+    # Peek at the first files to find out whether there are enough of them to start a pool of worker processes
+    filenames = iter(filenames)
+    first_filenames = list(itertools.islice(filenames, PARALLEL_FILE_COUNT_THRESHOLD)) if jobs > 1 else []
+    is_parallel = len(first_filenames) >= PARALLEL_FILE_COUNT_THRESHOLD
+
+    # The occurrences taken from the cache (or None, if the file has to be linted) and the cache lookups of all files
+    # handed out for linting, in the order of the given filenames
+    looked_up_files: deque[tuple[list[Occurrence] | None, CacheLookup | None]] = deque()
+
+    def iter_pending_filenames() -> Iterator[str]:
+        for filename in itertools.chain(first_filenames, filenames):
+            cache_lookup = _look_up_cached_occurrences(
+                filename=filename, execution_plan=execution_plan, result_cache=result_cache
+            )
+            if cache_lookup is not None and cache_lookup.occurrences is not None:
+                looked_up_files.append((cache_lookup.occurrences, None))
+            else:
+                looked_up_files.append((None, cache_lookup))
+                yield filename
+
+    # Take the occurrences of all unchanged files from the cache and lint all others
+    for linted_occurrences in _lint_pending_files(
+        filenames=iter_pending_filenames(),
+        execution_plan=execution_plan,
+        worker_setup=worker_setup,
+        jobs=jobs if is_parallel else 1,
+    ):
+        cached_occurrences, cache_lookup = looked_up_files.popleft()
+        while cached_occurrences is not None:
+            yield cached_occurrences
+            cached_occurrences, cache_lookup = looked_up_files.popleft()
+
+        if cache_lookup is not None:
+            result_cache.store(lookup=cache_lookup, occurrences=linted_occurrences)
+        yield linted_occurrences
+
+    # All files after the last linted one were taken from the cache
+    for cached_occurrences, _ in looked_up_files:
+        yield cached_occurrences
+
+
+def _look_up_cached_occurrences(
+    *, filename: str, execution_plan: ExecutionPlan, result_cache: ResultCache | None
+) -> CacheLookup | None:
+    if result_cache is None:
+        return None
+
+    rule_ids = tuple(rule_class.RULE_ID for rule_class in execution_plan.rules_for_file(filename=filename))
+    # Files no rule applies to don't have any occurrences. There's no need to look them up.
+    if not rule_ids:
+        return CacheLookup(key="", occurrences=[])
+    return result_cache.lookup(file_path=Path(filename), rule_ids=rule_ids)
+
+
+def _lint_pending_files(
+    *,
+    filenames: Iterable[str],
+    execution_plan: ExecutionPlan,
+    worker_setup: WorkerSetup,
+    jobs: int,
+) -> Iterator[list[Occurrence]]:
+    if jobs <= 1:
+        for filename in filenames:
+            yield lint_file(filename=filename, execution_plan=execution_plan)
+        return
+
+    # Only imported once a pool is needed, it pulls in all of multiprocessing
+    from concurrent.futures import ProcessPoolExecutor  # noqa: PLC0415
+
+    # Files are handed out in chunks while they are still being discovered, so their total number isn't known up
+    # front. Unlike `Executor.map()`, which consumes all filenames before yielding the first result (before Python
+    # 3.14), only a bounded window of chunks is pending at any time.
+    filenames = iter(filenames)
+    max_pending_chunks = jobs * PARALLEL_PENDING_CHUNKS_PER_JOB
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_initialize_worker, initargs=(worker_setup,)) as executor:
+        pending_chunks = deque()
+        while chunk := list(itertools.islice(filenames, PARALLEL_CHUNK_SIZE)):
+            pending_chunks.append(executor.submit(_lint_files_in_worker, chunk))
+            if len(pending_chunks) >= max_pending_chunks:
+                yield from pending_chunks.popleft().result()
+        while pending_chunks:
+            yield from pending_chunks.popleft().result()
+
+
+def _initialize_worker(worker_setup: WorkerSetup) -> None:
+    global _worker_execution_plan  # noqa: PLW0603
+
+    # The main process already warned about invalid rule IDs in the configuration
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        _worker_execution_plan = compile_execution_plan(
+            configuration=worker_setup.configuration,
+            rules=resolve_rules(
+                configuration=worker_setup.configuration,
+                config_anchor_dir=worker_setup.config_anchor_dir,
+                cache_dir=worker_setup.cache_dir,
+                rule_entry_points=worker_setup.rule_entry_points,
+            ),
+            config_anchor_dir=worker_setup.config_anchor_dir,
+        )
+
+
+def _lint_files_in_worker(filenames: list[str]) -> list[list[Occurrence]]:
+    return [lint_file(filename=filename, execution_plan=_worker_execution_plan) for filename in filenames]
@@ -0,0 +1,295 @@
+import argparse
+import json
+import os
+import re
+import sys
+import threading
+from collections.abc import Sequence
+from typing import BinaryIO
+from urllib.parse import unquote, urlparse
+
+from boa_restrictor.cli.daemon import DaemonState
+from boa_restrictor.cli.linting import lint_source_code
+from boa_restrictor.common.node_index import NodeIndex
+from boa_restrictor.common.noqa import SuppressionComments, get_suppression_comments
+from boa_restrictor.exceptions.syntax_errors import BoaRestrictorParsingError
+from boa_restrictor.projections.occurrence import Occurrence
+
+# Seconds to wait after the last change of a document before linting it again
+DEFAULT_DEBOUNCE_DELAY = 0.3
+
+# https://microsoft.github.io/language-server-protocol/specifications/lsp/3.17/specification/
+TEXT_DOCUMENT_SYNC_FULL = 1
+DIAGNOSTIC_SEVERITY_WARNING = 2
+MESSAGE_TYPE_ERROR = 1
+METHOD_NOT_FOUND_ERROR_CODE = -32601
+
+# The comments suppressing rules of a document can only change if a line containing "noqa" or "boa:" changes, or a
+# line containing triple quotes or ending with a backslash, since both can turn such a comment into part of a string
+# (or the other way around)
+_SUPPRESSION_RELEVANT_LINE_PATTERN = re.compile(r"noqa|boa\s*:|\"\"\"|'''|\\$", re.IGNORECASE)
+# Without "noqa" or "boa:", there can't be any comment suppressing a rule
+_SUPPRESSION_TEXT_PATTERN = re.compile(r"noqa|boa\s*:", re.IGNORECASE)
+
+
+def read_message(stream: BinaryIO) -> dict | None:
+    """
+    Read a JSON-RPC message from the given stream. Returns None once the stream is closed.
+    """
+    content_length = None
+    while True:
+        header = stream.readline()
+        if not header:
+            return None
+        header = header.strip()
+        if not header:
+            break
+        name, _, value = header.decode("ascii").partition(":")
+        if name.strip().lower() == "content-length":
+            content_length = int(value)
+
+    if content_length is None:
+        return None
+    return json.loads(stream.read(content_length))
+
+
+def write_message(stream: BinaryIO, message: dict) -> None:
+    """
+    Write the given JSON-RPC message to the given stream.
+    """
+    body = json.dumps(message).encode()
+    stream.write(f"Content-Length: {len(body)}\r\n\r\n".encode("ascii") + body)
+    stream.flush()
+
+
+def uri_to_filename(*, uri: str, working_dir: str) -> str:
+    """
+    Convert a "file://" URI to a filename. Files within the working directory are returned relative to it, just like
+    pre-commit passes them, so per-file exclusions match the same way.
+    """
+    path = unquote(urlparse(uri).path)
+    relative_path = os.path.relpath(path, working_dir)
+    if relative_path == os.pardir or relative_path.startswith(os.pardir + os.sep):
+        return path
+    return relative_path
+
+
+class SuppressionCommentCache:
+    """
+    Remembers the comments suppressing rules (noqa comments and boa directives) of every document, so they are only
+    collected again if a line which can affect them changed.
+    """
+
+    def __init__(self):
+        self._suppression_comments_by_uri: dict[str, tuple[tuple, SuppressionComments]] = {}
+
+    def get(
+        self, *, uri: str, source_code: str, filename: str, node_index: NodeIndex | None = None
+    ) -> SuppressionComments:
+        relevant_lines = tuple(
+            (line_number, line)
+            for line_number, line in enumerate(source_code.splitlines(), start=1)
+            if _SUPPRESSION_RELEVANT_LINE_PATTERN.search(line)
+        )
+
+        if not any(_SUPPRESSION_TEXT_PATTERN.search(line) for _, line in relevant_lines):
+            return SuppressionComments(noqa_comments=[], boa_directives=[])
+
+        cached = self._suppression_comments_by_uri.get(uri)
+        if cached is not None and cached[0] == relevant_lines:
+            return cached[1]
+
+        suppression_comments = get_suppression_comments(
+            source_code=source_code, filename=filename, node_index=node_index
+        )
+        self._suppression_comments_by_uri[uri] = (relevant_lines, suppression_comments)
+        return suppression_comments
+
+    def forget(self, *, uri: str) -> None:
+        self._suppression_comments_by_uri.pop(uri, None)
+
+
+class LanguageServer:
+    """
+    A minimal language server publishing the occurrences of all open documents as diagnostics.
+    Documents are linted when opened or saved and, debounced, after every change.
+    """
+
+    def __init__(
+        self,
+        *,
+        state: DaemonState,
+        reader: BinaryIO,
+        writer: BinaryIO,
+        debounce_delay: float = DEFAULT_DEBOUNCE_DELAY,
+    ):
+        self.state = state
+        self.reader = reader
+        self.writer = writer
+        self.debounce_delay = debounce_delay
+
+        self.documents: dict[str, str] = {}
+        self.suppression_comment_cache = SuppressionCommentCache()
+        self.is_shutdown = False
+
+        self._lock = threading.RLock()
+        self._pending_lints: dict[str, threading.Timer] = {}
+
+    def serve(self) -> None:
+        """
+        Handle messages until the client sends "exit" or closes the stream.
+        """
+        while True:
+            message = read_message(self.reader)
+            if message is None or message.get("method") == "exit":
+                break
+            self.handle_message(message)
+
+        with self._lock:
+            for timer in self._pending_lints.values():
+                timer.cancel()
+
+    def handle_message(self, message: dict) -> None:
+        method = message.get("method")
+        params = message.get("params") or {}
+
+        if method == "initialize":
+            self._respond(message, result={"capabilities": {"textDocumentSync": TEXT_DOCUMENT_SYNC_FULL}})
+        elif method == "shutdown":
+            self.is_shutdown = True
+            self._respond(message, result=None)
+        elif method == "textDocument/didOpen":
+            uri = params["textDocument"]["uri"]
+            with self._lock:
+                self.documents[uri] = params["textDocument"]["text"]
+            self.lint_document(uri=uri)
+        elif method == "textDocument/didChange":
+            uri = params["textDocument"]["uri"]
+            with self._lock:
+                # We only support full document synchronisation, so the last change holds the whole document
+                self.documents[uri] = params["contentChanges"][-1]["text"]
+            self._schedule_lint(uri=uri)
+        elif method == "textDocument/didSave":
+            self.lint_document(uri=params["textDocument"]["uri"])
+        elif method == "textDocument/didClose":
+            uri = params["textDocument"]["uri"]
+            with self._lock:
+                self._cancel_pending_lint(uri=uri)
+                self.documents.pop(uri, None)
+                self.suppression_comment_cache.forget(uri=uri)
+            self._notify("textDocument/publishDiagnostics", params={"uri": uri, "diagnostics": []})
+        elif "id" in message and method is not None:
+            self._send(
+                {
+                    "jsonrpc": "2.0",
+                    "id": message["id"],
+                    "error": {"code": METHOD_NOT_FOUND_ERROR_CODE, "message": f'Unknown method "{method}".'},
+                }
+            )
+
+    def lint_document(self, *, uri: str) -> None:
+        """
+        Lint the current content of the given document and publish its occurrences as diagnostics.
+        """
+        with self._lock:
+            self._cancel_pending_lint(uri=uri)
+            source_code = self.documents.get(uri)
+            if source_code is None:
+                return
+
+            try:
+                self.state.reload_if_changed()
+            except Exception as e:  # noqa: BLE001
+                # E.g. a syntax error in the configuration. Tell the user, but keep serving with the last valid one.
+                self._notify(
+                    "window/showMessage",
+                    params={"type": MESSAGE_TYPE_ERROR, "message": f"boa-restrictor: {type(e).__name__}: {e}"},
+                )
+
+            filename = uri_to_filename(uri=uri, working_dir=self.state.working_dir)
+            try:
+                occurrences = lint_source_code(
+                    filename=filename,
+                    source_code=source_code,
+                    execution_plan=self.state.execution_plan,
+                    suppression_comments_getter=lambda **kwargs: self.suppression_comment_cache.get(uri=uri, **kwargs),
+                )
+            except BoaRestrictorParsingError:
+                # The document is most likely being edited right now. Keep the diagnostics of its last valid state.
+                return
+
+            lines = source_code.splitlines()
+            diagnostics = [self._build_diagnostic(occurrence=occurrence, lines=lines) for occurrence in occurrences]
+            self._notify("textDocument/publishDiagnostics", params={"uri": uri, "diagnostics": diagnostics})
+
+    def _schedule_lint(self, *, uri: str) -> None:
+        if self.debounce_delay <= 0:
+            self.lint_document(uri=uri)
+            return
+
+        with self._lock:
+            self._cancel_pending_lint(uri=uri)
+            timer = threading.Timer(self.debounce_delay, self.lint_document, kwargs={"uri": uri})
+            timer.daemon = True
+            self._pending_lints[uri] = timer
+            timer.start()
+
+    def _cancel_pending_lint(self, *, uri: str) -> None:
+        timer = self._pending_lints.pop(uri, None)
+        if timer is not None and timer is not threading.current_thread():
+            timer.cancel()
+
+    @staticmethod
+    def _build_diagnostic(*, occurrence: Occurrence, lines: list[str]) -> dict:
+        line_index = max(occurrence.line_number - 1, 0)
+        line = lines[line_index] if line_index < len(lines) else ""
+        return {
+            "range": {
+                "start": {"line": line_index, "character": len(line) - len(line.lstrip())},
+                "end": {"line": line_index, "character": len(line)},
+            },
+            "severity": DIAGNOSTIC_SEVERITY_WARNING,
+            "code": occurrence.rule_id,
+            "source": "boa-restrictor",
+            "message": occurrence.rule_label,
+        }
+
+    def _respond(self, request: dict, *, result) -> None:
+        self._send({"jsonrpc": "2.0", "id": request["id"], "result": result})
+
+    def _notify(self, method: str, *, params: dict) -> None:
+        self._send({"jsonrpc": "2.0", "method": method, "params": params})
+
+    def _send(self, message: dict) -> None:
+        with self._lock:
+            write_message(self.writer, message)
+
+
+def main(argv: Sequence[str] | None = None):
+    parser = argparse.ArgumentParser(
+        prog="boa-restrictor lsp",
+    )
+    parser.add_argument(
+        "--config",
+        default="pyproject.toml",
+        type=str,
+        help="Location of pyproject.toml configuration file",
+    )
+    parser.add_argument(
+        "--debounce-delay",
+        default=DEFAULT_DEBOUNCE_DELAY,
+        type=float,
+        help="Seconds to wait after the last change of a document before linting it again.",
+    )
+    args = parser.parse_args(argv)
+
+    language_server = LanguageServer(
+        state=DaemonState(config_path=args.config),
+        reader=sys.stdin.buffer,
+        writer=sys.stdout.buffer,
+        debounce_delay=args.debounce_delay,
+    )
+    language_server.serve()
+
+    # The client is supposed to request a shutdown before it tells the server to exit
+    return not language_server.is_shutdown
@@ -1,23 +1,169 @@
 import argparse
+import os
 import sys
-from collections.abc import Sequence
+from collections.abc import Iterable, Sequence
 from pathlib import Path
 
-from boa_restrictor.cli.configuration import is_rule_excluded, is_rule_excluded_per_file, load_configuration
-from boa_restrictor.cli.custom_rules import load_custom_rules, validate_unique_rule_ids
-from boa_restrictor.cli.utils import parse_source_code_or_fail
-from boa_restrictor.common.noqa import get_noqa_comments
-from boa_restrictor.rules import get_rules
+from boa_restrictor.cli.configuration import compile_execution_plan, load_configuration
+from boa_restrictor.cli.discovery import find_python_files
+from boa_restrictor.cli.linting import (
+    WorkerSetup,
+    discover_enabled_rule_entry_points,
+    iter_file_occurrences,
+    resolve_rules,
+)
+from boa_restrictor.cli.output import OUTPUT_WRITERS, OutputWriter, create_output_writer
+from boa_restrictor.cli.path_filter import RelativePathResolver
+from boa_restrictor.exceptions.cli import InvalidJobCountError
+from boa_restrictor.projections.occurrence import Occurrence
+
+# Everything only needed by some of the modes (daemon, language server, watch mode, result cache, git, baseline) is
+# imported once the mode is chosen, so a plain run - like every pre-commit hook call - doesn't pay for it at startup
+
+
+def parse_job_count(value: str) -> int:
+    """
+    Parse the value of the "--jobs" argument: a positive number or "auto" for one job per available CPU.
+    """
+    if value == "auto":
+        try:
+            return len(os.sched_getaffinity(0))
+        except AttributeError:
+            return os.cpu_count() or 1
+
+    try:
+        jobs = int(value)
+    except ValueError:
+        jobs = 0
+    if jobs < 1:
+        raise InvalidJobCountError(value)
+    return jobs
 
 
 def main(argv: Sequence[str] | None = None):
+    # "boa-restrictor daemon" keeps everything warm for the thin client, see `boa_restrictor.cli.daemon`.
+    # "boa-restrictor lsp" runs a language server for editors, see `boa_restrictor.cli.lsp`.
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv and argv[0] == "daemon":
+        from boa_restrictor.cli.daemon import main as daemon_main  # noqa: PLC0415
+
+        return daemon_main(argv=argv[1:])
+    if argv and argv[0] == "lsp":
+        from boa_restrictor.cli.lsp import main as lsp_main  # noqa: PLC0415
+
+        return lsp_main(argv=argv[1:])
+
+    args = _parse_arguments(argv=argv)
+
+    # Keep rules and configuration loaded and re-lint only changed files, until interrupted
+    if args.watch:
+        from boa_restrictor.cli.daemon import DaemonState  # noqa: PLC0415
+        from boa_restrictor.cli.watch import Watcher  # noqa: PLC0415
+
+        Watcher(paths=args.filenames or ["."], state=DaemonState(config_path=args.config), output=sys.stdout).run()
+        return False
+
+    # Get excluded linting rules from configuration
+    configuration = load_configuration(file_path=args.config)
+
+    # Resolve all rules eagerly so import/validation errors fail fast before any file is processed
+    config_anchor_dir = (Path.cwd() / args.config).parent
+    cache_dir = Path(args.cache_dir) if args.cache_dir is not None else None
+    rule_entry_points = discover_enabled_rule_entry_points(configuration=configuration, cache_dir=cache_dir)
+    enabled_rules = resolve_rules(
+        configuration=configuration,
+        config_anchor_dir=config_anchor_dir,
+        cache_dir=cache_dir,
+        rule_entry_points=rule_entry_points,
+    )
+
+    # Compile the configuration once, so no configuration work is left for the per-file loop
+    execution_plan = compile_execution_plan(
+        configuration=configuration, rules=enabled_rules, config_anchor_dir=config_anchor_dir
+    )
+
+    # Reuse the results of files which didn't change since the last run with the same setup
+    result_cache = None
+    if cache_dir is not None:
+        from boa_restrictor.cli.cache import ResultCache, compute_run_fingerprint  # noqa: PLC0415
+
+        result_cache = ResultCache(
+            cache_dir=cache_dir,
+            run_fingerprint=compute_run_fingerprint(configuration=configuration, rules=execution_plan.rules),
+            relative_path_resolver=execution_plan.path_filter.relative_path_resolver,
+        )
+
+    # Expand directories into the Python files within them, while linting already starts with the first ones...
+    filenames = find_python_files(paths=args.filenames, path_filter=execution_plan.path_filter)
+
+    # ... but lint only the files which changed since the given git ref
+    if args.changed_since is not None:
+        from boa_restrictor.cli.git_diff import select_changed_filenames  # noqa: PLC0415
+
+        filenames = select_changed_filenames(filenames=list(filenames), ref=args.changed_since)
+
+    # Lint the files one by one. Occurrences are handed on per file and never collected, so memory usage stays flat
+    # however many there are.
+    occurrences_per_file = iter_file_occurrences(
+        filenames=filenames,
+        execution_plan=execution_plan,
+        worker_setup=WorkerSetup(
+            configuration=configuration,
+            config_anchor_dir=config_anchor_dir,
+            cache_dir=cache_dir,
+            rule_entry_points=rule_entry_points,
+        ),
+        jobs=args.jobs,
+        result_cache=result_cache,
+    )
+
+    # Only report occurrences on changed lines, so only new violations surface
+    if args.diff_lines:
+        from boa_restrictor.cli.git_diff import filter_occurrences_on_changed_lines, get_changed_lines  # noqa: PLC0415
+
+        changed_lines = get_changed_lines(ref=args.changed_since)
+        occurrences_per_file = (
+            filter_occurrences_on_changed_lines(occurrences=file_occurrences, changed_lines=changed_lines)
+            for file_occurrences in occurrences_per_file
+        )
+
+    # Freeze the current occurrences instead of reporting them...
+    if args.write_baseline:
+        _write_baseline(
+            occurrences_per_file=occurrences_per_file,
+            path=Path(args.baseline),
+            relative_path_resolver=execution_plan.path_filter.relative_path_resolver,
+        )
+        return False
+
+    # ... or don't report the frozen ones
+    if args.baseline is not None:
+        from boa_restrictor.cli.baseline import Baseline  # noqa: PLC0415
+
+        baseline = Baseline.load(
+            path=Path(args.baseline), relative_path_resolver=execution_plan.path_filter.relative_path_resolver
+        )
+        occurrences_per_file = (
+            baseline.filter_new_occurrences(occurrences=file_occurrences) for file_occurrences in occurrences_per_file
+        )
+
+    # Print the details of every match coming from pre-commit as soon as its file is done.
+    # Since pre-commit will run this function x times, we skip any success or result count messages.
+    return _write_occurrences(
+        occurrences_per_file=occurrences_per_file,
+        output_writer=create_output_writer(output_format=args.format, stream=sys.stdout, rules=execution_plan.rules),
+    )
+
+
+def _parse_arguments(*, argv: Sequence[str]) -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         prog="boa-restrictor",
     )
     parser.add_argument(
         "filenames",
         nargs="*",
-        help="Filenames to process.",
+        help="Filenames to process. Directories are searched for Python files, skipping those ignored by git.",
     )
     parser.add_argument(
         "--config",
@@ -25,75 +171,95 @@ def main(argv: Sequence[str] | None = None):
         type=str,
         help="Location of pyproject.toml configuration file",
     )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        default=1,
+        type=parse_job_count,
+        help='Number of processes to lint files in parallel, "auto" for one per CPU. Small batches run serially.',
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        type=str,
+        help="Directory to cache results in, e.g. .boa_restrictor_cache. Unchanged files aren't linted again.",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and re-lint the Python files within the given paths (default: the current directory) "
+        "whenever they change.",
+    )
+    parser.add_argument(
+        "--changed-since",
+        default=None,
+        type=str,
+        metavar="REF",
+        help="Only lint Python files which differ from the given git ref. Without filenames, all of them.",
+    )
+    parser.add_argument(
+        "--diff-lines",
+        action="store_true",
+        help='Only report occurrences on lines which changed since the ref given via "--changed-since".',
+    )
+    parser.add_argument(
+        "--baseline",
+        default=None,
+        type=str,
+        metavar="FILE",
+        help="Don't report occurrences stored in the given baseline file, so only new violations surface.",
+    )
+    parser.add_argument(
+        "--write-baseline",
+        action="store_true",
+        help='Store all occurrences in the file given via "--baseline" instead of reporting them.',
+    )
+    parser.add_argument(
+        "--format",
+        default="text",
+        choices=OUTPUT_WRITERS,
+        help="Output format: text, JSON Lines, SARIF 2.1.0, GitHub Actions annotations or JUnit XML.",
+    )
     args = parser.parse_args(argv)
+    if args.diff_lines and args.changed_since is None:
+        parser.error('"--diff-lines" requires "--changed-since"')
+    if args.write_baseline and args.baseline is None:
+        parser.error('"--write-baseline" requires "--baseline"')
+    if args.watch:
+        # Watch mode lints file by file in-process and prints plain text, so these would be ignored silently
+        watch_incompatible_options = [
+            option
+            for option, is_given in (
+                ("--jobs", args.jobs != 1),
+                ("--cache-dir", args.cache_dir is not None),
+                ("--format", args.format != "text"),
+                ("--changed-since", args.changed_since is not None),
+                ("--baseline", args.baseline is not None),
+            )
+            if is_given
+        ]
+        if watch_incompatible_options:
+            parser.error(f'"--watch" can\'t be combined with "{watch_incompatible_options[0]}"')
+    return args
 
-    # Get excluded linting rules from configuration
-    configuration = load_configuration(file_path=args.config)
-    globally_excluded_rules = configuration.get("exclude", [])
-    enable_django_rules = configuration.get("enable_django_rules", True)
-    per_file_excluded_rules: dict[str, list[str]] = configuration.get("per-file-excludes", {})
-    custom_rule_paths = configuration.get("custom_rules", [])
 
-    # Resolve all rules eagerly so import/validation errors fail fast before any file is processed
-    builtin_rules = get_rules(use_django_rules=enable_django_rules)
-    config_anchor_dir = (Path.cwd() / args.config).parent
-    custom_rules = load_custom_rules(paths=custom_rule_paths, anchor_dir=config_anchor_dir)
-    enabled_rules = builtin_rules + custom_rules
-    validate_unique_rule_ids(rules=enabled_rules)
-    active_rule_ids = {rule_class.RULE_ID for rule_class in enabled_rules}
-
-    # Iterate over all filenames coming from pre-commit...
-    occurrences = []
-    for filename in args.filenames:
-        # Read source code
-        with open(filename) as f:
-            source_code = f.read()
-
-        # Parse code through abstract syntax tree
-        source_tree = parse_source_code_or_fail(filename=filename, source_code=source_code)
-
-        # Fetch all ignored line comments
-        noqa_tokens = get_noqa_comments(source_code=source_code, filename=filename)
-
-        # Iterate over all linters...
-        for rule_class in enabled_rules:
-            # Skip linters, which have been excluded globally via the configuration
-            if is_rule_excluded(
-                rule_class=rule_class,
-                excluded_rules=globally_excluded_rules,
-                active_rule_ids=active_rule_ids,
-            ):
-                continue
-
-            # Iterate per-file rule exclusions
-            if is_rule_excluded_per_file(
-                filename=filename,
-                rule_class=rule_class,
-                per_file_excluded_rules=per_file_excluded_rules,
-                active_rule_ids=active_rule_ids,
-            ):
-                continue
-
-            # Ensure that line exclusions are respected
-            excluded_lines = {token[0] for token in noqa_tokens if rule_class.RULE_ID in token[1]}
-
-            # Add issues to our occurrence list
-            occurrences.extend(
-                [
-                    possible_occurrence
-                    for possible_occurrence in rule_class.run_check(file_path=Path(filename), source_tree=source_tree)
-                    if possible_occurrence.line_number not in excluded_lines
-                ]
-            )
+def _write_occurrences(*, occurrences_per_file: Iterable[list[Occurrence]], output_writer: OutputWriter) -> bool:
+    # Returns whether there were any occurrences
+    output_writer.open()
+    has_occurrences = False
+    for file_occurrences in occurrences_per_file:
+        has_occurrences = has_occurrences or bool(file_occurrences)
+        output_writer.write_file_occurrences(file_occurrences)
+    output_writer.close()
+    return has_occurrences
 
-    # If we have any matches...
-    if any(occurrences):
-        # Iterate over them and print details for the user
-        for occurrence in occurrences:
-            sys.stdout.write(
-                f'"{occurrence.file_path}:{occurrence.line_number}": ({occurrence.rule_id}) {occurrence.rule_label}\n'
-            )
 
-    # Since pre-commit will run this function x times, we skip any success or result count messages.
+def _write_baseline(
+    *, occurrences_per_file: Iterable[list[Occurrence]], path: Path, relative_path_resolver: RelativePathResolver
+) -> None:
+    from boa_restrictor.cli.baseline import Baseline  # noqa: PLC0415
 
-    return bool(any(occurrences))
+    baseline = Baseline(relative_path_resolver=relative_path_resolver)
+    for file_occurrences in occurrences_per_file:
+        baseline.add(occurrences=file_occurrences)
+    baseline.save(path=path)
@@ -0,0 +1,202 @@
+import json
+from collections.abc import Sequence
+from typing import TextIO
+
+from boa_restrictor import __version__
+from boa_restrictor.cli.linting import format_occurrence
+from boa_restrictor.common.rule import Rule
+from boa_restrictor.projections.occurrence import Occurrence
+
+SARIF_SCHEMA_URI = "https://json.schemastore.org/sarif-2.1.0.json"
+INFORMATION_URI = "https://github.com/ambient-innovation/boa-restrictor"
+
+
+class OutputWriter:
+    """
+    Writes occurrences to a stream as soon as a file is done, with a single write per file. Formats wrapping all
+    occurrences in an envelope write its beginning when opened and its end when closed.
+    """
+
+    def __init__(self, *, stream: TextIO):
+        self.stream = stream
+
+    def open(self) -> None:
+        self._write(self.format_header())
+
+    def write_file_occurrences(self, occurrences: Sequence[Occurrence]) -> None:
+        if occurrences:
+            self._write(self.format_file_occurrences(occurrences))
+
+    def close(self) -> None:
+        self._write(self.format_footer())
+        self.stream.flush()
+
+    def format_header(self) -> str:
+        return ""
+
+    def format_file_occurrences(self, occurrences: Sequence[Occurrence]) -> str:
+        raise NotImplementedError
+
+    def format_footer(self) -> str:
+        return ""
+
+    def _write(self, output: str) -> None:
+        if output:
+            self.stream.write(output)
+            # Give immediate feedback on long runs, even if the output is piped
+            self.stream.flush()
+
+
+class TextOutputWriter(OutputWriter):
+    """
+    The linter's regular output: one line per occurrence.
+    """
+
+    def format_file_occurrences(self, occurrences: Sequence[Occurrence]) -> str:
+        return "".join(format_occurrence(occurrence) for occurrence in occurrences)
+
+
+class JsonLinesOutputWriter(OutputWriter):
+    """
+    One JSON object per occurrence and line.
+    """
+
+    def format_file_occurrences(self, occurrences: Sequence[Occurrence]) -> str:
+        return "".join(
+            json.dumps(
+                {
+                    "rule_id": occurrence.rule_id,
+                    "rule_label": occurrence.rule_label,
+                    "filename": occurrence.filename,
+                    "file_path": str(occurrence.file_path),
+                    "line_number": occurrence.line_number,
+                    "identifier": occurrence.identifier,
+                }
+            )
+            + "\n"
+            for occurrence in occurrences
+        )
+
+
+class SarifOutputWriter(OutputWriter):
+    """
+    A SARIF 2.1.0 log with a single run, describing all enabled rules. Results are written one by one into the run's
+    "results" array, which is closed along with the log at the end.
+    """
+
+    def __init__(self, *, stream: TextIO, rules: Sequence[type[Rule]]):
+        super().__init__(stream=stream)
+        self.rules = rules
+        self._has_results = False
+
+    def format_header(self) -> str:
+        driver = {
+            "name": "boa-restrictor",
+            "version": __version__,
+            "informationUri": INFORMATION_URI,
+            "rules": [
+                {"id": rule_class.RULE_ID, "shortDescription": {"text": rule_class.RULE_LABEL}}
+                for rule_class in self.rules
+            ],
+        }
+        # Leave the log open after the beginning of the "results" array
+        header = json.dumps({"version": "2.1.0", "$schema": SARIF_SCHEMA_URI, "runs": [{"tool": {"driver": driver}}]})
+        return header[: -len("}]}")] + ', "results": ['
+
+    def format_file_occurrences(self, occurrences: Sequence[Occurrence]) -> str:
+        results = [self._format_result(occurrence=occurrence) for occurrence in occurrences]
+        separator = ", " if self._has_results else ""
+        self._has_results = True
+        return separator + ", ".join(results)
+
+    def format_footer(self) -> str:
+        return "]}]}\n"
+
+    @staticmethod
+    def _format_result(*, occurrence: Occurrence) -> str:
+        result = {
+            "ruleId": occurrence.rule_id,
+            "level": "error",
+            "message": {"text": occurrence.rule_label},
+            "locations": [
+                {
+                    "physicalLocation": {
+                        "artifactLocation": {"uri": occurrence.file_path.as_posix()},
+                        "region": {"startLine": occurrence.line_number},
+                    }
+                }
+            ],
+        }
+        if occurrence.identifier is not None:
+            result["locations"][0]["logicalLocations"] = [{"name": occurrence.identifier}]
+        return json.dumps(result)
+
+
+class GithubOutputWriter(OutputWriter):
+    """
+    GitHub Actions workflow commands, annotating every occurrence as an error.
+    """
+
+    def format_file_occurrences(self, occurrences: Sequence[Occurrence]) -> str:
+        return "".join(
+            f"::error file={_escape_github_property(str(occurrence.file_path))},line={occurrence.line_number},"
+            f"title={_escape_github_property(occurrence.rule_id)}::{_escape_github_data(occurrence.rule_label)}\n"
+            for occurrence in occurrences
+        )
+
+
+class JunitOutputWriter(OutputWriter):
+    """
+    A JUnit XML report with a test suite per file and a failed test case per occurrence. Since the number of
+    occurrences is only known per file, the enclosing "testsuites" element doesn't carry any totals.
+    """
+
+    def format_header(self) -> str:
+        return '<?xml version="1.0" encoding="utf-8"?>\n<testsuites name="boa-restrictor">\n'
+
+    def format_file_occurrences(self, occurrences: Sequence[Occurrence]) -> str:
+        # "xml.sax.saxutils" pulls in urllib and ssl, which no other output format needs
+        from xml.sax.saxutils import escape, quoteattr  # noqa: PLC0415
+
+        file_path = quoteattr(str(occurrences[0].file_path))
+        test_cases = "".join(
+            f"    <testcase classname={file_path} name={quoteattr(f'{occurrence.rule_id}:{occurrence.line_number}')}>\n"
+            f"      <failure type={quoteattr(occurrence.rule_id)} message={quoteattr(occurrence.rule_label)}>"
+            f"{escape(format_occurrence(occurrence).rstrip())}</failure>\n"
+            f"    </testcase>\n"
+            for occurrence in occurrences
+        )
+        return (
+            f'  <testsuite name={file_path} tests="{len(occurrences)}" failures="{len(occurrences)}">\n'
+            f"{test_cases}"
+            f"  </testsuite>\n"
+        )
+
+    def format_footer(self) -> str:
+        return "</testsuites>\n"
+
+
+OUTPUT_WRITERS = {
+    "text": TextOutputWriter,
+    "jsonl": JsonLinesOutputWriter,
+    "sarif": SarifOutputWriter,
+    "github": GithubOutputWriter,
+    "junit": JunitOutputWriter,
+}
+
+
+def create_output_writer(*, output_format: str, stream: TextIO, rules: Sequence[type[Rule]]) -> OutputWriter:
+    """
+    Create the writer of the given output format (see `OUTPUT_WRITERS`).
+    """
+    if output_format == "sarif":
+        return SarifOutputWriter(stream=stream, rules=rules)
+    return OUTPUT_WRITERS[output_format](stream=stream)
+
+
+def _escape_github_data(value: str) -> str:
+    return value.replace("%", "%25").replace("\r", "%0D").replace("\n", "%0A")
+
+
+def _escape_github_property(value: str) -> str:
+    return _escape_github_data(value).replace(":", "%3A").replace(",", "%2C")
@@ -0,0 +1,119 @@
+import os
+from collections.abc import Sequence
+from pathlib import Path
+
+from boa_restrictor.cli.globs import compile_globs
+
+
+class RelativePathResolver:
+    """
+    Resolves filenames to their path relative to the configuration's directory, separated by "/". Resolving a
+    directory is expensive, so it is only done once per directory.
+    """
+
+    def __init__(self, *, anchor_dir: Path | str):
+        self.anchor_dir = os.path.abspath(anchor_dir)
+        self._relative_directories: dict[str, str | None] = {}
+
+    def get_relative_path(self, *, filename: str) -> str | None:
+        """
+        Returns the path of the given file relative to the configuration's directory, or None if it lies outside.
+        """
+        directory, name = os.path.split(filename)
+        relative_directory = self.get_relative_directory(directory=directory)
+        if relative_directory is None:
+            return None
+        return f"{relative_directory}/{name}" if relative_directory else name
+
+    def get_relative_directory(self, *, directory: str) -> str | None:
+        """
+        Returns the path of the given directory relative to the configuration's directory ("" for the directory
+        itself), or None if it lies outside.
+        """
+        try:
+            return self._relative_directories[directory]
+        except KeyError:
+            pass
+
+        relative_directory = os.path.relpath(os.path.abspath(directory), self.anchor_dir).replace(os.sep, "/")
+        if relative_directory == os.pardir or relative_directory.startswith(f"{os.pardir}/"):
+            relative_directory = None
+        elif relative_directory == os.curdir:
+            relative_directory = ""
+        self._relative_directories[directory] = relative_directory
+        return relative_directory
+
+
+class PathFilter:
+    """
+    Decides which files are linted at all, judging by their path relative to the configuration's directory.
+
+    A file is excluded if any of the "exclude-paths" globs matches its path or the path of one of its parent
+    directories. If there are any "include-paths" globs, a file has to be matched by one of them the same way.
+    All globs are compiled into one regular expression each, and the verdict on a directory is only made once.
+    """
+
+    def __init__(
+        self,
+        *,
+        relative_path_resolver: RelativePathResolver,
+        include_paths: Sequence[str] = (),
+        exclude_paths: Sequence[str] = (),
+    ):
+        self.relative_path_resolver = relative_path_resolver
+        self._include_regex = compile_globs(include_paths)
+        self._exclude_regex = compile_globs(exclude_paths)
+
+        # Path of a directory relative to the anchor -> whether it is excluded and whether it is included
+        self._directory_verdicts: dict[str, tuple[bool, bool]] = {"": (False, False)}
+
+    @property
+    def is_active(self) -> bool:
+        return self._include_regex is not None or self._exclude_regex is not None
+
+    def is_included(self, *, filename: str) -> bool:
+        """
+        Returns whether the given file is linted at all.
+        """
+        if not self.is_active:
+            return True
+
+        directory, name = os.path.split(filename)
+        relative_directory = self.relative_path_resolver.get_relative_directory(directory=directory)
+        if relative_directory is None:
+            # Files outside of the configuration's directory can't be matched by any glob
+            return self._include_regex is None
+
+        is_excluded, is_included = self._get_directory_verdict(relative_directory=relative_directory)
+        if is_excluded:
+            return False
+
+        relative_path = f"{relative_directory}/{name}" if relative_directory else name
+        if self._exclude_regex is not None and self._exclude_regex.fullmatch(relative_path):
+            return False
+        return is_included or self._include_regex is None or self._include_regex.fullmatch(relative_path) is not None
+
+    def is_directory_excluded(self, *, directory: str) -> bool:
+        """
+        Returns whether all files within the given directory are excluded, so it doesn't need to be searched at all.
+        """
+        if self._exclude_regex is None:
+            return False
+        relative_directory = self.relative_path_resolver.get_relative_directory(directory=directory)
+        return relative_directory is not None and self._get_directory_verdict(relative_directory=relative_directory)[0]
+
+    def _get_directory_verdict(self, *, relative_directory: str) -> tuple[bool, bool]:
+        directory_verdict = self._directory_verdicts.get(relative_directory)
+        if directory_verdict is None:
+            # A directory is excluded (or included) if it or any of its parents is
+            is_excluded, is_included = self._get_directory_verdict(
+                relative_directory=relative_directory.rpartition("/")[0]
+            )
+            directory_verdict = (
+                is_excluded
+                or (self._exclude_regex is not None and self._exclude_regex.fullmatch(relative_directory) is not None),
+                is_included
+                or (self._include_regex is not None and self._include_regex.fullmatch(relative_directory) is not None),
+            )
+            self._directory_verdicts[relative_directory] = directory_verdict
+        return directory_verdict
@@ -0,0 +1,40 @@
+import fnmatch
+import re
+from collections.abc import Mapping, Sequence
+
+from boa_restrictor.cli.path_filter import RelativePathResolver
+
+
+class PerFileExcludes:
+    """
+    The rules excluded per file via the "per-file-excludes" setting. Patterns are matched against a file's path
+    relative to the configuration's directory (files outside of it are matched as given).
+
+    All patterns are compiled into a single regular expression, which finds every matching pattern in one pass: every
+    pattern becomes an optional lookahead at the start of the path, capturing an empty group if it matches.
+    """
+
+    def __init__(self, *, patterns: Mapping[str, Sequence[str]], relative_path_resolver: RelativePathResolver):
+        self.relative_path_resolver = relative_path_resolver
+        self.excluded_rule_ids = tuple(frozenset(rule_ids) for rule_ids in patterns.values())
+        self._regex = (
+            re.compile(
+                "".join(
+                    f"(?:(?={fnmatch.translate(pattern)})(?P<pattern_{index}>))?"
+                    for index, pattern in enumerate(patterns)
+                )
+            )
+            if patterns
+            else None
+        )
+
+    def get_matched_patterns(self, *, filename: str) -> frozenset[int]:
+        """
+        Returns the indices of all patterns matching the given file.
+        """
+        if self._regex is None:
+            return frozenset()
+
+        relative_path = self.relative_path_resolver.get_relative_path(filename=filename)
+        match = self._regex.match(filename if relative_path is None else relative_path)
+        return frozenset(index for index in range(len(self.excluded_rule_ids)) if match[f"pattern_{index}"] is not None)
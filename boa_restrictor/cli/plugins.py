@@ -0,0 +1,145 @@
+import dataclasses
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+
+from boa_restrictor import __version__
+from boa_restrictor.cli.cache import ensure_cache_dir, write_json_atomically
+
+# Installed packages register their rule classes in this entry point group, named after their RULE_ID by convention
+RULE_ENTRY_POINT_GROUP = "boa_restrictor.rules"
+
+# Lives in the cache directory given via "--cache-dir", or the user's cache directory otherwise
+RULE_ENTRY_POINTS_FILENAME_PREFIX = "rule_entry_points"
+
+DISTRIBUTION_METADATA_SUFFIXES = (".dist-info", ".egg-info")
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class RuleEntryPoint:
+    """
+    A rule class registered by an installed distribution in the "boa_restrictor.rules" entry point group.
+    """
+
+    name: str
+    value: str
+    distribution_name: str
+
+    @property
+    def module_path(self) -> str:
+        return self.value.partition(":")[0].strip()
+
+    @property
+    def attr_name(self) -> str:
+        return self.value.partition(":")[2].strip()
+
+
+def discover_rule_entry_points(*, cache_dir: Path | None = None) -> tuple[RuleEntryPoint, ...]:
+    """
+    Find all rule classes registered via entry points by the installed distributions, without importing them.
+
+    Scanning the metadata of all installed distributions is expensive, so the result is stored in the given cache
+    directory, or the user's cache directory by default (see `get_user_cache_dir()`). It is reused until a
+    distribution is installed, upgraded or removed, see `compute_environment_key()`.
+    """
+    if cache_dir is None:
+        cache_dir = get_user_cache_dir()
+    environment_key = compute_environment_key()
+    cache_path = cache_dir / get_rule_entry_points_filename()
+    rule_entry_points = _load_cached_rule_entry_points(cache_path=cache_path, environment_key=environment_key)
+    if rule_entry_points is not None:
+        return rule_entry_points
+
+    rule_entry_points = _scan_rule_entry_points()
+    try:
+        ensure_cache_dir(cache_dir=cache_dir)
+        write_json_atomically(
+            path=cache_path,
+            data={
+                "environment_key": environment_key,
+                "entry_points": [dataclasses.asdict(rule_entry_point) for rule_entry_point in rule_entry_points],
+            },
+        )
+    except OSError:
+        # E.g. a read-only home directory. The next run has to scan again, but it works nonetheless.
+        pass
+    return rule_entry_points
+
+
+def get_user_cache_dir() -> Path:
+    """
+    Returns the current user's cache directory of boa-restrictor: "$XDG_CACHE_HOME/boa-restrictor" if set,
+    "~/.cache/boa-restrictor" otherwise.
+    """
+    user_cache_dir = os.environ.get("XDG_CACHE_HOME")
+    if user_cache_dir:
+        return Path(user_cache_dir) / "boa-restrictor"
+    return Path.home() / ".cache" / "boa-restrictor"
+
+
+def get_rule_entry_points_filename() -> str:
+    """
+    Returns the name of the file caching the entry points of the current environment. Every virtual environment
+    gets its own file, so switching between projects sharing the user's cache directory doesn't scan again.
+    """
+    environment_hash = hashlib.sha256(sys.prefix.encode()).hexdigest()[:12]
+    return f"{RULE_ENTRY_POINTS_FILENAME_PREFIX}-{environment_hash}.json"
+
+
+def compute_environment_key() -> str:
+    """
+    Hash the installed distributions of all sys.path entries. The name of a distribution's metadata directory
+    contains its version, and (re)installing a distribution replaces the directory, changing its modification time.
+    Only directories are listed, no metadata file is read.
+    """
+    distributions = []
+    for path in sys.path:
+        try:
+            with os.scandir(path or os.curdir) as directory_entries:
+                for directory_entry in directory_entries:
+                    if directory_entry.name.endswith(DISTRIBUTION_METADATA_SUFFIXES):
+                        distributions.append(
+                            [path, directory_entry.name, directory_entry.stat(follow_symlinks=False).st_mtime_ns]
+                        )
+        except OSError:
+            # Zipped packages and entries which don't exist (anymore)
+            continue
+
+    environment = json.dumps(
+        {"version": __version__, "python": sys.version, "distributions": sorted(distributions)}, sort_keys=True
+    )
+    return hashlib.sha256(environment.encode()).hexdigest()
+
+
+def _scan_rule_entry_points() -> tuple[RuleEntryPoint, ...]:
+    # Importing "importlib.metadata" alone takes a noticeable share of the startup time, which cached runs don't need
+    from importlib.metadata import entry_points  # noqa: PLC0415
+
+    rule_entry_points = {
+        RuleEntryPoint(
+            name=entry_point.name,
+            value=entry_point.value,
+            distribution_name=entry_point.dist.name if entry_point.dist is not None else "",
+        )
+        for entry_point in entry_points(group=RULE_ENTRY_POINT_GROUP)
+    }
+    # Sorted, so the order of the rules doesn't depend on the order of sys.path
+    return tuple(
+        sorted(
+            rule_entry_points,
+            key=lambda rule_entry_point: (rule_entry_point.name, rule_entry_point.value),
+        )
+    )
+
+
+def _load_cached_rule_entry_points(*, cache_path: Path, environment_key: str) -> tuple[RuleEntryPoint, ...] | None:
+    try:
+        with open(cache_path) as f:
+            cached_data = json.load(f)
+        if cached_data["environment_key"] != environment_key:
+            return None
+        return tuple(RuleEntryPoint(**rule_entry_point) for rule_entry_point in cached_data["entry_points"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
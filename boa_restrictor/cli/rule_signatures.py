@@ -0,0 +1,63 @@
+import dataclasses
+import json
+from pathlib import Path
+
+from boa_restrictor.cli.cache import ensure_cache_dir, write_json_atomically
+from boa_restrictor.cli.custom_rules import RuleSignature
+
+# Lives in the cache directory, next to the result cache
+RULE_SIGNATURES_FILENAME = "custom_rule_signatures.json"
+
+
+class RuleSignatureFile:
+    """
+    Remembers the signature of every declared custom rule class (see `CustomRuleDeclaration`) as found when it was
+    imported last time, along with the hash of its module's source code. As long as the module doesn't change, the
+    metadata declared in the configuration can be checked against the class without importing it.
+    """
+
+    def __init__(self, *, cache_dir: Path):
+        self.cache_dir = cache_dir
+        self.path = cache_dir / RULE_SIGNATURES_FILENAME
+        self._signatures = self._load()
+
+    def get_signature(self, *, dotted_path: str, source_hash: str) -> RuleSignature | None:
+        """
+        Returns the signature of the given rule class, or None if it wasn't recorded for the given source code.
+        """
+        signature = self._signatures.get(dotted_path)
+        if not isinstance(signature, dict) or signature.get("source_hash") != source_hash:
+            return None
+        try:
+            return RuleSignature(
+                rule_id=signature["rule_id"],
+                label=signature["label"],
+                trigger_keywords=tuple(signature["trigger_keywords"]),
+            )
+        except (KeyError, TypeError):
+            # Recorded by an older version
+            return None
+
+    def record(self, *, dotted_path: str, source_hash: str, signature: RuleSignature) -> None:
+        """
+        Record the signature of the given rule class, as imported from the given source code.
+        """
+        serialized_signature = {"source_hash": source_hash, **dataclasses.asdict(signature)}
+        serialized_signature["trigger_keywords"] = list(signature.trigger_keywords)
+        if self._signatures.get(dotted_path) == serialized_signature:
+            return
+
+        # Other processes might have recorded signatures in the meantime, don't throw them away
+        signatures = self._load()
+        signatures[dotted_path] = serialized_signature
+        ensure_cache_dir(cache_dir=self.cache_dir)
+        write_json_atomically(path=self.path, data=signatures)
+        self._signatures = signatures
+
+    def _load(self) -> dict[str, dict]:
+        try:
+            with open(self.path) as f:
+                signatures = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return signatures if isinstance(signatures, dict) else {}
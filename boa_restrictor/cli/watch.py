@@ -0,0 +1,277 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from collections.abc import Collection, Sequence
+from typing import TextIO
+
+from boa_restrictor.cli.daemon import DaemonState
+from boa_restrictor.cli.discovery import find_python_files
+from boa_restrictor.cli.linting import format_occurrence, lint_file
+from boa_restrictor.cli.path_filter import PathFilter
+from boa_restrictor.exceptions.syntax_errors import BoaRestrictorParsingError
+
+# Seconds between two scans of the watched files if inotify isn't available
+DEFAULT_POLL_INTERVAL = 1.0
+
+# Seconds to wait for further events after the first one, since editors tend to save files in several steps
+INOTIFY_SETTLE_DELAY = 0.05
+
+# See "man 7 inotify"
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_INOTIFY_MASK = (
+    _IN_MODIFY
+    | _IN_ATTRIB
+    | _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+    | _IN_DELETE_SELF
+)
+
+# The fixed-size beginning of every event: watch descriptor, mask, cookie and the length of the name following it
+_INOTIFY_EVENT_HEADER = struct.Struct("iIII")
+
+
+def scan_python_files(
+    *, paths: Sequence[str], path_filter: PathFilter | None = None
+) -> tuple[dict[str, tuple[int, int, int]], list[str]]:
+    """
+    Collect the modification time, size and inode of all Python files within the given paths, and all directories
+    searched for them. Files and directories are found just like a regular run finds them, see `find_python_files()`.
+    """
+    stat_index = {}
+    directories = []
+    for filename in find_python_files(paths=paths, path_filter=path_filter, visited_directories=directories):
+        try:
+            stat_result = os.stat(filename)
+        except OSError:
+            continue
+        stat_index[filename] = (stat_result.st_mtime_ns, stat_result.st_size, stat_result.st_ino)
+    return stat_index, directories
+
+
+def _is_within_directories(*, path: str, directories: Collection[str]) -> bool:
+    for directory in directories:
+        if directory == os.curdir:
+            # Paths within the current directory are found as "module.py", not as "./module.py"
+            if not os.path.isabs(path) and not path.startswith(os.pardir + os.sep):
+                return True
+        elif path.startswith(directory.rstrip(os.sep) + os.sep):
+            return True
+    return False
+
+
+class PollingChangeWaiter:
+    """
+    Waits a fixed interval between two scans of the watched files. Since it can't tell what changed, every scan
+    covers all of them.
+    """
+
+    def __init__(self, *, poll_interval: float = DEFAULT_POLL_INTERVAL):
+        self.poll_interval = poll_interval
+
+    def watch_directories(self, *, directories: Sequence[str]) -> None:
+        pass
+
+    def wait(self) -> set[str] | None:
+        time.sleep(self.poll_interval)
+        return None
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyChangeWaiter:
+    """
+    Waits until inotify reports a change within any of the watched directories (or `timeout` seconds passed) and
+    tells which directories changed, so only those have to be scanned again. Only available on Linux.
+    """
+
+    def __init__(self, *, timeout: float):
+        self.timeout = timeout
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._file_descriptor = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._file_descriptor < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1() failed")
+        self._watch_descriptors: dict[str, int] = {}
+        self._directories_by_watch_descriptor: dict[int, str] = {}
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return sys.platform.startswith("linux") and ctypes.util.find_library("c") is not None
+
+    def watch_directories(self, *, directories: Sequence[str]) -> None:
+        for directory in directories:
+            if directory in self._watch_descriptors:
+                continue
+            # Directories vanishing in the meantime are picked up by the next scan anyway
+            watch_descriptor = self._libc.inotify_add_watch(
+                self._file_descriptor, os.fsencode(directory), _INOTIFY_MASK
+            )
+            if watch_descriptor >= 0:
+                self._watch_descriptors[directory] = watch_descriptor
+                self._directories_by_watch_descriptor[watch_descriptor] = directory
+
+    def wait(self) -> set[str] | None:
+        """
+        Returns the directories which changed, or None if that's unknown, i.e. everything has to be scanned again.
+        """
+        readable, _, _ = select.select([self._file_descriptor], [], [], self.timeout)
+        if not readable:
+            # Scan everything every now and then, in case a directory slipped through our watches
+            return None
+        time.sleep(INOTIFY_SETTLE_DELAY)
+        return self._read_changed_directories()
+
+    def close(self) -> None:
+        os.close(self._file_descriptor)
+
+    def _read_changed_directories(self) -> set[str] | None:
+        changed_directories = set()
+        has_overflown = False
+        while True:
+            try:
+                events = os.read(self._file_descriptor, 65536)
+            except BlockingIOError:
+                return None if has_overflown else changed_directories
+
+            offset = 0
+            while offset < len(events):
+                watch_descriptor, mask, _, name_length = _INOTIFY_EVENT_HEADER.unpack_from(events, offset)
+                offset += _INOTIFY_EVENT_HEADER.size + name_length
+                if mask & _IN_Q_OVERFLOW:
+                    # Events were dropped, so we can't tell what changed
+                    has_overflown = True
+                directory = self._directories_by_watch_descriptor.get(watch_descriptor)
+                if directory is None:
+                    continue
+                changed_directories.add(directory)
+                if mask & _IN_IGNORED:
+                    # The directory is gone (or unmounted), watch it again if it comes back
+                    del self._directories_by_watch_descriptor[watch_descriptor]
+                    self._watch_descriptors.pop(directory, None)
+
+
+class Watcher:
+    """
+    Keeps a stat index of all watched Python files and re-lints only the files which changed since the last scan.
+    Files are found like a regular run finds them, honoring .gitignore files and the configured excludes. If the
+    changed directories are known, only they are scanned again.
+    The rules and the configuration stay loaded between two scans. They are only reloaded if the configuration or a
+    custom rule module changes, which re-lints all files.
+    """
+
+    def __init__(self, *, paths: Sequence[str], state: DaemonState, output: TextIO):
+        self.paths = paths
+        self.state = state
+        self.output = output
+        self.stat_index: dict[str, tuple[int, int, int]] = {}
+        self.directories: list[str] = []
+        self.occurrence_counts: dict[str, int] = {}
+
+        self._execution_plan = None
+
+    def lint_changed_files(self, *, changed_directories: Collection[str] | None = None) -> list[str]:
+        """
+        Scan the watched files (only those within the given directories, if known), lint all files which changed
+        since the last scan and print their occurrences. Returns the linted filenames.
+        """
+        self.state.reload_if_changed()
+        is_execution_plan_changed = self.state.execution_plan is not self._execution_plan
+        if changed_directories is None or is_execution_plan_changed:
+            stat_index, self.directories = scan_python_files(
+                paths=self.paths, path_filter=self.state.execution_plan.path_filter
+            )
+        else:
+            stat_index, self.directories = self._rescan_directories(directories=changed_directories)
+
+        if is_execution_plan_changed:
+            # Rules or configuration changed, so every file's occurrences might have changed
+            self._execution_plan = self.state.execution_plan
+            changed_filenames = sorted(stat_index)
+        else:
+            changed_filenames = sorted(
+                filename for filename, stat_record in stat_index.items() if self.stat_index.get(filename) != stat_record
+            )
+
+        for removed_filename in self.stat_index.keys() - stat_index.keys():
+            self.occurrence_counts.pop(removed_filename, None)
+        self.stat_index = stat_index
+
+        for filename in changed_filenames:
+            try:
+                occurrences = lint_file(filename=filename, execution_plan=self.state.execution_plan)
+            except (BoaRestrictorParsingError, OSError) as e:
+                self.output.write(f"{e}\n")
+                continue
+            self.occurrence_counts[filename] = len(occurrences)
+            for occurrence in occurrences:
+                self.output.write(format_occurrence(occurrence))
+
+        if changed_filenames:
+            self.output.write(
+                f"Linted {len(changed_filenames)} changed file(s), "
+                f"{sum(self.occurrence_counts.values())} occurrence(s) in {len(self.stat_index)} watched file(s).\n"
+            )
+            self.output.flush()
+
+        return changed_filenames
+
+    def _rescan_directories(self, *, directories: Collection[str]) -> tuple[dict[str, tuple[int, int, int]], list[str]]:
+        # Changed directories are searched recursively, since they might have gained subdirectories. Explicitly given
+        # files are cheap to check, so they are always checked.
+        explicit_filenames = [path for path in self.paths if not os.path.isdir(path)]
+        rescanned_stat_index, rescanned_directories = scan_python_files(
+            paths=[*directories, *explicit_filenames], path_filter=self.state.execution_plan.path_filter
+        )
+
+        stat_index = {
+            filename: stat_record
+            for filename, stat_record in self.stat_index.items()
+            if filename not in explicit_filenames and not _is_within_directories(path=filename, directories=directories)
+        }
+        stat_index.update(rescanned_stat_index)
+        unchanged_directories = [
+            directory
+            for directory in self.directories
+            if directory not in directories and not _is_within_directories(path=directory, directories=directories)
+        ]
+        return stat_index, [*unchanged_directories, *rescanned_directories]
+
+    def run(self, *, poll_interval: float = DEFAULT_POLL_INTERVAL) -> None:
+        """
+        Re-lint changed files until interrupted.
+        """
+        change_waiter = PollingChangeWaiter(poll_interval=poll_interval)
+        if InotifyChangeWaiter.is_available():
+            try:
+                # Scan at least every now and then, in case a directory slipped through our watches
+                change_waiter = InotifyChangeWaiter(timeout=poll_interval * 10)
+            except OSError:
+                # E.g. the limit of inotify instances is reached
+                pass
+
+        try:
+            changed_directories = None
+            while True:
+                self.lint_changed_files(changed_directories=changed_directories)
+                change_waiter.watch_directories(directories=self.directories)
+                changed_directories = change_waiter.wait()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            change_waiter.close()
@@ -1,4 +1,5 @@
 import ast
+from collections.abc import Iterable
 from typing import TypeGuard
 
 
@@ -56,3 +57,21 @@ def is_type_checking_if(node) -> bool:
         and test.value.id == "typing"
         and test.attr == "TYPE_CHECKING"
     )
+
+
+def collect_import_aliases(nodes: Iterable[ast.Import | ast.ImportFrom]) -> dict[str, str]:
+    """
+    Maps every name bound by the given import statements to the fully qualified name it refers to, e.g.
+    "from datetime import datetime as dt" yields {"dt": "datetime.datetime"}. Later imports win.
+    """
+    imports = {}
+    for node in nodes:
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                imports[alias.asname or alias.name] = alias.name
+        else:
+            module = node.module
+            for alias in node.names:
+                full_name = f"{module}.{alias.name}" if module else alias.name
+                imports[alias.asname or alias.name] = full_name
+    return imports
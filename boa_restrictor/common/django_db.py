@@ -1,6 +1,7 @@
 import ast
 
 from boa_restrictor.common.ast_utils import is_type_checking_if
+from boa_restrictor.common.node_index import NodeIndex
 
 
 def _imports_django_db(node) -> bool:
@@ -12,24 +13,29 @@ def _imports_django_db(node) -> bool:
     )
 
 
-def find_django_db_import_line_numbers(source_tree: ast.AST) -> list[int]:
+def find_type_checking_import_lines(node_index: NodeIndex) -> frozenset[int]:
     """
-    Returns the line numbers of all imports of "django.db" (or its submodules). Imports that only exist for
-    type-checking purposes (inside an "if TYPE_CHECKING" block) are excluded since they don't create a runtime
-    dependency on the database layer.
+    Returns the line numbers of all imports inside an "if TYPE_CHECKING" block.
     """
-    type_checking_lines = set()
-    imports = []
+    return frozenset(
+        subnode.lineno
+        for node in node_index[ast.If]
+        if is_type_checking_if(node)
+        for inner in node.body
+        for subnode in ast.walk(inner)
+        if isinstance(subnode, (ast.Import, ast.ImportFrom))
+    )
 
-    for node in ast.walk(source_tree):
-        if is_type_checking_if(node):
-            type_checking_lines.update(
-                subnode.lineno
-                for inner in node.body
-                for subnode in ast.walk(inner)
-                if isinstance(subnode, (ast.Import, ast.ImportFrom))
-            )
-        elif isinstance(node, (ast.Import, ast.ImportFrom)):
-            imports.append(node)
 
-    return [node.lineno for node in imports if node.lineno not in type_checking_lines and _imports_django_db(node)]
+def find_django_db_import_line_numbers(
+    node_index: NodeIndex, *, type_checking_import_lines: frozenset[int]
+) -> list[int]:
+    """
+    Returns the line numbers of all imports of "django.db" (or its submodules). Imports that only exist for
+    type-checking purposes (inside an "if TYPE_CHECKING" block) are excluded since they don't create a runtime
+    dependency on the database layer (see "find_type_checking_import_lines").
+    """
+    imports = node_index.nodes_of(ast.Import, ast.ImportFrom)
+    return [
+        node.lineno for node in imports if node.lineno not in type_checking_import_lines and _imports_django_db(node)
+    ]
@@ -0,0 +1,54 @@
+import ast
+from functools import cached_property
+from pathlib import Path
+
+from boa_restrictor.common.ast_utils import collect_import_aliases
+from boa_restrictor.common.django_db import find_django_db_import_line_numbers, find_type_checking_import_lines
+from boa_restrictor.common.node_index import NodeIndex
+from boa_restrictor.common.suppressions import Suppressions
+
+
+class FileContext:
+    """
+    Facts about a single file, shared by all rules linting it. Every fact is computed on first access and then
+    memoized, so no matter how many rules ask for it, it is derived only once per file.
+    """
+
+    def __init__(self, *, file_path: Path, source_tree: ast.AST, suppressions: Suppressions | None = None):
+        self.file_path = file_path
+        self.source_tree = source_tree
+        self.suppressions = suppressions if suppressions is not None else Suppressions()
+
+    @cached_property
+    def node_index(self) -> NodeIndex:
+        """
+        All nodes of the file, indexed by their type.
+        """
+        return NodeIndex(source_tree=self.source_tree)
+
+    @cached_property
+    def import_aliases(self) -> dict[str, str]:
+        """
+        Maps every name bound by an import statement to the fully qualified name it refers to.
+        """
+        return collect_import_aliases(self.node_index.nodes_of(ast.Import, ast.ImportFrom))
+
+    @cached_property
+    def classes_by_name(self) -> dict[str, ast.ClassDef]:
+        """
+        Maps the name of every class defined in the file (at any nesting level) to its definition.
+        """
+        return {node.name: node for node in self.node_index[ast.ClassDef]}
+
+    @cached_property
+    def type_checking_import_lines(self) -> frozenset[int]:
+        """
+        Line numbers of all imports living inside an "if TYPE_CHECKING:" block.
+        """
+        return find_type_checking_import_lines(self.node_index)
+
+    @cached_property
+    def django_db_import_line_numbers(self) -> list[int]:
+        return find_django_db_import_line_numbers(
+            self.node_index, type_checking_import_lines=self.type_checking_import_lines
+        )
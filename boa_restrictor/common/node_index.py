@@ -0,0 +1,47 @@
+import ast
+import heapq
+
+
+class NodeIndex:
+    """
+    Maps every AST node type of a file to its nodes, in source order (pre-order, i.e. a parent comes before its
+    children and siblings keep their order of appearance). The index is built with a single traversal right after
+    parsing and shared by all rules linting that file.
+    """
+
+    def __init__(self, *, source_tree: ast.AST):
+        self._nodes_by_type: dict[type[ast.AST], list[ast.AST]] = {}
+        self._positions: dict[int, int] = {}
+        self._merged_nodes: dict[tuple[type[ast.AST], ...], list[ast.AST]] = {}
+
+        stack = [source_tree]
+        position = 0
+        while stack:
+            node = stack.pop()
+            self._nodes_by_type.setdefault(type(node), []).append(node)
+            self._positions[id(node)] = position
+            position += 1
+            # Push children reversed so that the first child is popped (and therefore indexed) first
+            stack.extend(reversed(list(ast.iter_child_nodes(node))))
+
+    def __getitem__(self, node_type: type[ast.AST]) -> list[ast.AST]:
+        """
+        Returns all nodes of exactly the given type, in source order.
+        """
+        return self._nodes_by_type.get(node_type, [])
+
+    def __contains__(self, node_type: type[ast.AST]) -> bool:
+        return node_type in self._nodes_by_type
+
+    def nodes_of(self, *node_types: type[ast.AST]) -> list[ast.AST]:
+        """
+        Returns all nodes of any of the given types, merged in source order.
+        """
+        if len(node_types) == 1:
+            return self[node_types[0]]
+
+        if node_types not in self._merged_nodes:
+            self._merged_nodes[node_types] = list(
+                heapq.merge(*(self[node_type] for node_type in node_types), key=lambda node: self._positions[id(node)])
+            )
+        return self._merged_nodes[node_types]
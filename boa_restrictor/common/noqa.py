@@ -1,7 +1,11 @@
+import ast
+import dataclasses
 import re
 import tokenize
+from collections.abc import Iterator
 from io import StringIO
 
+from boa_restrictor.common.node_index import NodeIndex
 from boa_restrictor.exceptions.syntax_errors import BoaRestrictorParsingError
 
 # Matches a noqa directive anywhere within a comment token, so a noqa following another
@@ -11,9 +15,42 @@ _NOQA_PATTERN = re.compile(r"#\s*noqa\s*:", re.IGNORECASE)
 # Rule code pattern: 1+ uppercase letters followed by 1+ digits (e.g. PBR001, DBR007, TST0011, F401).
 # Anything in the noqa payload that doesn't match this is ignored (prose, stray punctuation, ...).
 _CODE_PATTERN = re.compile(r"\b[A-Z]+\d+\b")
+# Matches a "# boa: disable=<CODE[, ...]>" directive (or "enable", "disable-file") anywhere within a comment token
+_BOA_DIRECTIVE_PATTERN = re.compile(r"#\s*boa\s*:\s*(disable-file|disable|enable)\s*=", re.IGNORECASE)
+# Finds the beginning of both kinds of directives without crossing line breaks, since a comment never does
+_DIRECTIVE_CANDIDATE_PATTERN = re.compile(r"#[^\S\n]*(?:noqa|boa)[^\S\n]*:", re.IGNORECASE)
+# A carriage return on its own ends a line for the parser, but not for the tokenizer, so their line numbers differ
+_LONE_CARRIAGE_RETURN_PATTERN = re.compile(r"\r(?!\n)")
+# All nodes of string literals (template strings only exist as of Python 3.14)
+_STRING_NODE_TYPES = (ast.Constant, ast.JoinedStr, *((ast.TemplateStr,) if hasattr(ast, "TemplateStr") else ()))
 
 
-def get_noqa_comments(*, source_code: str, filename: str = "<unknown>") -> list[tuple[int, set[str]]]:
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class BoaDirective:
+    """
+    A "# boa: <action>=<CODE[, ...]>" comment. "disable" suppresses the rules from its line on, until an "enable"
+    directive of the same rule. "disable-file" suppresses them within the whole file.
+    """
+
+    line_number: int
+    action: str
+    rule_ids: frozenset[str]
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class SuppressionComments:
+    """
+    All comments of a file suppressing rules: its noqa comments, as (line_number, set_of_exact_rule_ids), and its
+    boa directives, both in line order.
+    """
+
+    noqa_comments: list[tuple[int, set[str]]]
+    boa_directives: list[BoaDirective]
+
+
+def get_noqa_comments(
+    *, source_code: str, filename: str = "<unknown>", node_index: NodeIndex | None = None
+) -> list[tuple[int, set[str]]]:
     """
     Walk the target code and collect all "# noqa: <CODE[, ...]>" comments,
     returning each as (line_number, set_of_exact_rule_ids).
@@ -26,23 +63,195 @@ def get_noqa_comments(*, source_code: str, filename: str = "<unknown>") -> list[
     Only the payload after "# noqa:" (and before any subsequent "#") contributes
     codes, so code-shaped tokens elsewhere in the comment do not silently widen
     the suppression.
+
+    Given the node index of the parsed code, only the lines containing a noqa
+    directive are looked at, and the string literals of the index tell comments
+    apart from strings. Just the lines on which a "#" might sit inside a string
+    are tokenized. Without it, the whole code is tokenized. Both yield the same.
     """
-    noqa_statements = []
+    return get_suppression_comments(source_code=source_code, filename=filename, node_index=node_index).noqa_comments
+
+
+def get_suppression_comments(
+    *, source_code: str, filename: str = "<unknown>", node_index: NodeIndex | None = None
+) -> SuppressionComments:
+    """
+    Collect all noqa comments (see `get_noqa_comments()`) and "# boa: ..." directives in a single pass. The codes of
+    a directive are parsed just like those of a noqa comment.
+    """
+    if node_index is None or _LONE_CARRIAGE_RETURN_PATTERN.search(source_code):
+        comments = _tokenize_comments(source_code=source_code, filename=filename)
+    else:
+        comments = _CommentScanner(source_code=source_code, filename=filename, node_index=node_index).scan()
+
+    noqa_comments = []
+    boa_directives = []
+    for line_number, comment in comments:
+        codes = _parse_noqa_codes(comment=comment)
+        if codes:
+            noqa_comments.append((line_number, codes))
+        boa_directives.extend(_parse_boa_directives(line_number=line_number, comment=comment))
+    return SuppressionComments(noqa_comments=noqa_comments, boa_directives=boa_directives)
+
+
+def _parse_noqa_codes(*, comment: str) -> set[str]:
+    match = _NOQA_PATTERN.search(comment)
+    if not match:
+        return set()
+    payload = comment[match.end() :].split("#", 1)[0]
+    return set(_CODE_PATTERN.findall(payload))
+
+
+def _parse_boa_directives(*, line_number: int, comment: str) -> list[BoaDirective]:
+    boa_directives = []
+    for match in _BOA_DIRECTIVE_PATTERN.finditer(comment):
+        payload = comment[match.end() :].split("#", 1)[0]
+        codes = frozenset(_CODE_PATTERN.findall(payload))
+        if codes:
+            boa_directives.append(BoaDirective(line_number=line_number, action=match.group(1).lower(), rule_ids=codes))
+    return boa_directives
+
 
+def _tokenize_comments(*, source_code: str, filename: str) -> Iterator[tuple[int, str]]:
+    # Yields the line number and content of every comment
     tokens = tokenize.generate_tokens(StringIO(source_code).readline)
     try:
-        for token in tokens:
-            token_type, token_string, start, _, _ = token
-            if token_type != tokenize.COMMENT:
-                continue
-            match = _NOQA_PATTERN.search(token_string)
-            if not match:
-                continue
-            payload = token_string[match.end() :].split("#", 1)[0]
-            codes = set(_CODE_PATTERN.findall(payload))
-            if codes:
-                noqa_statements.append((start[0], codes))
+        for token_type, token_string, start, _, _ in tokens:
+            if token_type == tokenize.COMMENT:
+                yield start[0], token_string
     except tokenize.TokenError as e:
         raise BoaRestrictorParsingError(filename=filename) from e
 
-    return noqa_statements
+
+class _CommentScanner:
+    """
+    Finds the comments of parsed source code which might contain a directive, without tokenizing all of it.
+    """
+
+    def __init__(self, *, source_code: str, filename: str, node_index: NodeIndex):
+        self.source_code = source_code
+        self.filename = filename
+        self.node_index = node_index
+
+        self._string_spans_by_line: dict[int, list[tuple[int, int, int, int]]] | None = None
+        self._line_offsets: list[int] | None = None
+        # The comments of all lines tokenized so far
+        self._tokenized_comments: dict[int, str] = {}
+        self._tokenized_lines: set[int] | range = set()
+
+    def scan(self) -> list[tuple[int, str]]:
+        """
+        Returns the line number and content of every comment containing the beginning of a directive.
+        """
+        comments = []
+        line_number = 1
+        position = 0
+        previous_line_number = None
+        for match in _DIRECTIVE_CANDIDATE_PATTERN.finditer(self.source_code):
+            line_number += self.source_code.count("\n", position, match.start())
+            position = match.start()
+            # A line contains one comment at most
+            if line_number == previous_line_number:
+                continue
+            previous_line_number = line_number
+
+            line_start = self.source_code.rfind("\n", 0, position) + 1
+            line_end = self.source_code.find("\n", position)
+            line = self.source_code[line_start : line_end if line_end >= 0 else len(self.source_code)]
+            comment = self._find_comment(line_number=line_number, line=line.removesuffix("\r"))
+            if comment is not None:
+                comments.append((line_number, comment))
+        return comments
+
+    def _find_comment(self, *, line_number: int, line: str) -> str | None:
+        # Only strings and comments can contain a "#", so the first "#" outside of any string starts the comment
+        hash_index = line.index("#")
+        string_spans = self._get_string_spans_by_line().get(line_number)
+        if not string_spans:
+            return line[hash_index:]
+
+        # Node positions are UTF-8 byte offsets
+        position = (line_number, len(line[:hash_index].encode()))
+        if not any(
+            (start_line, start_column) <= position < (end_line, end_column)
+            for start_line, start_column, end_line, end_column in string_spans
+        ):
+            return line[hash_index:]
+
+        # The "#" might be part of a string. Implicitly concatenated strings can even contain comments between their
+        # parts, so only the tokenizer knows.
+        return self._tokenize_comment(line_number=line_number)
+
+    def _tokenize_comment(self, *, line_number: int) -> str | None:
+        if line_number not in self._tokenized_lines:
+            self._tokenize_lines(line_number=line_number)
+        return self._tokenized_comments.get(line_number)
+
+    def _tokenize_lines(self, *, line_number: int) -> None:
+        # Tokenize the given line along with all lines which can't be tokenized apart from it
+        first_line, last_line = self._get_tokenizable_lines(line_number=line_number)
+        line_offsets = self._get_line_offsets()
+        lines = self.source_code[line_offsets[first_line - 1] : line_offsets[last_line]]
+
+        # Comments by line number relative to the first line, and the number of lines tokenized completely
+        comments = {}
+        tokenized_line_count = 0
+        try:
+            for token_type, token_string, start, end, _ in tokenize.generate_tokens(StringIO(lines).readline):
+                if token_type == tokenize.COMMENT:
+                    comments[start[0]] = token_string
+                tokenized_line_count = max(
+                    tokenized_line_count, end[0] if token_type in (tokenize.NEWLINE, tokenize.NL) else end[0] - 1
+                )
+        except (tokenize.TokenError, SyntaxError):
+            # E.g. the lines end within brackets, or can't be tokenized on their own after all
+            pass
+        else:
+            tokenized_line_count = last_line - first_line + 1
+
+        if line_number - first_line >= tokenized_line_count:
+            self._tokenized_comments = dict(_tokenize_comments(source_code=self.source_code, filename=self.filename))
+            self._tokenized_lines = range(1, len(line_offsets) + 1)
+            return
+
+        self._tokenized_comments.update(
+            (first_line + relative_line_number - 1, comment)
+            for relative_line_number, comment in comments.items()
+            if relative_line_number <= tokenized_line_count
+        )
+        self._tokenized_lines.update(range(first_line, first_line + tokenized_line_count))
+
+    def _get_tokenizable_lines(self, *, line_number: int) -> tuple[int, int]:
+        # Extend the given line to all lines of the strings crossing it (and so on), so none of the lines start or end
+        # within a string and they can be tokenized on their own
+        string_spans_by_line = self._get_string_spans_by_line()
+        first_line = last_line = line_number
+        is_extended = True
+        while is_extended:
+            previous_lines = (first_line, last_line)
+            first_line = min((span[0] for span in string_spans_by_line.get(first_line, ())), default=first_line)
+            last_line = max((span[2] for span in string_spans_by_line.get(last_line, ())), default=last_line)
+            is_extended = (first_line, last_line) != previous_lines
+        return first_line, last_line
+
+    def _get_string_spans_by_line(self) -> dict[int, list[tuple[int, int, int, int]]]:
+        if self._string_spans_by_line is None:
+            self._string_spans_by_line = {}
+            for node in self.node_index.nodes_of(*_STRING_NODE_TYPES):
+                if isinstance(node, ast.Constant) and not isinstance(node.value, (str, bytes)):
+                    continue
+                string_span = (node.lineno, node.col_offset, node.end_lineno, node.end_col_offset)
+                for line_number in range(node.lineno, node.end_lineno + 1):
+                    self._string_spans_by_line.setdefault(line_number, []).append(string_span)
+        return self._string_spans_by_line
+
+    def _get_line_offsets(self) -> list[int]:
+        # The offset of the start of every line, plus the end of the code
+        if self._line_offsets is None:
+            self._line_offsets = [
+                0,
+                *(match.end() for match in re.finditer("\n", self.source_code)),
+            ]
+            if self._line_offsets[-1] != len(self.source_code):
+                self._line_offsets.append(len(self.source_code))
+        return self._line_offsets
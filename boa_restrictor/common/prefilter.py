@@ -0,0 +1,48 @@
+import re
+from collections.abc import Iterable
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from boa_restrictor.common.rule import Rule
+
+
+class KeywordPrefilter:
+    """
+    Decides which rules can possibly fire on a file by looking for their "TRIGGER_KEYWORDS" in the raw source code.
+    All keywords of all rules are found with a single scan of a combined regular expression.
+    """
+
+    def __init__(self, *, rule_classes: Iterable[type["Rule"]]):
+        self._keywords = frozenset(keyword for rule_class in rule_classes for keyword in rule_class.TRIGGER_KEYWORDS)
+        self._pattern = None
+        if self._keywords:
+            # Longest keywords first, so a keyword which is a prefix of another one doesn't shadow the longer one.
+            # The lookahead makes the scan try every position, so overlapping occurrences are found as well.
+            alternatives = "|".join(re.escape(keyword) for keyword in sorted(self._keywords, key=len, reverse=True))
+            self._pattern = re.compile(f"(?=({alternatives}))")
+
+    def find_keywords(self, *, source_code: str) -> frozenset[str]:
+        """
+        Returns all trigger keywords contained in the given source code.
+        """
+        if self._pattern is None:
+            return frozenset()
+
+        found = set()
+        for match in self._pattern.finditer(source_code):
+            found.add(match.group(1))
+            if len(found) == len(self._keywords):
+                break
+
+        # At a given position only the longest matching keyword is captured. Any shorter keyword matching at the
+        # same position is a prefix (and therefore a substring) of it.
+        found.update(keyword for keyword in self._keywords - found if any(keyword in match for match in found))
+        return frozenset(found)
+
+    @staticmethod
+    def is_triggered(*, rule_class: type["Rule"], keywords: frozenset[str]) -> bool:
+        """
+        Returns whether the given rule has to run on a file containing the given keywords. Rules without trigger
+        keywords always run.
+        """
+        return not rule_class.TRIGGER_KEYWORDS or not keywords.isdisjoint(rule_class.TRIGGER_KEYWORDS)
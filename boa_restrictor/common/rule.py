@@ -1,6 +1,8 @@
 from _ast import AST, Module
 from pathlib import Path
 
+from boa_restrictor.common.file_context import FileContext
+from boa_restrictor.common.node_index import NodeIndex
 from boa_restrictor.projections.occurrence import Occurrence
 
 PYTHON_LINTING_RULE_PREFIX = "PBR"
@@ -15,27 +17,60 @@ class Rule:
     RULE_ID: str
     RULE_LABEL: str
 
+    # AST node types this rule is interested in. All nodes of these types are available via "self.nodes".
+    NODE_TYPES: tuple[type[AST], ...] = ()
+
+    # Literals of which at least one has to occur in a file's source code for this rule to possibly fire. If none of
+    # them occurs, the linter skips the rule for that file without parsing it. Leave empty to always run the rule.
+    TRIGGER_KEYWORDS: tuple[str, ...] = ()
+
     file_path: Path
     filename: str
     source_tree: AST
+    context: FileContext
+    node_index: NodeIndex
+
+    @classmethod
+    def is_applicable(cls, *, file_path: Path) -> bool:
+        """
+        Returns whether this rule applies to the given file at all. Decided on the path alone, so the linter can
+        skip reading and parsing a file no rule applies to. Override it in rules limited to certain files.
+        """
+        return True
 
     @classmethod
-    def run_check(cls, *, file_path: Path, source_tree: AST | Module) -> list[Occurrence]:
-        instance = cls(file_path=file_path, source_tree=source_tree)
+    def run_check(
+        cls, *, file_path: Path, source_tree: AST | Module, context: FileContext | None = None
+    ) -> list[Occurrence]:
+        if not cls.is_applicable(file_path=file_path):
+            return []
+
+        instance = cls(file_path=file_path, source_tree=source_tree, context=context)
         return instance.check()
 
-    def __init__(self, *, file_path: Path, source_tree: AST):
+    def __init__(self, *, file_path: Path, source_tree: AST, context: FileContext | None = None):
         """
         A rule is called via pre-commit for a specific file.
         Variable `source_code` is the content of the given file.
+        Variable `context` holds the facts about the file which are shared between all rules, e.g. the index of
+        all nodes by type. The linter creates it once per file. If omitted, the rule creates its own.
         """
         super().__init__()
 
         self.file_path = file_path
         self.source_tree = source_tree
+        self.context = context if context is not None else FileContext(file_path=file_path, source_tree=source_tree)
+        self.node_index = self.context.node_index
 
         self.filename = file_path.name
 
+    @property
+    def nodes(self) -> list[AST]:
+        """
+        All nodes of the types listed in "NODE_TYPES", in source order.
+        """
+        return self.node_index.nodes_of(*self.NODE_TYPES)
+
     def check(self) -> list[Occurrence]:
         raise NotImplementedError
 
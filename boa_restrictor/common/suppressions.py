@@ -0,0 +1,147 @@
+import bisect
+import re
+import sys
+from collections.abc import Callable, Iterable, Mapping, Sequence
+
+from boa_restrictor.common.node_index import NodeIndex
+from boa_restrictor.common.noqa import BoaDirective, SuppressionComments, get_suppression_comments
+from boa_restrictor.projections.occurrence import Occurrence
+
+# Without "noqa" or "boa:" anywhere in a file, there can't be any comment suppressing a rule
+_SUPPRESSION_TEXT_PATTERN = re.compile(r"noqa|boa[^\S\n]*:", re.IGNORECASE)
+
+# The end of a range which is never enabled again
+_END_OF_FILE = sys.maxsize
+
+
+class Suppressions:
+    """
+    The lines on which each rule is suppressed within a file: via "# noqa: PBR001" comments on single lines, via
+    "# boa: disable=PBR001" up to "# boa: enable=PBR001" in ranges of lines and via "# boa: disable-file=PBR001" in
+    the whole file.
+
+    Collected once per file and indexed by rule ID, so checking whether an occurrence is suppressed is a single
+    lookup (plus a binary search in the sorted ranges of the rule), no matter how many rules run and how many
+    comments there are. Rules can query it via `Rule.context.suppressions`.
+    """
+
+    def __init__(
+        self,
+        *,
+        suppressed_lines: Mapping[str, frozenset[int]] | None = None,
+        suppressed_ranges: Mapping[str, Sequence[tuple[int, int]]] | None = None,
+        disabled_rule_ids: frozenset[str] = frozenset(),
+    ):
+        self._suppressed_lines = dict(suppressed_lines or {})
+        # Rule ID -> the first lines and the (exclusive) last lines of its sorted, disjoint ranges
+        self._suppressed_ranges = {
+            rule_id: ([start for start, _ in line_ranges], [end for _, end in line_ranges])
+            for rule_id, line_ranges in (suppressed_ranges or {}).items()
+            if line_ranges
+        }
+        self.disabled_rule_ids = disabled_rule_ids
+
+    @classmethod
+    def from_noqa_comments(cls, *, noqa_comments: Iterable[tuple[int, set[str]]]) -> "Suppressions":
+        """
+        Index the given noqa comments, as returned by `get_noqa_comments()`.
+        """
+        return cls.from_comments(
+            suppression_comments=SuppressionComments(noqa_comments=list(noqa_comments), boa_directives=[])
+        )
+
+    @classmethod
+    def from_comments(cls, *, suppression_comments: SuppressionComments) -> "Suppressions":
+        """
+        Index the given comments, as returned by `get_suppression_comments()`.
+        """
+        suppressed_lines: dict[str, set[int]] = {}
+        for line_number, rule_ids in suppression_comments.noqa_comments:
+            for rule_id in rule_ids:
+                suppressed_lines.setdefault(rule_id, set()).add(line_number)
+
+        return cls(
+            suppressed_lines={rule_id: frozenset(line_numbers) for rule_id, line_numbers in suppressed_lines.items()},
+            suppressed_ranges=_build_suppressed_ranges(boa_directives=suppression_comments.boa_directives),
+            disabled_rule_ids=frozenset(
+                rule_id
+                for boa_directive in suppression_comments.boa_directives
+                if boa_directive.action == "disable-file"
+                for rule_id in boa_directive.rule_ids
+            ),
+        )
+
+    @classmethod
+    def collect(
+        cls,
+        *,
+        source_code: str,
+        filename: str = "<unknown>",
+        node_index: NodeIndex | None = None,
+        suppression_comments_getter: Callable[..., SuppressionComments] | None = None,
+    ) -> "Suppressions":
+        """
+        Collect the suppressions of the given source code. Given its node index, it doesn't need to be tokenized, see
+        `get_suppression_comments()`. `suppression_comments_getter` replaces `get_suppression_comments()`.
+        """
+        # Don't even look for comments if there can't be any comment suppressing a rule
+        if _SUPPRESSION_TEXT_PATTERN.search(source_code) is None:
+            return cls()
+        return cls.from_comments(
+            suppression_comments=(suppression_comments_getter or get_suppression_comments)(
+                source_code=source_code, filename=filename, node_index=node_index
+            )
+        )
+
+    def __bool__(self) -> bool:
+        return bool(self._suppressed_lines or self._suppressed_ranges or self.disabled_rule_ids)
+
+    def get_suppressed_lines(self, *, rule_id: str) -> frozenset[int]:
+        """
+        Returns the numbers of all lines on which the given rule is suppressed via noqa comments.
+        """
+        return self._suppressed_lines.get(rule_id, frozenset())
+
+    def is_suppressed(self, *, rule_id: str, line_number: int) -> bool:
+        suppressed_lines = self._suppressed_lines.get(rule_id)
+        if suppressed_lines is not None and line_number in suppressed_lines:
+            return True
+
+        suppressed_ranges = self._suppressed_ranges.get(rule_id)
+        if suppressed_ranges is not None:
+            # Find the last range starting at or before the given line
+            starts, ends = suppressed_ranges
+            index = bisect.bisect_right(starts, line_number) - 1
+            if index >= 0 and line_number < ends[index]:
+                return True
+
+        return rule_id in self.disabled_rule_ids
+
+    def filter_occurrences(self, *, occurrences: Iterable[Occurrence]) -> list[Occurrence]:
+        """
+        Returns the given occurrences which aren't suppressed.
+        """
+        if not self:
+            return list(occurrences)
+        return [
+            occurrence
+            for occurrence in occurrences
+            if not self.is_suppressed(rule_id=occurrence.rule_id, line_number=occurrence.line_number)
+        ]
+
+
+def _build_suppressed_ranges(*, boa_directives: Iterable[BoaDirective]) -> dict[str, list[tuple[int, int]]]:
+    # A rule is suppressed from the line of a "disable" directive up to (but not including) the line of the next
+    # "enable" directive, or the end of the file. Disabling a disabled rule (or enabling an enabled one) is a no-op.
+    suppressed_ranges: dict[str, list[tuple[int, int]]] = {}
+    range_starts: dict[str, int] = {}
+    for boa_directive in boa_directives:
+        for rule_id in boa_directive.rule_ids:
+            if boa_directive.action == "disable":
+                range_starts.setdefault(rule_id, boa_directive.line_number)
+            elif boa_directive.action == "enable" and rule_id in range_starts:
+                suppressed_ranges.setdefault(rule_id, []).append((range_starts.pop(rule_id), boa_directive.line_number))
+
+    for rule_id, range_start in range_starts.items():
+        suppressed_ranges.setdefault(rule_id, []).append((range_start, _END_OF_FILE))
+    return suppressed_ranges
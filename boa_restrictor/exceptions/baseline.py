@@ -0,0 +1,3 @@
+class InvalidBaselineError(ValueError):
+    def __init__(self, path: str, reason: str):
+        super().__init__(f'Baseline file "{path}" can\'t be used: {reason}')
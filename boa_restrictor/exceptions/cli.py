@@ -0,0 +1,6 @@
+import argparse
+
+
+class InvalidJobCountError(argparse.ArgumentTypeError):
+    def __init__(self, value: str):
+        super().__init__(f'invalid job count "{value}", expected a positive number or "auto"')
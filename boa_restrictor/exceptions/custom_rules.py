@@ -1,3 +1,6 @@
+import json
+
+
 class CustomRuleError(ValueError):
     """Base error for custom-rule loading and validation failures."""
 
@@ -14,7 +17,8 @@ class CustomRulesNotAListError(CustomRuleConfigurationError):
 class CustomRulePathNotAStringError(CustomRuleConfigurationError):
     def __init__(self, value):
         super().__init__(
-            f"Each entry in custom_rules must be a string (dotted import path); got {type(value).__name__}: {value!r}."
+            "Each entry in custom_rules must be a string (dotted import path) or a table declaring the rule; "
+            f"got {type(value).__name__}: {value!r}."
         )
 
 
@@ -23,6 +27,11 @@ class DuplicateCustomRulePathError(CustomRuleConfigurationError):
         super().__init__(f'Duplicate entry in custom_rules: "{dotted_path}".')
 
 
+class InvalidCustomRuleDeclarationError(CustomRuleConfigurationError):
+    def __init__(self, *, value: dict, reason: str):
+        super().__init__(f"Invalid custom rule declaration {value!r} in custom_rules: {reason}")
+
+
 class CustomRuleImportError(CustomRuleError):
     """Failure importing a custom rule's module or attribute."""
 
@@ -34,6 +43,14 @@ class InvalidCustomRulePathError(CustomRuleImportError):
         )
 
 
+class InvalidRuleEntryPointError(CustomRuleImportError):
+    def __init__(self, *, name: str, value: str, distribution_name: str):
+        super().__init__(
+            f'Invalid entry point "{name} = {value}" of distribution "{distribution_name}" for a boa-restrictor rule. '
+            'Expected a reference of the form "module:ClassName".'
+        )
+
+
 class CustomRuleModuleImportFailedError(CustomRuleImportError):
     def __init__(self, *, module_path: str, dotted_path: str, original: BaseException):
         if isinstance(original, SyntaxError):
@@ -108,6 +125,14 @@ class CustomRuleReservedPrefixError(CustomRuleValidationError):
         )
 
 
+class CustomRuleMetadataMismatchError(CustomRuleValidationError):
+    def __init__(self, *, dotted_path: str, key: str, declared_value: str | list[str], value: str | list[str]):
+        super().__init__(
+            f'Custom rule "{dotted_path}" is declared with {key} {json.dumps(declared_value)} in custom_rules, '
+            f"but the class sets {json.dumps(value)}. Update the declaration to match the class."
+        )
+
+
 class DuplicateRuleIdError(CustomRuleValidationError):
     def __init__(self, *, clashes: dict[str, list[type]]):
         """
@@ -0,0 +1,10 @@
+class DaemonAlreadyRunningError(RuntimeError):
+    def __init__(self, socket_path: str):
+        super().__init__(f'A boa-restrictor daemon is already listening on socket "{socket_path}".')
+
+
+class InsecureSocketDirectoryError(RuntimeError):
+    def __init__(self, directory: str):
+        super().__init__(
+            f'Directory "{directory}" has to be owned by the current user and must not be accessible by anyone else.'
+        )
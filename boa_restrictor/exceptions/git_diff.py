@@ -0,0 +1,3 @@
+class GitCommandError(RuntimeError):
+    def __init__(self, command: str, error: str):
+        super().__init__(f'Git command "{command}" failed: {error}')
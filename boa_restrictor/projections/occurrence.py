@@ -3,7 +3,7 @@ from pathlib import Path
 
 
 # TODO: Add kw_only when we drop Python 3.9 support
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class Occurrence:
     rule_id: str
     rule_label: str
@@ -0,0 +1,194 @@
+import array
+import json
+import sys
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+from boa_restrictor.projections.occurrence import Occurrence
+
+# Unsigned integers of at least 4 bytes, so even line numbers of huge files fit
+_COLUMN_TYPECODE = "I" if array.array("I").itemsize >= 4 else "L"  # noqa: PLR2004
+
+_COLUMN_NAMES = ("_rule_column", "_file_column", "_identifier_column", "_line_number_column")
+
+# Bumped whenever the layout of `OccurrenceStore.to_bytes()` changes
+SERIALIZATION_FORMAT_VERSION = 1
+
+
+class OccurrenceStore:
+    """
+    A compact, columnar collection of occurrences for large reports.
+
+    Rules (ID and label), files and identifiers are interned into tables, so every occurrence only takes up one entry
+    of four integer arrays: the index of its rule, file and identifier and its line number. `Occurrence` objects are
+    only built while iterating or indexing, so sorting, grouping and counting hundreds of thousands of occurrences
+    stays cheap in memory and time. `to_bytes()` hands them on (or stores them) in the same compact form.
+    """
+
+    def __init__(self, occurrences: Iterable[Occurrence] = ()):
+        self._rules: list[tuple[str, str]] = []
+        self._rule_indices: dict[tuple[str, str], int] = {}
+        self._files: list[tuple[str, Path]] = []
+        self._file_indices: dict[tuple[str, Path], int] = {}
+        self._identifiers: list[str | None] = [None]
+        self._identifier_indices: dict[str | None, int] = {None: 0}
+
+        self._rule_column = array.array(_COLUMN_TYPECODE)
+        self._file_column = array.array(_COLUMN_TYPECODE)
+        self._identifier_column = array.array(_COLUMN_TYPECODE)
+        self._line_number_column = array.array(_COLUMN_TYPECODE)
+
+        self.extend(occurrences)
+
+    def __len__(self) -> int:
+        return len(self._line_number_column)
+
+    def __iter__(self) -> Iterator[Occurrence]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def __getitem__(self, index: int) -> Occurrence:
+        rule_id, rule_label = self._rules[self._rule_column[index]]
+        filename, file_path = self._files[self._file_column[index]]
+        return Occurrence(
+            rule_id=rule_id,
+            rule_label=rule_label,
+            filename=filename,
+            file_path=file_path,
+            identifier=self._identifiers[self._identifier_column[index]],
+            line_number=self._line_number_column[index],
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, OccurrenceStore):
+            return NotImplemented
+        return list(self) == list(other)
+
+    __hash__ = None
+
+    def append(self, occurrence: Occurrence) -> None:
+        self._rule_column.append(
+            self._intern(
+                value=(occurrence.rule_id, occurrence.rule_label), table=self._rules, indices=self._rule_indices
+            )
+        )
+        self._file_column.append(
+            self._intern(
+                value=(occurrence.filename, occurrence.file_path), table=self._files, indices=self._file_indices
+            )
+        )
+        self._identifier_column.append(
+            self._intern(value=occurrence.identifier, table=self._identifiers, indices=self._identifier_indices)
+        )
+        self._line_number_column.append(occurrence.line_number)
+
+    def extend(self, occurrences: Iterable[Occurrence]) -> None:
+        for occurrence in occurrences:
+            self.append(occurrence)
+
+    def sort(self) -> None:
+        """
+        Sort the occurrences by file path, line number and rule ID, in place.
+        """
+        file_sort_keys = [str(file_path) for _, file_path in self._files]
+        rule_sort_keys = [rule_id for rule_id, _ in self._rules]
+        order = sorted(
+            range(len(self)),
+            key=lambda index: (
+                file_sort_keys[self._file_column[index]],
+                self._line_number_column[index],
+                rule_sort_keys[self._rule_column[index]],
+            ),
+        )
+        for name in _COLUMN_NAMES:
+            column = getattr(self, name)
+            setattr(self, name, array.array(_COLUMN_TYPECODE, [column[index] for index in order]))
+
+    def group_by_file(self) -> Iterator[tuple[Path, list[Occurrence]]]:
+        """
+        Yield the path of every file along with its occurrences, in the order the files first occurred.
+        """
+        indices_per_file: dict[int, list[int]] = {}
+        for index, file_index in enumerate(self._file_column):
+            indices_per_file.setdefault(file_index, []).append(index)
+
+        for file_index, indices in indices_per_file.items():
+            yield self._files[file_index][1], [self[index] for index in indices]
+
+    def count_by_rule(self) -> dict[str, int]:
+        """
+        Returns the number of occurrences per rule ID.
+        """
+        counts: Counter[str] = Counter()
+        for rule_index, count in Counter(self._rule_column).items():
+            counts[self._rules[rule_index][0]] += count
+        return dict(counts)
+
+    def count_by_file(self) -> dict[Path, int]:
+        """
+        Returns the number of occurrences per file path.
+        """
+        counts: Counter[Path] = Counter()
+        for file_index, count in Counter(self._file_column).items():
+            counts[self._files[file_index][1]] += count
+        return dict(counts)
+
+    def to_bytes(self) -> bytes:
+        """
+        Serialize the occurrences: a line of JSON holding the tables, followed by the raw integer columns. The columns
+        are stored in the machine's byte order, so the result is meant to be read on the same machine, e.g. by
+        another process.
+        """
+        header = {
+            "version": SERIALIZATION_FORMAT_VERSION,
+            "byteorder": sys.byteorder,
+            "itemsize": self._line_number_column.itemsize,
+            "length": len(self),
+            "rules": self._rules,
+            "files": [(filename, str(file_path)) for filename, file_path in self._files],
+            "identifiers": self._identifiers,
+        }
+        return b"".join(
+            [json.dumps(header).encode(), b"\n", *(getattr(self, name).tobytes() for name in _COLUMN_NAMES)]
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "OccurrenceStore":
+        """
+        Restore occurrences serialized via `to_bytes()`. Raises a ValueError if the data is malformed or was written
+        by another version or on a different kind of machine.
+        """
+        raw_header, _, raw_columns = data.partition(b"\n")
+        header = json.loads(raw_header)
+        occurrence_store = cls()
+        column_size = header["length"] * occurrence_store._line_number_column.itemsize
+        if (
+            header["version"] != SERIALIZATION_FORMAT_VERSION
+            or header["byteorder"] != sys.byteorder
+            or header["itemsize"] != occurrence_store._line_number_column.itemsize
+            or len(raw_columns) != column_size * len(_COLUMN_NAMES)
+        ):
+            raise ValueError("Occurrences weren't serialized by this version on this kind of machine.")  # noqa: TRY003
+
+        occurrence_store._rules = [(rule_id, rule_label) for rule_id, rule_label in header["rules"]]
+        occurrence_store._files = [(filename, Path(file_path)) for filename, file_path in header["files"]]
+        occurrence_store._identifiers = header["identifiers"]
+        occurrence_store._rule_indices = {rule: index for index, rule in enumerate(occurrence_store._rules)}
+        occurrence_store._file_indices = {file: index for index, file in enumerate(occurrence_store._files)}
+        occurrence_store._identifier_indices = {
+            identifier: index for index, identifier in enumerate(occurrence_store._identifiers)
+        }
+        for column_index, name in enumerate(_COLUMN_NAMES):
+            getattr(occurrence_store, name).frombytes(
+                raw_columns[column_index * column_size : (column_index + 1) * column_size]
+            )
+        return occurrence_store
+
+    @staticmethod
+    def _intern(*, value, table: list, indices: dict) -> int:
+        index = indices.get(value)
+        if index is None:
+            index = indices[value] = len(table)
+            table.append(value)
+        return index
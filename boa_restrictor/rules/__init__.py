@@ -1,51 +1,45 @@
-from boa_restrictor.rules.django.avoid_tuple_based_model_choices import AvoidTupleBasedModelChoices
-from boa_restrictor.rules.django.charfield_max_length_required import CharFieldMaxLengthRequiredRule
-from boa_restrictor.rules.django.no_assert_booleans_in_tests import ProhibitAssertBooleanInTests
-from boa_restrictor.rules.django.no_db_in_api import NoDjangoDbImportInApiRule
-from boa_restrictor.rules.django.no_db_in_views import NoDjangoDbImportInViewsRule
-from boa_restrictor.rules.django.prohibit_assert_raises import AssertRaisesProhibitedRule
-from boa_restrictor.rules.django.prohibit_datetime_now import ProhibitDatetimeNow
-from boa_restrictor.rules.django.related_name_required import RelatedNameRequiredRule
-from boa_restrictor.rules.python.abstract_class_inherits_from_abc import AbstractClassesInheritFromAbcRule
-from boa_restrictor.rules.python.asterisk_required import AsteriskRequiredRule
-from boa_restrictor.rules.python.dataclass_kw_only import DataclassWithKwargsOnlyRule
-from boa_restrictor.rules.python.global_import_datetime import GlobalImportDatetimeRule
-from boa_restrictor.rules.python.mandatory_test_assertion import MandatoryTestAssertionRule
-from boa_restrictor.rules.python.no_inline_imports_in_tests import NoInlineImportInTestsRule
-from boa_restrictor.rules.python.no_loops_in_tests import NoLoopsInTestsRule
-from boa_restrictor.rules.python.no_type_hints_in_variable_names import AvoidTypeHintsInVariableNamesAsSuffix
-from boa_restrictor.rules.python.return_type_hints import ReturnStatementRequiresTypeHintRule
-from boa_restrictor.rules.python.service_class_only_one_public import ServiceClassHasOnlyOnePublicMethodRule
-
-BOA_RESTRICTOR_RULES = (
-    AsteriskRequiredRule,
-    ReturnStatementRequiresTypeHintRule,
-    GlobalImportDatetimeRule,
-    DataclassWithKwargsOnlyRule,
-    ServiceClassHasOnlyOnePublicMethodRule,
-    AbstractClassesInheritFromAbcRule,
-    AvoidTypeHintsInVariableNamesAsSuffix,
-    NoLoopsInTestsRule,
-    NoInlineImportInTestsRule,
-    MandatoryTestAssertionRule,
-)
-
-DJANGO_BOA_RULES = (
-    AssertRaisesProhibitedRule,
-    NoDjangoDbImportInViewsRule,
-    ProhibitAssertBooleanInTests,
-    ProhibitDatetimeNow,
-    NoDjangoDbImportInApiRule,
-    AvoidTupleBasedModelChoices,
-    CharFieldMaxLengthRequiredRule,
-    RelatedNameRequiredRule,
-)
-
-
-def get_rules(*, use_django_rules: bool) -> tuple:
+from collections.abc import Collection
+
+from boa_restrictor.rules.registry import BOA_RESTRICTOR_RULE_REGISTRY, DJANGO_BOA_RULE_REGISTRY, RuleRegistration
+
+# The rule modules are only imported once a rule is needed, so starting the CLI doesn't pay for rules which are
+# disabled or excluded. The rule classes, "BOA_RESTRICTOR_RULES" and "DJANGO_BOA_RULES" are still importable from here.
+_RULE_REGISTRATIONS_BY_CLASS_NAME = {
+    rule_registration.class_name: rule_registration
+    for rule_registration in BOA_RESTRICTOR_RULE_REGISTRY + DJANGO_BOA_RULE_REGISTRY
+}
+
+
+def get_rule_registrations(*, use_django_rules: bool) -> tuple[RuleRegistration, ...]:
     """
-    Returns a list of all enabled rules.
+    Returns the registrations of all enabled rules, without importing any of them.
     """
     if use_django_rules:
-        return BOA_RESTRICTOR_RULES + DJANGO_BOA_RULES
-    return BOA_RESTRICTOR_RULES
+        return BOA_RESTRICTOR_RULE_REGISTRY + DJANGO_BOA_RULE_REGISTRY
+    return BOA_RESTRICTOR_RULE_REGISTRY
+
+
+def get_rules(*, use_django_rules: bool, excluded_rule_ids: Collection[str] = ()) -> tuple:
+    """
+    Returns a list of all enabled rules. Excluded rules are skipped without importing their modules.
+    """
+    return tuple(
+        rule_registration.load()
+        for rule_registration in get_rule_registrations(use_django_rules=use_django_rules)
+        if rule_registration.rule_id not in excluded_rule_ids
+    )
+
+
+def __getattr__(name: str):
+    if name == "BOA_RESTRICTOR_RULES":
+        value = tuple(rule_registration.load() for rule_registration in BOA_RESTRICTOR_RULE_REGISTRY)
+    elif name == "DJANGO_BOA_RULES":
+        value = tuple(rule_registration.load() for rule_registration in DJANGO_BOA_RULE_REGISTRY)
+    elif name in _RULE_REGISTRATIONS_BY_CLASS_NAME:
+        value = _RULE_REGISTRATIONS_BY_CLASS_NAME[name].load()
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")  # noqa: TRY003
+
+    # Later lookups find it right away
+    globals()[name] = value
+    return value
@@ -15,6 +15,7 @@ class AvoidTupleBasedModelChoices(Rule):
 
     RULE_ID = f"{DJANGO_LINTING_RULE_PREFIX}006"
     RULE_LABEL = "Avoid using old tuple-based Django model choices. Use class-based choices instead."
+    NODE_TYPES = (ast.ClassDef, ast.Assign)
 
     def _is_django_model(self, node: ast.ClassDef) -> bool:
         """
@@ -73,8 +74,8 @@ class AvoidTupleBasedModelChoices(Rule):
 
         # First pass: check assignments inside Django model classes
         django_model_assignments: set[int] = set()
-        for node in ast.walk(self.source_tree):
-            if isinstance(node, ast.ClassDef) and self._is_django_model(node):
+        for node in self.node_index[ast.ClassDef]:
+            if self._is_django_model(node):
                 for stmt in node.body:
                     if isinstance(stmt, ast.Assign):
                         django_model_assignments.add(id(stmt))
@@ -82,8 +83,8 @@ class AvoidTupleBasedModelChoices(Rule):
                             occurrences.append(self._create_occurrence(stmt.lineno))
 
         # Second pass: check tuple-based choices assignments outside of Django models
-        for node in ast.walk(self.source_tree):
-            if isinstance(node, ast.Assign) and id(node) not in django_model_assignments:
+        for node in self.node_index[ast.Assign]:
+            if id(node) not in django_model_assignments:
                 if self._is_tuple_based_choices(node.value):
                     for target in node.targets:
                         if isinstance(target, ast.Name) and self._is_choices_variable_name(target.id):
@@ -12,6 +12,8 @@ class CharFieldMaxLengthRequiredRule(Rule):
 
     RULE_ID = f"{DJANGO_LINTING_RULE_PREFIX}007"
     RULE_LABEL = 'CharField must have "max_length" set. Either set "max_length" or use "TextField" instead.'
+    NODE_TYPES = (ast.ClassDef,)
+    TRIGGER_KEYWORDS = ("CharField",)
 
     def _is_django_model(self, node: ast.ClassDef) -> bool:
         """
@@ -60,8 +62,8 @@ class CharFieldMaxLengthRequiredRule(Rule):
     def check(self) -> list[Occurrence]:
         occurrences: list[Occurrence] = []
 
-        for node in ast.walk(self.source_tree):
-            if isinstance(node, ast.ClassDef) and self._is_django_model(node):
+        for node in self.nodes:
+            if self._is_django_model(node):
                 for stmt in node.body:
                     if isinstance(stmt, ast.Assign):
                         call_node = stmt.value if isinstance(stmt.value, ast.Call) else None
@@ -14,13 +14,12 @@ class ProhibitAssertBooleanInTests(Rule):
         'Do not use "assertTrue" or "assertFalse" in Django unittests. Use "assertIs(x, True)" or '
         '"assertIs(x, False)" instead.'
     )
+    NODE_TYPES = (ast.Call,)
+    TRIGGER_KEYWORDS = ("assertTrue", "assertFalse")
 
     def check(self) -> list[Occurrence]:
         occurrences = []
-        for node in ast.walk(self.source_tree):
-            if not isinstance(node, ast.Call):
-                continue
-
+        for node in self.nodes:
             func = node.func
             if isinstance(func, ast.Attribute) and func.attr in {"assertTrue", "assertFalse"}:
                 if isinstance(func.value, ast.Name) and func.value.id == "self":
@@ -1,4 +1,6 @@
-from boa_restrictor.common.django_db import find_django_db_import_line_numbers
+import ast
+from pathlib import Path
+
 from boa_restrictor.common.file_detection import is_layer_file
 from boa_restrictor.common.rule import Rule
 from boa_restrictor.projections.occurrence import Occurrence
@@ -11,12 +13,15 @@ class NoDjangoDbImportInLayerRule(Rule):
     """
 
     LAYER: str
+    NODE_TYPES = (ast.If, ast.Import, ast.ImportFrom)
+    TRIGGER_KEYWORDS = ("django",)
 
-    def check(self) -> list[Occurrence]:
-        if not is_layer_file(self.file_path, layer=self.LAYER):
-            return []
+    @classmethod
+    def is_applicable(cls, *, file_path: Path) -> bool:
+        return is_layer_file(file_path, layer=cls.LAYER)
 
+    def check(self) -> list[Occurrence]:
         return [
             self._build_occurrence(line_number=line_number)
-            for line_number in find_django_db_import_line_numbers(self.source_tree)
+            for line_number in self.context.django_db_import_line_numbers
         ]
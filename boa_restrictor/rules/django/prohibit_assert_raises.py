@@ -12,6 +12,8 @@ class AssertRaisesProhibitedRule(Rule):
 
     RULE_ID = f"{DJANGO_LINTING_RULE_PREFIX}001"
     RULE_LABEL = 'Use of "assertRaises()" is discouraged. Use "assertRaisesMessage()" instead.'
+    NODE_TYPES = (ast.Call, ast.With)
+    TRIGGER_KEYWORDS = ("assertRaises",)
 
     def _check_occurrence_duplication(self, *, occurrences: list[Occurrence], filename: str, line_number: int) -> bool:
         match_already_found = False
@@ -40,7 +42,7 @@ class AssertRaisesProhibitedRule(Rule):
     def check(self) -> list[Occurrence]:
         occurrences = []
 
-        for node in ast.walk(self.source_tree):
+        for node in self.nodes:
             node_matched = False
 
             # Direct call: self.assertRaises(...)
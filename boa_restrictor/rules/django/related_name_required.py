@@ -1,5 +1,6 @@
 import ast
 from collections.abc import Iterator
+from pathlib import Path
 
 from boa_restrictor.common.ast_utils import node_name
 from boa_restrictor.common.file_detection import is_layer_file
@@ -26,21 +27,21 @@ class RelatedNameRequiredRule(Rule):
 
     RULE_ID = f"{DJANGO_LINTING_RULE_PREFIX}008"
     RULE_LABEL = 'Relational model fields must declare an explicit "related_name".'
+    NODE_TYPES = (ast.ClassDef,)
+    TRIGGER_KEYWORDS = tuple(sorted(RELATION_FIELDS))
+
+    @classmethod
+    def is_applicable(cls, *, file_path: Path) -> bool:
+        # Migrations are generated and out of the developer's hands, so they are exempt.
+        return not is_layer_file(file_path, layer="migrations")
 
     def check(self) -> list[Occurrence]:
         occurrences = []
 
-        # Migrations are generated and out of the developer's hands, so they are exempt.
-        if is_layer_file(self.file_path, layer="migrations"):
-            return occurrences
-
         # Index every class in the file by name so base classes can be resolved during Meta inheritance.
-        classes_by_name = {node.name: node for node in ast.walk(self.source_tree) if isinstance(node, ast.ClassDef)}
-
-        for node in ast.walk(self.source_tree):
-            if not isinstance(node, ast.ClassDef):
-                continue
+        classes_by_name = self.context.classes_by_name
 
+        for node in self.nodes:
             # A default_related_name on the model's (effective) Meta makes every reverse accessor explicit.
             if self._model_provides_default_related_name(node, classes_by_name):
                 continue
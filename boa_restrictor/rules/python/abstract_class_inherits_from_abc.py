@@ -11,13 +11,12 @@ class AbstractClassesInheritFromAbcRule(Rule):
 
     RULE_ID = f"{PYTHON_LINTING_RULE_PREFIX}006"
     RULE_LABEL = 'Abstract classes have to inherit from "abc.ABC".'
+    NODE_TYPES = (ast.ClassDef,)
 
     def check(self) -> list[Occurrence]:
         occurrences = []
 
-        for node in ast.walk(self.source_tree):
-            if not isinstance(node, ast.ClassDef):
-                continue
+        for node in self.nodes:
             if "abstract" in node.name.lower():
                 # Check whether the class inherits from `ABC`
                 inherits_abc = any(self.is_abc(base=base) for base in node.bases)
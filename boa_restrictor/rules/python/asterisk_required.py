@@ -12,6 +12,7 @@ class AsteriskRequiredRule(Rule):
 
     RULE_ID = f"{PYTHON_LINTING_RULE_PREFIX}001"
     RULE_LABEL = 'Positional arguments in functions and methods are discouraged. Add an "*" as the first argument.'
+    NODE_TYPES = (ast.FunctionDef, ast.AsyncFunctionDef)
 
     def _missing_asterisk(self, *, node) -> bool:
         for arg in node.args.args:
@@ -23,9 +24,7 @@ class AsteriskRequiredRule(Rule):
     def check(self) -> list[Occurrence]:
         occurrences = []
 
-        for node in ast.walk(self.source_tree):
-            if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                continue
+        for node in self.nodes:
             if self._missing_asterisk(node=node):
                 occurrences.append(
                     Occurrence(
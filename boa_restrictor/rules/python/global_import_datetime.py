@@ -12,12 +12,14 @@ class GlobalImportDatetimeRule(Rule):
 
     RULE_ID = f"{PYTHON_LINTING_RULE_PREFIX}003"
     RULE_LABEL = "Prohibiting nested import of datetime from datetime module."
+    NODE_TYPES = (ast.ImportFrom,)
+    TRIGGER_KEYWORDS = ("datetime",)
 
     def check(self) -> list[Occurrence]:
         occurrences = []
 
-        for node in ast.walk(self.source_tree):
-            if isinstance(node, ast.ImportFrom) and node.module == "datetime":
+        for node in self.nodes:
+            if node.module == "datetime":
                 for alias in node.names:
                     if alias.name in {"datetime", "date"}:
                         occurrences.append(
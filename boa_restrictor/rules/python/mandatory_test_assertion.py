@@ -1,4 +1,5 @@
 import ast
+from pathlib import Path
 
 from boa_restrictor.common.ast_utils import is_test_function
 from boa_restrictor.common.file_detection import is_test_file
@@ -24,14 +25,16 @@ class MandatoryTestAssertionRule(Rule):
 
     RULE_ID = f"{PYTHON_LINTING_RULE_PREFIX}010"
     RULE_LABEL = "Every test must contain at least one assertion."
+    NODE_TYPES = (ast.FunctionDef, ast.AsyncFunctionDef)
+
+    @classmethod
+    def is_applicable(cls, *, file_path: Path) -> bool:
+        return is_test_file(file_path)
 
     def check(self) -> list[Occurrence]:
         occurrences = []
 
-        if not is_test_file(self.file_path):
-            return occurrences
-
-        for node in ast.walk(self.source_tree):
+        for node in self.nodes:
             if is_test_function(node):
                 if not self._contains_assertion(node):
                     occurrences.append(self._build_occurrence(line_number=node.lineno, identifier=node.name))
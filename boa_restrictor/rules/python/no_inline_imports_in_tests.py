@@ -1,4 +1,5 @@
 import ast
+from pathlib import Path
 
 from boa_restrictor.common.file_detection import is_test_file
 from boa_restrictor.common.rule import PYTHON_LINTING_RULE_PREFIX, Rule
@@ -14,12 +15,13 @@ class NoInlineImportInTestsRule(Rule):
     RULE_ID = f"{PYTHON_LINTING_RULE_PREFIX}009"
     RULE_LABEL = "Do not use local/inline imports in test files. Move them to the top of the module."
 
+    @classmethod
+    def is_applicable(cls, *, file_path: Path) -> bool:
+        return is_test_file(file_path)
+
     def check(self) -> list[Occurrence]:
         occurrences = []
 
-        if not is_test_file(self.file_path):
-            return occurrences
-
         self._collect(self.source_tree, in_function=False, occurrences=occurrences)
 
         return occurrences
@@ -12,12 +12,14 @@ class AvoidTypeHintsInVariableNamesAsSuffix(Rule):
     RULE_ID = f"{PYTHON_LINTING_RULE_PREFIX}007"
     RULE_LABEL = "Prohibit type-hinting in variable names"
 
+    NODE_TYPES = (ast.Assign, ast.AnnAssign)
+
     BAD_SUFFIXES = ("_list", "_dict", "_set", "_str", "_int", "_float", "_bool", "_qs")
 
-    def check(self) -> list[Occurrence]:  # noqa: C901
+    def check(self) -> list[Occurrence]:
         occurrences = []
 
-        for node in ast.walk(self.source_tree):
+        for node in self.nodes:
             if isinstance(node, ast.Assign):
                 for target in node.targets:
                     if not isinstance(target, ast.Name):
@@ -36,9 +38,7 @@ class AvoidTypeHintsInVariableNamesAsSuffix(Rule):
                                 )
                             )
             # For type annotations
-            elif isinstance(node, ast.AnnAssign):
-                if not isinstance(node.target, ast.Name):
-                    continue
+            elif isinstance(node.target, ast.Name):
                 var_name = node.target.id
                 for suffix in self.BAD_SUFFIXES:
                     if var_name.endswith(suffix):
@@ -12,6 +12,7 @@ class ReturnStatementRequiresTypeHintRule(Rule):
 
     RULE_ID = f"{PYTHON_LINTING_RULE_PREFIX}002"
     RULE_LABEL = "Return statements require return type hint."
+    NODE_TYPES = (ast.FunctionDef, ast.AsyncFunctionDef)
 
     @staticmethod
     def _walk_scope(node: ast.AST):
@@ -24,21 +25,20 @@ class ReturnStatementRequiresTypeHintRule(Rule):
     def check(self) -> list[Occurrence]:
         occurrences = []
 
-        for node in ast.walk(self.source_tree):
-            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                has_return_statement = any(isinstance(child, ast.Return) for child in self._walk_scope(node))
-                has_return_annotation = node.returns is not None
-
-                if has_return_statement and not has_return_annotation:
-                    occurrences.append(
-                        Occurrence(
-                            filename=self.filename,
-                            file_path=self.file_path,
-                            rule_label=self.RULE_LABEL,
-                            rule_id=self.RULE_ID,
-                            line_number=node.lineno,
-                            identifier=node.name,
-                        )
+        for node in self.nodes:
+            has_return_statement = any(isinstance(child, ast.Return) for child in self._walk_scope(node))
+            has_return_annotation = node.returns is not None
+
+            if has_return_statement and not has_return_annotation:
+                occurrences.append(
+                    Occurrence(
+                        filename=self.filename,
+                        file_path=self.file_path,
+                        rule_label=self.RULE_LABEL,
+                        rule_id=self.RULE_ID,
+                        line_number=node.lineno,
+                        identifier=node.name,
                     )
+                )
 
         return occurrences
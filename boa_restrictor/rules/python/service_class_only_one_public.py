@@ -11,13 +11,13 @@ class ServiceClassHasOnlyOnePublicMethodRule(Rule):
 
     RULE_ID = f"{PYTHON_LINTING_RULE_PREFIX}005"
     RULE_LABEL = 'Service classes must have exactly one public method named "process".'
+    NODE_TYPES = (ast.ClassDef,)
+    TRIGGER_KEYWORDS = ("Service",)
 
     def check(self) -> list[Occurrence]:
         occurrences = []
 
-        for node in ast.walk(self.source_tree):
-            if not isinstance(node, ast.ClassDef):
-                continue
+        for node in self.nodes:
             if node.name.endswith("Service"):
                 public_methods = []
 
@@ -0,0 +1,118 @@
+import dataclasses
+import importlib
+
+from boa_restrictor.common.rule import Rule
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class RuleRegistration:
+    """
+    A built-in rule, known by its ID without importing the module it is defined in.
+    """
+
+    rule_id: str
+    module_path: str
+    class_name: str
+
+    def load(self) -> type[Rule]:
+        """
+        Import the module of the rule and return its class.
+        """
+        return getattr(importlib.import_module(self.module_path), self.class_name)
+
+
+BOA_RESTRICTOR_RULE_REGISTRY = (
+    RuleRegistration(
+        rule_id="PBR001",
+        module_path="boa_restrictor.rules.python.asterisk_required",
+        class_name="AsteriskRequiredRule",
+    ),
+    RuleRegistration(
+        rule_id="PBR002",
+        module_path="boa_restrictor.rules.python.return_type_hints",
+        class_name="ReturnStatementRequiresTypeHintRule",
+    ),
+    RuleRegistration(
+        rule_id="PBR003",
+        module_path="boa_restrictor.rules.python.global_import_datetime",
+        class_name="GlobalImportDatetimeRule",
+    ),
+    RuleRegistration(
+        rule_id="PBR004",
+        module_path="boa_restrictor.rules.python.dataclass_kw_only",
+        class_name="DataclassWithKwargsOnlyRule",
+    ),
+    RuleRegistration(
+        rule_id="PBR005",
+        module_path="boa_restrictor.rules.python.service_class_only_one_public",
+        class_name="ServiceClassHasOnlyOnePublicMethodRule",
+    ),
+    RuleRegistration(
+        rule_id="PBR006",
+        module_path="boa_restrictor.rules.python.abstract_class_inherits_from_abc",
+        class_name="AbstractClassesInheritFromAbcRule",
+    ),
+    RuleRegistration(
+        rule_id="PBR007",
+        module_path="boa_restrictor.rules.python.no_type_hints_in_variable_names",
+        class_name="AvoidTypeHintsInVariableNamesAsSuffix",
+    ),
+    RuleRegistration(
+        rule_id="PBR008",
+        module_path="boa_restrictor.rules.python.no_loops_in_tests",
+        class_name="NoLoopsInTestsRule",
+    ),
+    RuleRegistration(
+        rule_id="PBR009",
+        module_path="boa_restrictor.rules.python.no_inline_imports_in_tests",
+        class_name="NoInlineImportInTestsRule",
+    ),
+    RuleRegistration(
+        rule_id="PBR010",
+        module_path="boa_restrictor.rules.python.mandatory_test_assertion",
+        class_name="MandatoryTestAssertionRule",
+    ),
+)
+
+DJANGO_BOA_RULE_REGISTRY = (
+    RuleRegistration(
+        rule_id="DBR001",
+        module_path="boa_restrictor.rules.django.prohibit_assert_raises",
+        class_name="AssertRaisesProhibitedRule",
+    ),
+    RuleRegistration(
+        rule_id="DBR002",
+        module_path="boa_restrictor.rules.django.no_db_in_views",
+        class_name="NoDjangoDbImportInViewsRule",
+    ),
+    RuleRegistration(
+        rule_id="DBR003",
+        module_path="boa_restrictor.rules.django.no_assert_booleans_in_tests",
+        class_name="ProhibitAssertBooleanInTests",
+    ),
+    RuleRegistration(
+        rule_id="DBR004",
+        module_path="boa_restrictor.rules.django.prohibit_datetime_now",
+        class_name="ProhibitDatetimeNow",
+    ),
+    RuleRegistration(
+        rule_id="DBR005",
+        module_path="boa_restrictor.rules.django.no_db_in_api",
+        class_name="NoDjangoDbImportInApiRule",
+    ),
+    RuleRegistration(
+        rule_id="DBR006",
+        module_path="boa_restrictor.rules.django.avoid_tuple_based_model_choices",
+        class_name="AvoidTupleBasedModelChoices",
+    ),
+    RuleRegistration(
+        rule_id="DBR007",
+        module_path="boa_restrictor.rules.django.charfield_max_length_required",
+        class_name="CharFieldMaxLengthRequiredRule",
+    ),
+    RuleRegistration(
+        rule_id="DBR008",
+        module_path="boa_restrictor.rules.django.related_name_required",
+        class_name="RelatedNameRequiredRule",
+    ),
+)
@@ -0,0 +1,122 @@
+import json
+from unittest import mock
+
+import pytest
+
+from boa_restrictor.cli.baseline import BASELINE_VERSION, Baseline
+from boa_restrictor.cli.configuration import compile_execution_plan
+from boa_restrictor.cli.linting import lint_file
+from boa_restrictor.cli.path_filter import RelativePathResolver
+from boa_restrictor.exceptions.baseline import InvalidBaselineError
+from boa_restrictor.rules import AsteriskRequiredRule
+
+
+def _lint(*, file_path):
+    execution_plan = compile_execution_plan(configuration={}, rules=(AsteriskRequiredRule,))
+    return lint_file(filename=str(file_path), execution_plan=execution_plan)
+
+
+def test_baseline_known_occurrences_filtered(tmp_path):
+    file_path = tmp_path / "module.py"
+    file_path.write_text("def function(a):\n    return a\n")
+    baseline = Baseline(relative_path_resolver=RelativePathResolver(anchor_dir=tmp_path))
+    baseline.add(occurrences=_lint(file_path=file_path))
+
+    # Known occurrences stay known when lines shift or their indentation changes
+    file_path.write_text(
+        "import os\n\nclass Class:\n    def function(a):\n        return a\n\ndef other(b):\n    pass\n"
+    )
+    occurrences = _lint(file_path=file_path)
+
+    assert [occurrence.identifier for occurrence in occurrences] == ["function", "other"]
+    assert [occurrence.identifier for occurrence in baseline.filter_new_occurrences(occurrences=occurrences)] == [
+        "other"
+    ]
+
+
+def test_baseline_new_duplicates_reported(tmp_path):
+    file_path = tmp_path / "module.py"
+    file_path.write_text("def function(a):\n    return a\n")
+    baseline = Baseline(relative_path_resolver=RelativePathResolver(anchor_dir=tmp_path))
+    baseline.add(occurrences=_lint(file_path=file_path))
+
+    file_path.write_text("def function(a):\n    return a\n\ndef function(a):\n    return a\n")
+    new_occurrences = baseline.filter_new_occurrences(occurrences=_lint(file_path=file_path))
+
+    assert [occurrence.line_number for occurrence in new_occurrences] == [4]
+
+
+@pytest.mark.parametrize("line_separator", ["\n", "\r\n"])
+def test_baseline_fingerprints_ignore_unicode_line_separators(tmp_path, line_separator):
+    file_path = tmp_path / "module.py"
+    file_path.write_text("def function(a):\n    return a\n")
+    baseline = Baseline(relative_path_resolver=RelativePathResolver(anchor_dir=tmp_path))
+    baseline.add(occurrences=_lint(file_path=file_path))
+
+    # Form feeds and Unicode line separators don't end a line of Python code
+    file_path.write_bytes(
+        line_separator.join(['x = "a\u2028b\x1cc"  \x0c', "def function(a):", "    return a", ""]).encode()
+    )
+    occurrences = _lint(file_path=file_path)
+
+    assert [occurrence.line_number for occurrence in occurrences] == [2]
+    assert baseline.filter_new_occurrences(occurrences=occurrences) == []
+
+
+def test_baseline_fingerprints_relative_to_anchor(tmp_path, monkeypatch):
+    (tmp_path / "src").mkdir()
+    file_path = tmp_path / "src" / "module.py"
+    file_path.write_text("def function(a):\n    return a\n")
+    relative_path_resolver = RelativePathResolver(anchor_dir=tmp_path)
+    absolute_fingerprints = Baseline(relative_path_resolver=relative_path_resolver).compute_fingerprints(
+        occurrences=_lint(file_path=file_path)
+    )
+
+    monkeypatch.chdir(tmp_path / "src")
+    relative_fingerprints = Baseline(relative_path_resolver=relative_path_resolver).compute_fingerprints(
+        occurrences=_lint(file_path="module.py")
+    )
+
+    assert absolute_fingerprints == relative_fingerprints
+
+
+def test_baseline_save_and_load(tmp_path):
+    file_path = tmp_path / "module.py"
+    file_path.write_text("def function(a):\n    return a\n")
+    relative_path_resolver = RelativePathResolver(anchor_dir=tmp_path)
+    baseline = Baseline(relative_path_resolver=relative_path_resolver)
+    baseline.add(occurrences=_lint(file_path=file_path))
+
+    baseline.save(path=tmp_path / "baseline.json")
+    loaded_baseline = Baseline.load(path=tmp_path / "baseline.json", relative_path_resolver=relative_path_resolver)
+
+    assert loaded_baseline.fingerprints == baseline.fingerprints
+    assert loaded_baseline.filter_new_occurrences(occurrences=_lint(file_path=file_path)) == []
+
+
+def test_baseline_save_keeps_previous_baseline_on_error(tmp_path):
+    baseline_path = tmp_path / "baseline.json"
+    baseline_path.write_text('{"version": 1, "fingerprints": ["known"]}\n')
+    baseline = Baseline(relative_path_resolver=RelativePathResolver(anchor_dir=tmp_path), fingerprints=["new"])
+
+    with mock.patch("json.dump", side_effect=KeyboardInterrupt), pytest.raises(KeyboardInterrupt):
+        baseline.save(path=baseline_path)
+
+    assert baseline_path.read_text() == '{"version": 1, "fingerprints": ["known"]}\n'
+    assert [path.name for path in tmp_path.iterdir()] == ["baseline.json"]
+
+
+def test_baseline_load_missing_file(tmp_path):
+    with pytest.raises(InvalidBaselineError, match=r"doesn't exist"):
+        Baseline.load(path=tmp_path / "baseline.json", relative_path_resolver=RelativePathResolver(anchor_dir=tmp_path))
+
+
+@pytest.mark.parametrize(
+    "content",
+    ["not json", json.dumps([]), json.dumps({"version": BASELINE_VERSION + 1, "fingerprints": []})],
+)
+def test_baseline_load_invalid_file(tmp_path, content):
+    (tmp_path / "baseline.json").write_text(content)
+
+    with pytest.raises(InvalidBaselineError):
+        Baseline.load(path=tmp_path / "baseline.json", relative_path_resolver=RelativePathResolver(anchor_dir=tmp_path))
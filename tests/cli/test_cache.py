@@ -0,0 +1,317 @@
+import json
+import os
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from boa_restrictor.cli import cache
+from boa_restrictor.cli.cache import ResultCache, compute_run_fingerprint
+from boa_restrictor.cli.path_filter import RelativePathResolver
+from boa_restrictor.projections.occurrence import Occurrence
+from boa_restrictor.rules import AsteriskRequiredRule, ReturnStatementRequiresTypeHintRule
+from tests.fixtures.custom_rule_module import SampleCustomRule
+
+# Old enough to not be considered racily modified
+OLD_MTIME_NS = 1_000_000_000_000_000_000
+
+
+def _write_file(*, path: Path, content: str) -> Path:
+    path.write_text(content)
+    os.utime(path, ns=(OLD_MTIME_NS, OLD_MTIME_NS))
+    return path
+
+
+def _build_occurrence(*, file_path: Path, line_number: int = 1) -> Occurrence:
+    return Occurrence(
+        rule_id="PBR001",
+        rule_label="Label",
+        filename=file_path.name,
+        file_path=file_path,
+        identifier="function",
+        line_number=line_number,
+    )
+
+
+def test_compute_run_fingerprint_stable():
+    assert compute_run_fingerprint(configuration={"exclude": ["PBR002"]}, rules=(AsteriskRequiredRule,)) == (
+        compute_run_fingerprint(configuration={"exclude": ["PBR002"]}, rules=(AsteriskRequiredRule,))
+    )
+
+
+def test_compute_run_fingerprint_depends_on_configuration():
+    assert compute_run_fingerprint(configuration={}, rules=(AsteriskRequiredRule,)) != (
+        compute_run_fingerprint(configuration={"exclude": ["PBR002"]}, rules=(AsteriskRequiredRule,))
+    )
+
+
+def test_compute_run_fingerprint_depends_on_rules():
+    assert compute_run_fingerprint(configuration={}, rules=(AsteriskRequiredRule,)) != (
+        compute_run_fingerprint(configuration={}, rules=(AsteriskRequiredRule, ReturnStatementRequiresTypeHintRule))
+    )
+
+
+def test_compute_run_fingerprint_depends_on_version():
+    fingerprint = compute_run_fingerprint(configuration={}, rules=(AsteriskRequiredRule,))
+
+    with mock.patch.object(cache, "__version__", "0.0.1"):
+        assert compute_run_fingerprint(configuration={}, rules=(AsteriskRequiredRule,)) != fingerprint
+
+
+def test_compute_run_fingerprint_depends_on_custom_rule_source():
+    fingerprint = compute_run_fingerprint(configuration={}, rules=(SampleCustomRule,))
+
+    with mock.patch.object(Path, "read_bytes", return_value=b"changed"):
+        assert compute_run_fingerprint(configuration={}, rules=(SampleCustomRule,)) != fingerprint
+
+
+def test_result_cache_miss_then_hit(tmp_path):
+    file_path = _write_file(path=tmp_path / "module.py", content="x = 1\n")
+    result_cache = ResultCache(
+        cache_dir=tmp_path / "cache",
+        run_fingerprint="fingerprint",
+        relative_path_resolver=RelativePathResolver(anchor_dir=tmp_path),
+    )
+
+    lookup = result_cache.lookup(file_path=file_path, rule_ids=("PBR001",))
+    assert lookup.occurrences is None
+
+    result_cache.store(lookup=lookup, occurrences=[_build_occurrence(file_path=file_path)])
+    result_cache.save()
+
+    assert ResultCache(
+        cache_dir=tmp_path / "cache",
+        run_fingerprint="fingerprint",
+        relative_path_resolver=RelativePathResolver(anchor_dir=tmp_path),
+    ).lookup(file_path=file_path, rule_ids=("PBR001",)).occurrences == [_build_occurrence(file_path=file_path)]
+
+
+def test_result_cache_miss_for_file_with_same_content(tmp_path):
+    file_path = _write_file(path=tmp_path / "module.py", content="x = 1\n")
+    copied_file_path = _write_file(path=tmp_path / "copy.py", content="x = 1\n")
+    result_cache = ResultCache(
+        cache_dir=tmp_path / "cache",
+        run_fingerprint="fingerprint",
+        relative_path_resolver=RelativePathResolver(anchor_dir=tmp_path),
+    )
+    result_cache.store(
+        lookup=result_cache.lookup(file_path=file_path, rule_ids=("PBR001",)),
+        occurrences=[_build_occurrence(file_path=file_path)],
+    )
+
+    assert result_cache.lookup(file_path=copied_file_path, rule_ids=("PBR001",)).occurrences is None
+
+
+def test_result_cache_hit_independent_of_working_directory(tmp_path, monkeypatch):
+    (tmp_path / "src").mkdir()
+    file_path = _write_file(path=tmp_path / "src" / "module.py", content="x = 1\n")
+    result_cache = ResultCache(
+        cache_dir=tmp_path / "cache",
+        run_fingerprint="fingerprint",
+        relative_path_resolver=RelativePathResolver(anchor_dir=tmp_path),
+    )
+    result_cache.store(
+        lookup=result_cache.lookup(file_path=file_path, rule_ids=("PBR001",)),
+        occurrences=[_build_occurrence(file_path=file_path)],
+    )
+    monkeypatch.chdir(tmp_path / "src")
+
+    lookup = result_cache.lookup(file_path=Path("module.py"), rule_ids=("PBR001",))
+
+    assert lookup.occurrences == [_build_occurrence(file_path=Path("module.py"))]
+
+
+def test_result_cache_miss_for_other_rules_or_fingerprint(tmp_path):
+    file_path = _write_file(path=tmp_path / "module.py", content="x = 1\n")
+    result_cache = ResultCache(
+        cache_dir=tmp_path / "cache",
+        run_fingerprint="fingerprint",
+        relative_path_resolver=RelativePathResolver(anchor_dir=tmp_path),
+    )
+    result_cache.store(lookup=result_cache.lookup(file_path=file_path, rule_ids=("PBR001",)), occurrences=[])
+
+    assert result_cache.lookup(file_path=file_path, rule_ids=("PBR002",)).occurrences is None
+    assert (
+        ResultCache(
+            cache_dir=tmp_path / "cache",
+            run_fingerprint="other",
+            relative_path_resolver=RelativePathResolver(anchor_dir=tmp_path),
+        )
+        .lookup(file_path=file_path, rule_ids=("PBR001",))
+        .occurrences
+        is None
+    )
+
+
+def test_result_cache_miss_for_changed_content(tmp_path):
+    file_path = _write_file(path=tmp_path / "module.py", content="x = 1\n")
+    result_cache = ResultCache(
+        cache_dir=tmp_path / "cache",
+        run_fingerprint="fingerprint",
+        relative_path_resolver=RelativePathResolver(anchor_dir=tmp_path),
+    )
+    result_cache.store(lookup=result_cache.lookup(file_path=file_path, rule_ids=("PBR001",)), occurrences=[])
+    result_cache.save()
+
+    _write_file(path=file_path, content="x = 12\n")
+
+    assert (
+        ResultCache(
+            cache_dir=tmp_path / "cache",
+            run_fingerprint="fingerprint",
+            relative_path_resolver=RelativePathResolver(anchor_dir=tmp_path),
+        )
+        .lookup(file_path=file_path, rule_ids=("PBR001",))
+        .occurrences
+        is None
+    )
+
+
+def test_result_cache_unchanged_stat_skips_reading(tmp_path):
+    file_path = _write_file(path=tmp_path / "module.py", content="x = 1\n")
+    result_cache = ResultCache(
+        cache_dir=tmp_path / "cache",
+        run_fingerprint="fingerprint",
+        relative_path_resolver=RelativePathResolver(anchor_dir=tmp_path),
+    )
+    result_cache.store(lookup=result_cache.lookup(file_path=file_path, rule_ids=("PBR001",)), occurrences=[])
+    result_cache.save()
+
+    result_cache = ResultCache(
+        cache_dir=tmp_path / "cache",
+        run_fingerprint="fingerprint",
+        relative_path_resolver=RelativePathResolver(anchor_dir=tmp_path),
+    )
+    with mock.patch("builtins.open", wraps=open) as mocked_open:
+        assert result_cache.lookup(file_path=file_path, rule_ids=("PBR001",)).occurrences == []
+
+    assert str(file_path) not in [str(call.args[0]) for call in mocked_open.call_args_list]
+
+
+def test_result_cache_racily_modified_file_not_remembered(tmp_path):
+    file_path = tmp_path / "module.py"
+    file_path.write_text("x = 1\n")
+    result_cache = ResultCache(
+        cache_dir=tmp_path / "cache",
+        run_fingerprint="fingerprint",
+        relative_path_resolver=RelativePathResolver(anchor_dir=tmp_path),
+    )
+
+    result_cache.lookup(file_path=file_path, rule_ids=("PBR001",))
+    result_cache.save()
+
+    assert not (tmp_path / "cache" / cache.STAT_INDEX_FILENAME).exists()
+
+
+def test_result_cache_save_keeps_stat_records_of_other_processes(tmp_path):
+    file_path = _write_file(path=tmp_path / "module.py", content="x = 1\n")
+    other_file_path = _write_file(path=tmp_path / "other.py", content="x = 2\n")
+    result_cache = ResultCache(
+        cache_dir=tmp_path / "cache",
+        run_fingerprint="fingerprint",
+        relative_path_resolver=RelativePathResolver(anchor_dir=tmp_path),
+    )
+    other_result_cache = ResultCache(
+        cache_dir=tmp_path / "cache",
+        run_fingerprint="fingerprint",
+        relative_path_resolver=RelativePathResolver(anchor_dir=tmp_path),
+    )
+
+    result_cache.lookup(file_path=file_path, rule_ids=("PBR001",))
+    other_result_cache.lookup(file_path=other_file_path, rule_ids=("PBR001",))
+    result_cache.save()
+    other_result_cache.save()
+
+    with open(tmp_path / "cache" / cache.STAT_INDEX_FILENAME) as f:
+        assert set(json.load(f)) == {os.path.abspath(file_path), os.path.abspath(other_file_path)}
+
+
+def test_result_cache_save_forgets_files_found_missing(tmp_path):
+    file_path = _write_file(path=tmp_path / "module.py", content="x = 1\n")
+    deleted_file_path = _write_file(path=tmp_path / "deleted.py", content="x = 2\n")
+    result_cache = ResultCache(
+        cache_dir=tmp_path / "cache",
+        run_fingerprint="fingerprint",
+        relative_path_resolver=RelativePathResolver(anchor_dir=tmp_path),
+    )
+    result_cache.lookup(file_path=file_path, rule_ids=("PBR001",))
+    result_cache.lookup(file_path=deleted_file_path, rule_ids=("PBR001",))
+    result_cache.save()
+
+    deleted_file_path.unlink()
+    with pytest.raises(FileNotFoundError):
+        result_cache.lookup(file_path=deleted_file_path, rule_ids=("PBR001",))
+    result_cache.save()
+
+    with open(tmp_path / "cache" / cache.STAT_INDEX_FILENAME) as f:
+        assert set(json.load(f)) == {os.path.abspath(file_path)}
+
+
+def test_result_cache_save_doesnt_check_other_indexed_files(tmp_path):
+    file_path = _write_file(path=tmp_path / "module.py", content="x = 1\n")
+    deleted_file_path = _write_file(path=tmp_path / "deleted.py", content="x = 2\n")
+    result_cache = ResultCache(
+        cache_dir=tmp_path / "cache",
+        run_fingerprint="fingerprint",
+        relative_path_resolver=RelativePathResolver(anchor_dir=tmp_path),
+    )
+    result_cache.lookup(file_path=deleted_file_path, rule_ids=("PBR001",))
+    result_cache.save()
+    deleted_file_path.unlink()
+
+    result_cache.lookup(file_path=file_path, rule_ids=("PBR001",))
+    with mock.patch("os.path.exists") as mocked_exists:
+        result_cache.save()
+
+    mocked_exists.assert_not_called()
+    with open(tmp_path / "cache" / cache.STAT_INDEX_FILENAME) as f:
+        assert set(json.load(f)) == {os.path.abspath(file_path), os.path.abspath(deleted_file_path)}
+
+
+def test_result_cache_evicts_least_recently_used_entries(tmp_path):
+    result_cache = ResultCache(
+        cache_dir=tmp_path / "cache",
+        run_fingerprint="fingerprint",
+        relative_path_resolver=RelativePathResolver(anchor_dir=tmp_path),
+        max_size=1,
+    )
+    file_paths = [_write_file(path=tmp_path / f"module_{index}.py", content=f"x = {index}\n") for index in range(3)]
+    lookups = [result_cache.lookup(file_path=file_path, rule_ids=("PBR001",)) for file_path in file_paths]
+    for index, lookup in enumerate(lookups):
+        result_cache.store(lookup=lookup, occurrences=[_build_occurrence(file_path=file_paths[index])])
+        entry_path = tmp_path / "cache" / cache.ENTRIES_DIRNAME / f"{lookup.key}.json"
+        os.utime(entry_path, ns=(index, index))
+    result_cache.max_size = (tmp_path / "cache" / cache.ENTRIES_DIRNAME / f"{lookups[2].key}.json").stat().st_size * 2
+
+    result_cache.save()
+
+    assert sorted(path.stem for path in (tmp_path / "cache" / cache.ENTRIES_DIRNAME).iterdir()) == sorted(
+        lookup.key for lookup in lookups[1:]
+    )
+
+
+def test_result_cache_ignored_by_git(tmp_path):
+    file_path = _write_file(path=tmp_path / "module.py", content="x = 1\n")
+    result_cache = ResultCache(
+        cache_dir=tmp_path / "cache",
+        run_fingerprint="fingerprint",
+        relative_path_resolver=RelativePathResolver(anchor_dir=tmp_path),
+    )
+
+    result_cache.store(lookup=result_cache.lookup(file_path=file_path, rule_ids=("PBR001",)), occurrences=[])
+
+    assert (tmp_path / "cache" / ".gitignore").read_text() == "*\n"
+
+
+def test_result_cache_corrupt_entry_is_a_miss(tmp_path):
+    file_path = _write_file(path=tmp_path / "module.py", content="x = 1\n")
+    result_cache = ResultCache(
+        cache_dir=tmp_path / "cache",
+        run_fingerprint="fingerprint",
+        relative_path_resolver=RelativePathResolver(anchor_dir=tmp_path),
+    )
+    lookup = result_cache.lookup(file_path=file_path, rule_ids=("PBR001",))
+    result_cache.store(lookup=lookup, occurrences=[])
+    (tmp_path / "cache" / cache.ENTRIES_DIRNAME / f"{lookup.key}.json").write_text("{broken")
+
+    assert result_cache.lookup(file_path=file_path, rule_ids=("PBR001",)).occurrences is None
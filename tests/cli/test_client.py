@@ -0,0 +1,103 @@
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+import pytest
+
+from boa_restrictor.cli import client
+from boa_restrictor.cli.client import get_default_socket_path, get_socket_dir, main, request_daemon
+
+
+def test_get_default_socket_path_per_project():
+    assert get_default_socket_path(config_path="pyproject.toml") == get_default_socket_path(
+        config_path=os.path.abspath("pyproject.toml")
+    )
+    assert get_default_socket_path(config_path="pyproject.toml") != get_default_socket_path(
+        config_path="other/pyproject.toml"
+    )
+
+
+def test_get_default_socket_path_within_socket_dir():
+    assert os.path.dirname(get_default_socket_path(config_path="pyproject.toml")) == get_socket_dir()
+
+
+def test_get_socket_dir_runtime_dir(monkeypatch):
+    monkeypatch.setenv("XDG_RUNTIME_DIR", "/run/user/1000")
+
+    assert get_socket_dir() == "/run/user/1000/boa-restrictor"
+
+
+def test_get_socket_dir_without_runtime_dir(monkeypatch):
+    monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+
+    assert get_socket_dir() == os.path.join(tempfile.gettempdir(), f"boa-restrictor-{os.getuid()}")
+
+
+def test_request_daemon_not_running(tmp_path):
+    assert request_daemon(socket_path=str(tmp_path / "missing.sock"), request={}) is None
+
+
+def test_request_daemon_socket_of_other_user(tmp_path):
+    socket_path = tmp_path / "daemon.sock"
+    socket_path.touch()
+
+    with (
+        mock.patch.object(client.os, "getuid", return_value=os.getuid() + 1),
+        mock.patch.object(client.socket, "socket") as mocked_socket,
+    ):
+        assert request_daemon(socket_path=str(socket_path), request={}) is None
+
+    mocked_socket.assert_not_called()
+
+
+@mock.patch.object(
+    client, "request_daemon", return_value={"output": '"file.py:1": (PBR001) Label\n', "has_occurrences": True}
+)
+def test_main_prints_daemon_output(mocked_request_daemon):
+    with mock.patch("sys.stdout", new=StringIO()) as mocked_stdout:
+        result = main(argv=["file.py"])
+
+    assert result is True
+    assert mocked_stdout.getvalue() == '"file.py:1": (PBR001) Label\n'
+    assert mocked_request_daemon.call_args.kwargs["request"]["filenames"] == ["file.py"]
+
+
+@mock.patch.object(client, "request_daemon", return_value=None)
+def test_main_lints_in_process_without_daemon(*args):
+    with mock.patch("boa_restrictor.cli.main.main", return_value=False) as mocked_main:
+        result = main(argv=["file.py", "--config", "custom.toml", "--jobs", "2"])
+
+    assert result is False
+    mocked_main.assert_called_once_with(argv=["file.py", "--config", "custom.toml", "--jobs", "2"])
+
+
+@pytest.mark.parametrize(
+    "option",
+    [
+        ["--format", "sarif"],
+        ["--jobs", "2"],
+        ["--cache-dir", ".cache"],
+        ["--baseline", "baseline.json"],
+        ["--diff-lines"],
+    ],
+)
+def test_main_lints_in_process_with_options_unknown_to_daemon(option):
+    with (
+        mock.patch.object(client, "request_daemon") as mocked_request_daemon,
+        mock.patch("boa_restrictor.cli.main.main", return_value=False) as mocked_main,
+    ):
+        result = main(argv=["file.py", *option])
+
+    assert result is False
+    mocked_request_daemon.assert_not_called()
+    mocked_main.assert_called_once_with(argv=["file.py", "--config", "pyproject.toml", *option])
+
+
+@mock.patch.object(client, "request_daemon", return_value={"error": "Something went wrong."})
+def test_main_lints_in_process_on_daemon_error(*args):
+    with mock.patch("boa_restrictor.cli.main.main", return_value=True) as mocked_main:
+        result = main(argv=["file.py"])
+
+    assert result is True
+    mocked_main.assert_called_once()
@@ -3,9 +3,19 @@ from unittest import mock
 
 import pytest
 
-from boa_restrictor.cli.configuration import is_rule_excluded, is_rule_excluded_per_file, load_configuration
+from boa_restrictor.cli.configuration import (
+    compile_execution_plan,
+    load_configuration,
+)
 from boa_restrictor.exceptions.configuration import TomlParsingError
-from boa_restrictor.rules import AssertRaisesProhibitedRule, AsteriskRequiredRule
+from boa_restrictor.rules import (
+    AssertRaisesProhibitedRule,
+    AsteriskRequiredRule,
+    NoLoopsInTestsRule,
+    ProhibitDatetimeNow,
+    ReturnStatementRequiresTypeHintRule,
+)
+from tests.fixtures.custom_rule_module import SampleCustomRule
 
 
 @mock.patch("builtins.open", mock.mock_open(read_data=b'[tool."boa-restrictor"]\nexclude = ["PBR001"]\n'))
@@ -53,116 +63,157 @@ def test_load_configuration_key_missing():
     assert data == {}
 
 
-def test_is_rule_excluded_is_excluded():
-    assert is_rule_excluded(rule_class=AsteriskRequiredRule, excluded_rules=["PBR001"]) is True
+def test_compile_execution_plan_django_rule_excluded():
+    plan = compile_execution_plan(
+        configuration={"exclude": ["DBR001"]}, rules=(AsteriskRequiredRule, AssertRaisesProhibitedRule)
+    )
 
+    assert plan.rules == (AsteriskRequiredRule,)
 
-def test_is_django_rule_excluded_is_excluded():
-    assert is_rule_excluded(rule_class=AssertRaisesProhibitedRule, excluded_rules=["DBR001"]) is True
 
+def test_compile_execution_plan_invalid_rule_does_not_disable_other_exclusions():
+    """A typo in the exclusion list must warn but still honour the remaining valid IDs."""
+    with mock.patch.object(warnings, "warn") as mocked_warn:
+        plan = compile_execution_plan(
+            configuration={"exclude": ["TYPO123", "PBR001"]},
+            rules=(AsteriskRequiredRule, ReturnStatementRequiresTypeHintRule),
+        )
 
-def test_is_rule_excluded_is_not_excluded():
-    assert is_rule_excluded(rule_class=AsteriskRequiredRule, excluded_rules=["PBR002"]) is False
+    mocked_warn.assert_called_once()
+    assert plan.rules == (ReturnStatementRequiresTypeHintRule,)
 
 
-@mock.patch.object(warnings, "warn")
-def test_is_rule_excluded_invalid_rule(mocked_warn):
-    assert is_rule_excluded(rule_class=AsteriskRequiredRule, excluded_rules=["PBR999"]) is False
-    mocked_warn.assert_called_once()
+def test_compile_execution_plan_custom_rule_ids_are_valid():
+    """The ID of a (custom) rule passed to the plan must not trigger the invalid rule warning."""
+    with mock.patch.object(warnings, "warn") as mocked_warn:
+        plan = compile_execution_plan(
+            configuration={"exclude": ["TST001"], "per-file-excludes": {"*.py": ["TST001"]}},
+            rules=(AsteriskRequiredRule, SampleCustomRule),
+        )
 
+    mocked_warn.assert_not_called()
+    assert plan.rules == (AsteriskRequiredRule,)
 
-@mock.patch.object(warnings, "warn")
-def test_is_rule_excluded_invalid_rule_does_not_disable_other_exclusions(mocked_warn):
-    """A typo in the exclusion list must warn but still honour the remaining valid IDs."""
-    assert is_rule_excluded(rule_class=AsteriskRequiredRule, excluded_rules=["TYPO123", "PBR001"]) is True
-    mocked_warn.assert_called_once()
 
+def test_compile_execution_plan_unresolved_builtin_rule_ids_are_valid():
+    """Globally excluded built-in rules aren't resolved at all, but excluding them mustn't warn."""
+    with mock.patch.object(warnings, "warn") as mocked_warn:
+        plan = compile_execution_plan(configuration={"exclude": ["PBR002", "DBR001"]}, rules=(AsteriskRequiredRule,))
 
-def test_is_rule_excluded_per_file_is_excluded():
-    assert (
-        is_rule_excluded_per_file(
-            filename="tests/test_history.py",
-            rule_class=AsteriskRequiredRule,
-            per_file_excluded_rules={"*.py": ["PBR001"]},
+    mocked_warn.assert_not_called()
+    assert plan.rules == (AsteriskRequiredRule,)
+
+
+def test_compile_execution_plan_disabled_django_rule_ids_are_invalid():
+    with mock.patch.object(warnings, "warn") as mocked_warn:
+        compile_execution_plan(
+            configuration={"enable_django_rules": False, "exclude": ["DBR001"]}, rules=(AsteriskRequiredRule,)
         )
-        is True
+
+    mocked_warn.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    ("filename", "per_file_excludes", "expected_rules"),
+    [
+        ("tests/test_history.py", {"*.py": ["PBR001"]}, (ReturnStatementRequiresTypeHintRule,)),
+        ("tests/test_history.py", {"*.py": ["PBR002"]}, (AsteriskRequiredRule,)),
+        ("pyproject.toml", {"*.py": ["PBR001"]}, (AsteriskRequiredRule, ReturnStatementRequiresTypeHintRule)),
+        ("apps/common/file.py", {"*/common/*.py": ["PBR001"]}, (ReturnStatementRequiresTypeHintRule,)),
+        ("apps/common/package/file.py", {"*/common/**/*.py": ["PBR001"]}, (ReturnStatementRequiresTypeHintRule,)),
+    ],
+)
+def test_execution_plan_rules_for_file_per_file_patterns(filename, per_file_excludes, expected_rules):
+    plan = compile_execution_plan(
+        configuration={"per-file-excludes": per_file_excludes},
+        rules=(AsteriskRequiredRule, ReturnStatementRequiresTypeHintRule),
     )
 
+    assert plan.rules_for_file(filename=filename) == expected_rules
 
-def test_is_rule_excluded_per_file_is_not_excluded():
-    assert (
-        is_rule_excluded_per_file(
-            filename="tests/test_history.py",
-            rule_class=AsteriskRequiredRule,
-            per_file_excluded_rules={"*.py": ["PBR002"]},
-        )
-        is False
+
+def test_compile_execution_plan_global_exclusions():
+    plan = compile_execution_plan(
+        configuration={"exclude": ["PBR001"]},
+        rules=(AsteriskRequiredRule, ReturnStatementRequiresTypeHintRule),
     )
 
+    assert plan.rules == (ReturnStatementRequiresTypeHintRule,)
 
-def test_is_rule_excluded_per_file_file_not_matched():
-    assert (
-        is_rule_excluded_per_file(
-            filename="pyproject.toml",
-            rule_class=AsteriskRequiredRule,
-            per_file_excluded_rules={"*.py": ["PBR002"]},
-        )
-        is False
+
+def test_compile_execution_plan_keyword_prefilter_covers_enabled_rules():
+    plan = compile_execution_plan(
+        configuration={"exclude": ["DBR004"]},
+        rules=(AsteriskRequiredRule, ProhibitDatetimeNow),
     )
 
+    assert plan.keyword_prefilter.find_keywords(source_code="datetime.now()") == frozenset()
 
-def test_is_rule_excluded_per_file_exclude_directory():
-    assert (
-        is_rule_excluded_per_file(
-            filename="apps/common/file.py",
-            rule_class=AsteriskRequiredRule,
-            per_file_excluded_rules={"*/common/*.py": ["PBR001"]},
+
+def test_compile_execution_plan_warns_once_per_invalid_rule():
+    with mock.patch.object(warnings, "warn") as mocked_warn:
+        compile_execution_plan(
+            configuration={"exclude": ["TYPO001", "PBR001"], "per-file-excludes": {"*.py": ["TYPO002", "PBR002"]}},
+            rules=(AsteriskRequiredRule, ReturnStatementRequiresTypeHintRule),
         )
-        is True
+
+    assert mocked_warn.call_count == 2  # noqa: PLR2004
+
+
+def test_execution_plan_rules_for_file_per_file_exclusions():
+    plan = compile_execution_plan(
+        configuration={"per-file-excludes": {"*/scripts/*.py": ["PBR001"]}},
+        rules=(AsteriskRequiredRule, ReturnStatementRequiresTypeHintRule),
     )
 
+    assert plan.rules_for_file(filename="app/scripts/run.py") == (ReturnStatementRequiresTypeHintRule,)
+    assert plan.rules_for_file(filename="app/models.py") == (AsteriskRequiredRule, ReturnStatementRequiresTypeHintRule)
 
-def test_is_rule_excluded_per_file_exclude_subdirectory():
-    assert (
-        is_rule_excluded_per_file(
-            filename="apps/common/package/file.py",
-            rule_class=AsteriskRequiredRule,
-            per_file_excluded_rules={"*/common/**/*.py": ["PBR001"]},
-        )
-        is True
+
+def test_execution_plan_rules_for_file_multiple_patterns_matched():
+    plan = compile_execution_plan(
+        configuration={"per-file-excludes": {"*.py": ["PBR001"], "*/scripts/*": ["PBR002"]}},
+        rules=(AsteriskRequiredRule, ReturnStatementRequiresTypeHintRule),
     )
 
+    assert plan.rules_for_file(filename="app/scripts/run.py") == ()
 
-def test_is_rule_excluded_active_rule_ids_recognises_custom_rule():
-    """A rule ID in active_rule_ids must not trigger the Invalid rule warning."""
-    with mock.patch.object(warnings, "warn") as mocked_warn:
-        result = is_rule_excluded(
-            rule_class=AsteriskRequiredRule,
-            excluded_rules=["TST001"],
-            active_rule_ids={"PBR001", "TST001"},
-        )
-    mocked_warn.assert_not_called()
-    assert result is False
 
+def test_execution_plan_rules_for_file_respects_applicability():
+    plan = compile_execution_plan(configuration={}, rules=(AsteriskRequiredRule, NoLoopsInTestsRule))
 
-def test_is_rule_excluded_active_rule_ids_warns_on_unknown_id():
-    with mock.patch.object(warnings, "warn") as mocked_warn:
-        is_rule_excluded(
-            rule_class=AsteriskRequiredRule,
-            excluded_rules=["UNK999"],
-            active_rule_ids={"PBR001", "TST001"},
-        )
-    mocked_warn.assert_called_once()
+    assert plan.rules_for_file(filename="app/tests/test_models.py") == (AsteriskRequiredRule, NoLoopsInTestsRule)
+    assert plan.rules_for_file(filename="app/models.py") == (AsteriskRequiredRule,)
 
 
-def test_is_rule_excluded_per_file_passes_active_rule_ids_through():
-    """The per-file check must thread active_rule_ids into is_rule_excluded."""
-    with mock.patch.object(warnings, "warn") as mocked_warn:
-        result = is_rule_excluded_per_file(
-            filename="apps/file.py",
-            rule_class=AsteriskRequiredRule,
-            per_file_excluded_rules={"*.py": ["TST001"]},
-            active_rule_ids={"PBR001", "TST001"},
-        )
-    mocked_warn.assert_not_called()
-    assert result is False
+def test_execution_plan_rules_for_file_cached_per_matched_patterns():
+    plan = compile_execution_plan(
+        configuration={"per-file-excludes": {"*/scripts/*.py": ["PBR001"]}},
+        rules=(AsteriskRequiredRule, ReturnStatementRequiresTypeHintRule),
+    )
+
+    plan.rules_for_file(filename="app/scripts/one.py")
+    plan.rules_for_file(filename="app/scripts/two.py")
+    plan.rules_for_file(filename="app/models.py")
+
+    assert len(plan._rules_by_matched_patterns) == 2  # noqa: PLR2004
+
+
+def test_execution_plan_rules_for_file_excluded_paths(tmp_path):
+    plan = compile_execution_plan(
+        configuration={"exclude-paths": ["**/migrations"]},
+        rules=(AsteriskRequiredRule,),
+        config_anchor_dir=tmp_path,
+    )
+
+    assert plan.rules_for_file(filename=str(tmp_path / "app" / "migrations" / "0001_initial.py")) == ()
+    assert plan.rules_for_file(filename=str(tmp_path / "app" / "models.py")) == (AsteriskRequiredRule,)
+
+
+def test_execution_plan_rules_for_file_included_paths(tmp_path):
+    plan = compile_execution_plan(
+        configuration={"include-paths": ["src"]}, rules=(AsteriskRequiredRule,), config_anchor_dir=tmp_path
+    )
+
+    assert plan.rules_for_file(filename=str(tmp_path / "src" / "module.py")) == (AsteriskRequiredRule,)
+    assert plan.rules_for_file(filename=str(tmp_path / "scripts" / "module.py")) == ()
@@ -1,12 +1,26 @@
+import ast
+import importlib
+import io
+import re
 import sys
 from pathlib import Path
 
 import pytest
 
-from boa_restrictor.cli.custom_rules import load_custom_rules, validate_unique_rule_ids
+from boa_restrictor.cli.custom_rules import (
+    LazyCustomRule,
+    get_custom_rule_source_files,
+    load_custom_rules,
+    load_plugin_rules,
+    validate_unique_rule_ids,
+)
+from boa_restrictor.cli.output import SarifOutputWriter
+from boa_restrictor.cli.plugins import RuleEntryPoint
+from boa_restrictor.cli.rule_signatures import RuleSignatureFile
 from boa_restrictor.exceptions.custom_rules import (
     CustomRuleConfigurationError,
     CustomRuleImportError,
+    CustomRuleMetadataMismatchError,
     CustomRuleValidationError,
     DuplicateRuleIdError,
 )
@@ -345,3 +359,292 @@ def test_validate_unique_rule_ids_groups_triple_clash_on_one_line():
     assert "SampleCustomRule" in clash_lines[0]
     assert "RuleClashingWithSample" in clash_lines[0]
     assert "ThirdRuleClashingWithSample" in clash_lines[0]
+
+
+LAZY_RULE_SOURCE = """
+from boa_restrictor.common.rule import Rule
+from boa_restrictor.projections.occurrence import Occurrence
+
+
+class LazyRule(Rule):
+    RULE_ID = "{rule_id}"
+    RULE_LABEL = "Lazily imported rule."
+    TRIGGER_KEYWORDS = ("lazy",)
+
+    def check(self) -> list[Occurrence]:
+        return [
+            Occurrence(
+                rule_id=self.RULE_ID,
+                rule_label=self.RULE_LABEL,
+                filename=self.filename,
+                file_path=self.file_path,
+                identifier=None,
+                line_number=1,
+            )
+        ]
+"""
+
+
+@pytest.fixture
+def lazy_rule_module(tmp_path):
+    """
+    Write a rule module which isn't imported by anything else and forget it afterward.
+    """
+    module_name = f"lazy_rule_module_{tmp_path.name}"
+    (tmp_path / f"{module_name}.py").write_text(LAZY_RULE_SOURCE.format(rule_id="LZY001"))
+    importlib.invalidate_caches()
+    yield module_name
+    sys.modules.pop(module_name, None)
+
+
+def test_load_custom_rules_declared_rule_not_imported(tmp_path, lazy_rule_module):
+    (rule,) = load_custom_rules(
+        paths=[{"path": f"{lazy_rule_module}.LazyRule", "rule_id": "LZY001"}],
+        anchor_dir=tmp_path,
+    )
+
+    assert issubclass(rule, LazyCustomRule)
+    assert rule.RULE_ID == "LZY001"
+    assert f"{rule.__module__}.{rule.__qualname__}" == f"{lazy_rule_module}.LazyRule"
+    assert lazy_rule_module not in sys.modules
+
+
+def test_load_custom_rules_declared_rule_applicability_without_import(tmp_path, lazy_rule_module):
+    (rule,) = load_custom_rules(
+        paths=[{"path": f"{lazy_rule_module}.LazyRule", "rule_id": "LZY001", "include-paths": ["models/*.py"]}],
+        anchor_dir=tmp_path,
+    )
+
+    assert rule.is_applicable(file_path=tmp_path / "models" / "user.py") is True
+    assert rule.is_applicable(file_path=tmp_path / "views" / "user.py") is False
+    assert rule.run_check(file_path=tmp_path / "views" / "user.py", source_tree=ast.parse("")) == []
+    assert lazy_rule_module not in sys.modules
+
+
+def test_load_custom_rules_declared_rule_imported_on_first_check(tmp_path, lazy_rule_module):
+    (rule,) = load_custom_rules(
+        paths=[{"path": f"{lazy_rule_module}.LazyRule", "rule_id": "LZY001"}],
+        anchor_dir=tmp_path,
+    )
+
+    occurrences = rule.run_check(file_path=tmp_path / "module.py", source_tree=ast.parse(""))
+
+    assert [occurrence.rule_id for occurrence in occurrences] == ["LZY001"]
+    assert rule.load() is sys.modules[lazy_rule_module].LazyRule
+    assert rule.RULE_LABEL == "Lazily imported rule."
+
+
+def test_load_custom_rules_declared_rule_id_mismatch(tmp_path, lazy_rule_module):
+    (rule,) = load_custom_rules(
+        paths=[{"path": f"{lazy_rule_module}.LazyRule", "rule_id": "LZY002"}],
+        anchor_dir=tmp_path,
+    )
+
+    with pytest.raises(CustomRuleMetadataMismatchError, match=r'declared with rule_id "LZY002"'):
+        rule.load()
+
+
+def test_load_custom_rules_declared_rule_signature_mismatch_detected_without_import(tmp_path, lazy_rule_module):
+    signature_file = RuleSignatureFile(cache_dir=tmp_path / "cache")
+    (rule,) = load_custom_rules(
+        paths=[{"path": f"{lazy_rule_module}.LazyRule", "rule_id": "LZY001"}],
+        anchor_dir=tmp_path,
+        signature_file=signature_file,
+    )
+    rule.load()
+    sys.modules.pop(lazy_rule_module)
+
+    with pytest.raises(CustomRuleMetadataMismatchError, match=r'the class sets "LZY001"'):
+        load_custom_rules(
+            paths=[{"path": f"{lazy_rule_module}.LazyRule", "rule_id": "LZY002"}],
+            anchor_dir=tmp_path,
+            signature_file=RuleSignatureFile(cache_dir=tmp_path / "cache"),
+        )
+
+    assert lazy_rule_module not in sys.modules
+
+
+def test_load_custom_rules_declared_label_and_trigger_keywords_without_import(tmp_path, lazy_rule_module):
+    (rule,) = load_custom_rules(
+        paths=[
+            {
+                "path": f"{lazy_rule_module}.LazyRule",
+                "rule_id": "LZY001",
+                "label": "Lazily imported rule.",
+                "trigger_keywords": ["lazy"],
+            }
+        ],
+        anchor_dir=tmp_path,
+    )
+
+    assert rule.RULE_LABEL == "Lazily imported rule."
+    assert rule.TRIGGER_KEYWORDS == ("lazy",)
+    assert lazy_rule_module not in sys.modules
+
+
+def test_load_custom_rules_declared_label_described_in_sarif_without_import(tmp_path, lazy_rule_module):
+    rules = load_custom_rules(
+        paths=[{"path": f"{lazy_rule_module}.LazyRule", "rule_id": "LZY001", "label": "Lazily imported rule."}],
+        anchor_dir=tmp_path,
+    )
+
+    header = SarifOutputWriter(stream=io.StringIO(), rules=rules).format_header()
+
+    assert '"shortDescription": {"text": "Lazily imported rule."}' in header
+    assert lazy_rule_module not in sys.modules
+
+
+def test_load_custom_rules_declared_without_trigger_keywords_runs_on_every_file(tmp_path, lazy_rule_module):
+    (rule,) = load_custom_rules(
+        paths=[{"path": f"{lazy_rule_module}.LazyRule", "rule_id": "LZY001"}],
+        anchor_dir=tmp_path,
+    )
+
+    assert rule.TRIGGER_KEYWORDS == ()
+    assert lazy_rule_module not in sys.modules
+
+
+@pytest.mark.parametrize(
+    ("declared_metadata", "message"),
+    [
+        ({"label": "Other label."}, 'declared with label "Other label."'),
+        (
+            {"trigger_keywords": ["other"]},
+            'declared with trigger_keywords ["other"] in custom_rules, but the class sets ["lazy"]',
+        ),
+    ],
+)
+def test_load_custom_rules_declared_metadata_mismatch(tmp_path, lazy_rule_module, declared_metadata, message):
+    (rule,) = load_custom_rules(
+        paths=[{"path": f"{lazy_rule_module}.LazyRule", "rule_id": "LZY001", **declared_metadata}],
+        anchor_dir=tmp_path,
+    )
+
+    with pytest.raises(CustomRuleMetadataMismatchError, match=re.escape(message)):
+        rule.load()
+
+
+def test_load_custom_rules_declared_trigger_keywords_signature_mismatch_detected_without_import(
+    tmp_path, lazy_rule_module
+):
+    (rule,) = load_custom_rules(
+        paths=[{"path": f"{lazy_rule_module}.LazyRule", "rule_id": "LZY001"}],
+        anchor_dir=tmp_path,
+        signature_file=RuleSignatureFile(cache_dir=tmp_path / "cache"),
+    )
+    rule.load()
+    sys.modules.pop(lazy_rule_module)
+
+    with pytest.raises(CustomRuleMetadataMismatchError, match=r"declared with trigger_keywords"):
+        load_custom_rules(
+            paths=[{"path": f"{lazy_rule_module}.LazyRule", "rule_id": "LZY001", "trigger_keywords": ["other"]}],
+            anchor_dir=tmp_path,
+            signature_file=RuleSignatureFile(cache_dir=tmp_path / "cache"),
+        )
+
+    assert lazy_rule_module not in sys.modules
+
+
+def test_load_custom_rules_declared_rule_signature_ignored_if_source_changed(tmp_path, lazy_rule_module):
+    (rule,) = load_custom_rules(
+        paths=[{"path": f"{lazy_rule_module}.LazyRule", "rule_id": "LZY001"}],
+        anchor_dir=tmp_path,
+        signature_file=RuleSignatureFile(cache_dir=tmp_path / "cache"),
+    )
+    rule.load()
+    sys.modules.pop(lazy_rule_module)
+    (tmp_path / f"{lazy_rule_module}.py").write_text(LAZY_RULE_SOURCE.format(rule_id="LZY002"))
+
+    (rule,) = load_custom_rules(
+        paths=[{"path": f"{lazy_rule_module}.LazyRule", "rule_id": "LZY002"}],
+        anchor_dir=tmp_path,
+        signature_file=RuleSignatureFile(cache_dir=tmp_path / "cache"),
+    )
+
+    assert rule.load().RULE_ID == "LZY002"
+
+
+@pytest.mark.parametrize(
+    ("declaration", "expected_error", "message"),
+    [
+        ({"path": "myproject.MyRule", "rule_id": "MYP001", "applies": []}, CustomRuleConfigurationError, "unknown"),
+        ({"rule_id": "MYP001"}, CustomRuleConfigurationError, '"path" must be a string'),
+        ({"path": "myproject.MyRule"}, CustomRuleConfigurationError, '"rule_id" is required'),
+        ({"path": "MyRule", "rule_id": "MYP001"}, CustomRuleImportError, "Expected a dotted path"),
+        ({"path": "myproject.MyRule", "rule_id": 1}, CustomRuleValidationError, "non-string RULE_ID"),
+        ({"path": "myproject.MyRule", "rule_id": "myp001"}, CustomRuleValidationError, "malformed RULE_ID"),
+        ({"path": "myproject.MyRule", "rule_id": "PBR999"}, CustomRuleValidationError, "reserved RULE_ID prefix"),
+        (
+            {"path": "myproject.MyRule", "rule_id": "MYP001", "include-paths": "*.py"},
+            CustomRuleConfigurationError,
+            '"include-paths" must be a list',
+        ),
+        (
+            {"path": "myproject.MyRule", "rule_id": "MYP001", "label": ""},
+            CustomRuleConfigurationError,
+            '"label" must be a non-empty string',
+        ),
+        (
+            {"path": "myproject.MyRule", "rule_id": "MYP001", "trigger_keywords": "foo"},
+            CustomRuleConfigurationError,
+            '"trigger_keywords" must be a list',
+        ),
+    ],
+)
+def test_load_custom_rules_invalid_declaration(declaration, expected_error, message):
+    with pytest.raises(expected_error, match=re.escape(message)):
+        load_custom_rules(paths=[declaration], anchor_dir=Path.cwd())
+
+
+def test_load_custom_rules_declared_and_dotted_path_duplicate():
+    with pytest.raises(CustomRuleConfigurationError, match=r"Duplicate entry"):
+        load_custom_rules(
+            paths=[
+                f"{FIXTURE_MODULE}.SampleCustomRule",
+                {"path": f"{FIXTURE_MODULE}.SampleCustomRule", "rule_id": "TST001"},
+            ],
+            anchor_dir=Path.cwd(),
+        )
+
+
+def test_get_custom_rule_source_files_declared_rule_not_imported(tmp_path, lazy_rule_module):
+    rules = load_custom_rules(
+        paths=[{"path": f"{lazy_rule_module}.LazyRule", "rule_id": "LZY001"}],
+        anchor_dir=tmp_path,
+    )
+
+    assert get_custom_rule_source_files(rules=rules) == {"LZY001": str(tmp_path / f"{lazy_rule_module}.py")}
+    assert lazy_rule_module not in sys.modules
+
+
+def test_load_plugin_rules():
+    rules = load_plugin_rules(
+        rule_entry_points=[
+            RuleEntryPoint(name="TST001", value=f"{FIXTURE_MODULE}:SampleCustomRule", distribution_name="tests"),
+            RuleEntryPoint(name="TST002", value=f"{FIXTURE_MODULE}:AnotherCustomRule", distribution_name="tests"),
+        ]
+    )
+
+    assert rules == (SampleCustomRule, AnotherCustomRule)
+
+
+@pytest.mark.parametrize("value", [FIXTURE_MODULE, f"{FIXTURE_MODULE}:", ":SampleCustomRule"])
+def test_load_plugin_rules_invalid_entry_point(value):
+    with pytest.raises(CustomRuleImportError, match=r'Expected a reference of the form "module:ClassName"'):
+        load_plugin_rules(rule_entry_points=[RuleEntryPoint(name="TST001", value=value, distribution_name="tests")])
+
+
+def test_load_plugin_rules_validated_like_custom_rules():
+    with pytest.raises(CustomRuleValidationError, match=r"reserved RULE_ID prefix"):
+        load_plugin_rules(
+            rule_entry_points=[
+                RuleEntryPoint(name="PBR999", value=f"{FIXTURE_MODULE}:RuleWithReservedPrefix", distribution_name="x")
+            ]
+        )
+
+
+def test_load_plugin_rules_module_not_found():
+    with pytest.raises(CustomRuleImportError, match=r"Could not import module \"nonexistent_pkg\""):
+        load_plugin_rules(
+            rule_entry_points=[RuleEntryPoint(name="TST001", value="nonexistent_pkg:SomeRule", distribution_name="x")]
+        )
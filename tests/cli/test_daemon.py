@@ -0,0 +1,245 @@
+import os
+import socket
+import stat
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from boa_restrictor.cli import daemon
+from boa_restrictor.cli.client import request_daemon
+from boa_restrictor.cli.daemon import DaemonState, ensure_socket_dir, handle_request, serve
+from boa_restrictor.exceptions.daemon import DaemonAlreadyRunningError, InsecureSocketDirectoryError
+
+# Old enough to not be considered racily modified
+OLD_MTIME_NS = 1_000_000_000_000_000_000
+
+SOURCE_CODE_WITH_OCCURRENCE = "def function(a):\n    return a\n"
+
+
+@pytest.fixture
+def project_dir(tmp_path, monkeypatch):
+    (tmp_path / "pyproject.toml").write_text('[tool.boa-restrictor]\nexclude = ["PBR002"]\n')
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def _write_file(*, path: Path, content: str) -> None:
+    path.write_text(content)
+    os.utime(path, ns=(OLD_MTIME_NS, OLD_MTIME_NS))
+
+
+def _build_request(*, project_dir: Path, filenames: list[str]) -> dict:
+    return {"cwd": str(project_dir), "config": str(project_dir / "pyproject.toml"), "filenames": filenames}
+
+
+def test_daemon_state_lint(project_dir):
+    _write_file(path=project_dir / "module.py", content=SOURCE_CODE_WITH_OCCURRENCE)
+    state = DaemonState(config_path="pyproject.toml")
+
+    occurrences = state.lint(filenames=["module.py"])
+
+    assert [(occurrence.rule_id, occurrence.line_number) for occurrence in occurrences] == [("PBR001", 1)]
+
+
+def test_daemon_state_unchanged_files_not_linted_again(project_dir):
+    _write_file(path=project_dir / "module.py", content=SOURCE_CODE_WITH_OCCURRENCE)
+    state = DaemonState(config_path="pyproject.toml")
+    occurrences = state.lint(filenames=["module.py"])
+
+    with mock.patch.object(daemon, "lint_file") as mocked_lint_file:
+        assert state.lint(filenames=["module.py"]) == occurrences
+
+    mocked_lint_file.assert_not_called()
+
+
+def test_daemon_state_changed_files_linted_again(project_dir):
+    _write_file(path=project_dir / "module.py", content=SOURCE_CODE_WITH_OCCURRENCE)
+    state = DaemonState(config_path="pyproject.toml")
+    state.lint(filenames=["module.py"])
+
+    _write_file(path=project_dir / "module.py", content="x = 1\n")
+
+    assert list(state.lint(filenames=["module.py"])) == []
+
+
+def test_daemon_state_warm_results_bounded(project_dir):
+    for index in range(3):
+        _write_file(path=project_dir / f"module_{index}.py", content="x = 1\n")
+    state = DaemonState(config_path="pyproject.toml")
+
+    with mock.patch.object(daemon, "MAX_WARM_RESULTS", 2):
+        state.lint(filenames=["module_0.py", "module_1.py", "module_2.py"])
+
+    assert list(state._warm_results) == ["module_1.py", "module_2.py"]
+
+
+def test_daemon_state_reloads_changed_configuration(project_dir):
+    _write_file(path=project_dir / "module.py", content=SOURCE_CODE_WITH_OCCURRENCE)
+    state = DaemonState(config_path="pyproject.toml")
+    state.lint(filenames=["module.py"])
+
+    (project_dir / "pyproject.toml").write_text('[tool.boa-restrictor]\nexclude = ["PBR001", "PBR002"]\n')
+    state.reload_if_changed()
+
+    assert list(state.lint(filenames=["module.py"])) == []
+
+
+def test_daemon_state_no_reload_if_unchanged(project_dir):
+    state = DaemonState(config_path="pyproject.toml")
+
+    with mock.patch.object(DaemonState, "reload") as mocked_reload:
+        state.reload_if_changed()
+
+    mocked_reload.assert_not_called()
+
+
+def test_daemon_state_reloads_changed_custom_rule_module(project_dir, monkeypatch):
+    # Loading custom rules puts the project on the path
+    monkeypatch.setattr(sys, "path", [*sys.path])
+    (project_dir / "pyproject.toml").write_text(
+        '[tool.boa-restrictor]\ncustom_rules = ["daemon_test_rules.ModuleRule"]\n'
+    )
+    rule_module_path = project_dir / "daemon_test_rules.py"
+    rule_module_template = (
+        "from boa_restrictor.common.rule import Rule\n\n\n"
+        "class ModuleRule(Rule):\n"
+        '    RULE_ID = "TST100"\n'
+        '    RULE_LABEL = "{label}"\n\n'
+        "    def check(self):\n"
+        "        return [self._build_occurrence(line_number=1)]\n"
+    )
+    _write_file(path=rule_module_path, content=rule_module_template.format(label="Old label"))
+    _write_file(path=project_dir / "module.py", content="x = 1\n")
+    state = DaemonState(config_path="pyproject.toml")
+    assert state.lint(filenames=["module.py"])[-1].rule_label == "Old label"
+
+    rule_module_path.write_text(rule_module_template.format(label="New label"))
+    state.reload_if_changed()
+
+    assert state.lint(filenames=["module.py"])[-1].rule_label == "New label"
+    sys.modules.pop("daemon_test_rules")
+
+
+def test_handle_request_output(project_dir):
+    _write_file(path=project_dir / "module.py", content=SOURCE_CODE_WITH_OCCURRENCE)
+    state = DaemonState(config_path="pyproject.toml")
+
+    response = handle_request(state=state, request=_build_request(project_dir=project_dir, filenames=["module.py"]))
+
+    assert response["has_occurrences"] is True
+    assert response["output"].startswith('"module.py:1": (PBR001)')
+
+
+def test_handle_request_different_working_directory(project_dir):
+    state = DaemonState(config_path="pyproject.toml")
+
+    response = handle_request(
+        state=state, request=_build_request(project_dir=project_dir / "other", filenames=["module.py"])
+    )
+
+    assert "error" in response
+
+
+def test_handle_request_errors_returned(project_dir):
+    _write_file(path=project_dir / "module.py", content="def broken(:\n")
+    state = DaemonState(config_path="pyproject.toml")
+
+    response = handle_request(state=state, request=_build_request(project_dir=project_dir, filenames=["module.py"]))
+
+    assert response["error"].startswith("BoaRestrictorParsingError")
+
+
+def test_serve_and_request(project_dir):
+    _write_file(path=project_dir / "module.py", content=SOURCE_CODE_WITH_OCCURRENCE)
+    state = DaemonState(config_path="pyproject.toml")
+    # Unix socket paths are limited in length, so don't use pytest's (long) temporary directory
+    socket_path = os.path.join(tempfile.mkdtemp(), "daemon.sock")
+    server_thread = threading.Thread(
+        target=serve, kwargs={"state": state, "socket_path": socket_path, "idle_timeout": 1}
+    )
+    server_thread.start()
+    try:
+        for _ in range(100):
+            if os.path.exists(socket_path):
+                break
+            threading.Event().wait(0.01)
+
+        response = request_daemon(
+            socket_path=socket_path, request=_build_request(project_dir=project_dir, filenames=["module.py"])
+        )
+    finally:
+        server_thread.join()
+
+    assert response["has_occurrences"] is True
+    assert not os.path.exists(socket_path)
+
+
+def test_serve_daemon_already_running(project_dir):
+    state = DaemonState(config_path="pyproject.toml")
+    socket_path = os.path.join(tempfile.mkdtemp(), "daemon.sock")
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as listening_socket:
+        listening_socket.bind(socket_path)
+        listening_socket.listen()
+        with pytest.raises(DaemonAlreadyRunningError):
+            serve(state=state, socket_path=socket_path, idle_timeout=0)
+
+
+def test_serve_stale_socket_removed(project_dir):
+    state = DaemonState(config_path="pyproject.toml")
+    socket_path = os.path.join(tempfile.mkdtemp(), "daemon.sock")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stale_socket:
+        stale_socket.bind(socket_path)
+
+    serve(state=state, socket_path=socket_path, idle_timeout=0)
+
+    assert not os.path.exists(socket_path)
+
+
+def test_ensure_socket_dir_created_private(tmp_path):
+    socket_dir = tmp_path / "sockets"
+
+    ensure_socket_dir(str(socket_dir))
+
+    assert stat.S_IMODE(socket_dir.stat().st_mode) == stat.S_IRWXU
+
+
+def test_ensure_socket_dir_existing_private_dir_accepted(tmp_path):
+    socket_dir = tmp_path / "sockets"
+    socket_dir.mkdir(mode=0o700)
+
+    ensure_socket_dir(str(socket_dir))
+
+
+def test_ensure_socket_dir_accessible_by_others(tmp_path):
+    socket_dir = tmp_path / "sockets"
+    socket_dir.mkdir()
+    socket_dir.chmod(0o777)
+
+    with pytest.raises(InsecureSocketDirectoryError):
+        ensure_socket_dir(str(socket_dir))
+
+
+def test_ensure_socket_dir_symlink(tmp_path):
+    target_dir = tmp_path / "target"
+    target_dir.mkdir(mode=0o700)
+    socket_dir = tmp_path / "sockets"
+    socket_dir.symlink_to(target_dir)
+
+    with pytest.raises(InsecureSocketDirectoryError):
+        ensure_socket_dir(str(socket_dir))
+
+
+def test_ensure_socket_dir_owned_by_other_user(tmp_path):
+    socket_dir = tmp_path / "sockets"
+    socket_dir.mkdir(mode=0o700)
+
+    with (
+        mock.patch.object(daemon.os, "getuid", return_value=os.getuid() + 1),
+        pytest.raises(InsecureSocketDirectoryError),
+    ):
+        ensure_socket_dir(str(socket_dir))
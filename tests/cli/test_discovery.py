@@ -0,0 +1,163 @@
+import os
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from boa_restrictor.cli.discovery import compile_gitignore_pattern, find_python_files
+from boa_restrictor.cli.path_filter import PathFilter, RelativePathResolver
+
+
+def _touch(path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("x = 1\n")
+
+
+@pytest.mark.parametrize(
+    ("pattern", "path", "is_directory", "is_matching"),
+    [
+        ("build", "build", True, True),
+        ("build", "src/build", True, True),
+        ("build/", "src/build", True, True),
+        ("build/", "build", False, False),
+        ("/build", "build", True, True),
+        ("/build", "src/build", True, False),
+        ("src/build", "src/build", True, True),
+        ("src/build", "app/src/build", True, False),
+        ("*.py", "src/module.py", False, True),
+        ("src/*.py", "src/package/module.py", False, False),
+        ("**/migrations", "app/migrations", True, True),
+        ("**/migrations", "migrations", True, True),
+        ("src/**/generated", "src/a/b/generated", True, True),
+        ("src/**/generated", "src/generated", True, True),
+        ("vendor/**", "vendor/package/module.py", False, True),
+        ("module_?.py", "module_1.py", False, True),
+        ("module_[0-4].py", "module_5.py", False, False),
+        ("module_[!0-4].py", "module_5.py", False, True),
+        ("\\#file.py", "#file.py", False, True),
+    ],
+)
+def test_compile_gitignore_pattern(pattern, path, is_directory, is_matching):
+    gitignore_pattern = compile_gitignore_pattern(pattern)
+
+    assert (
+        not (gitignore_pattern.is_directory_only and not is_directory)
+        and gitignore_pattern.regex.fullmatch(path) is not None
+    ) is is_matching
+
+
+@pytest.mark.parametrize("line", ["", "   ", "# comment", "/"])
+def test_compile_gitignore_pattern_without_pattern(line):
+    assert compile_gitignore_pattern(line) is None
+
+
+def test_compile_gitignore_pattern_negated():
+    assert compile_gitignore_pattern("!important.py").is_negated is True
+
+
+def test_find_python_files_recursive_and_sorted(tmp_path):
+    _touch(tmp_path / "b.py")
+    _touch(tmp_path / "a" / "module.py")
+    _touch(tmp_path / "a.py")
+    _touch(tmp_path / "README.md")
+
+    assert list(find_python_files(paths=[str(tmp_path)])) == [
+        str(tmp_path / "a.py"),
+        str(tmp_path / "b.py"),
+        str(tmp_path / "a" / "module.py"),
+    ]
+
+
+def test_find_python_files_skipped_directories(tmp_path):
+    for directory_name in (".git", "node_modules", ".venv", "__pycache__"):
+        _touch(tmp_path / directory_name / "module.py")
+    _touch(tmp_path / "module.py")
+
+    assert list(find_python_files(paths=[str(tmp_path)])) == [str(tmp_path / "module.py")]
+
+
+def test_find_python_files_gitignore(tmp_path):
+    (tmp_path / ".gitignore").write_text("build/\n*_pb2.py\n!keep_pb2.py\n")
+    (tmp_path / "package").mkdir()
+    (tmp_path / "package" / ".gitignore").write_text("/local.py\n")
+    _touch(tmp_path / "build" / "module.py")
+    _touch(tmp_path / "service_pb2.py")
+    _touch(tmp_path / "keep_pb2.py")
+    _touch(tmp_path / "local.py")
+    _touch(tmp_path / "package" / "local.py")
+    _touch(tmp_path / "package" / "module.py")
+
+    assert list(find_python_files(paths=[str(tmp_path)])) == [
+        str(tmp_path / "keep_pb2.py"),
+        str(tmp_path / "local.py"),
+        str(tmp_path / "package" / "module.py"),
+    ]
+
+
+def test_find_python_files_gitignore_of_parent_directory_within_repository(tmp_path):
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".gitignore").write_text("src/generated/\n")
+    _touch(tmp_path / "src" / "generated" / "module.py")
+    _touch(tmp_path / "src" / "module.py")
+
+    assert list(find_python_files(paths=[str(tmp_path / "src")])) == [str(tmp_path / "src" / "module.py")]
+
+
+def test_find_python_files_explicit_files_always_yielded(tmp_path):
+    (tmp_path / ".gitignore").write_text("*.py\n")
+    _touch(tmp_path / "module.py")
+
+    assert list(find_python_files(paths=[str(tmp_path / "module.py"), "missing.py"])) == [
+        str(tmp_path / "module.py"),
+        "missing.py",
+    ]
+
+
+def test_find_python_files_symlinks_yielded_once(tmp_path):
+    _touch(tmp_path / "module.py")
+    (tmp_path / "link.py").symlink_to(tmp_path / "module.py")
+    (tmp_path / "linked_directory").symlink_to(tmp_path, target_is_directory=True)
+
+    assert list(find_python_files(paths=[str(tmp_path), str(tmp_path / "module.py")])) == [str(tmp_path / "link.py")]
+
+
+def test_find_python_files_relative_paths(tmp_path, monkeypatch):
+    _touch(tmp_path / "src" / "module.py")
+    monkeypatch.chdir(tmp_path)
+
+    assert list(find_python_files(paths=["."])) == [os.path.join("src", "module.py")]
+
+
+def test_find_python_files_lazy(tmp_path):
+    _touch(tmp_path / "a" / "module.py")
+    _touch(tmp_path / "b" / "module.py")
+    python_files = find_python_files(paths=[str(tmp_path)])
+
+    assert next(python_files) == str(tmp_path / "a" / "module.py")
+    (tmp_path / "b" / "module.py").unlink()
+    assert list(python_files) == []
+
+
+def test_find_python_files_excluded_directories_not_searched(tmp_path):
+    _touch(tmp_path / "app" / "migrations" / "0001_initial.py")
+    _touch(tmp_path / "app" / "models.py")
+    path_filter = PathFilter(
+        relative_path_resolver=RelativePathResolver(anchor_dir=tmp_path), exclude_paths=["**/migrations"]
+    )
+
+    with mock.patch("os.scandir", wraps=os.scandir) as mocked_scandir:
+        python_files = list(find_python_files(paths=[str(tmp_path)], path_filter=path_filter))
+
+    assert python_files == [str(tmp_path / "app" / "models.py")]
+    assert str(tmp_path / "app" / "migrations") not in [call.args[0] for call in mocked_scandir.call_args_list]
+
+
+def test_find_python_files_visited_directories(tmp_path):
+    _touch(tmp_path / "app" / "models.py")
+    _touch(tmp_path / "node_modules" / "package.py")
+    (tmp_path / "docs").mkdir()
+    visited_directories = []
+
+    list(find_python_files(paths=[str(tmp_path)], visited_directories=visited_directories))
+
+    assert visited_directories == [str(tmp_path), str(tmp_path / "app"), str(tmp_path / "docs")]
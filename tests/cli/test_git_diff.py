@@ -0,0 +1,162 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from boa_restrictor.cli.git_diff import (
+    filter_occurrences_on_changed_lines,
+    get_changed_files,
+    get_changed_lines,
+    parse_changed_lines,
+    select_changed_filenames,
+)
+from boa_restrictor.exceptions.git_diff import GitCommandError
+from boa_restrictor.projections.occurrence import Occurrence
+
+
+def _git(*arguments: str) -> None:
+    subprocess.run(
+        ["git", "-c", "user.name=Test", "-c", "user.email=test@example.com", *arguments],
+        check=True,
+        capture_output=True,
+    )
+
+
+@pytest.fixture
+def git_repository(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    _git("init", "--quiet")
+    (tmp_path / "unchanged.py").write_text("x = 1\n")
+    (tmp_path / "changed.py").write_text("a = 1\nb = 2\nc = 3\n")
+    (tmp_path / "deleted.py").write_text("x = 1\n")
+    _git("add", ".")
+    _git("commit", "--quiet", "-m", "Initial commit")
+    return tmp_path
+
+
+def _build_occurrence(*, filename: str, line_number: int) -> Occurrence:
+    return Occurrence(
+        rule_id="PBR001",
+        rule_label="Label",
+        filename=filename,
+        file_path=Path(filename),
+        identifier=None,
+        line_number=line_number,
+    )
+
+
+def test_get_changed_files(git_repository):
+    (git_repository / "changed.py").write_text("a = 1\nb = 20\nc = 3\n")
+    (git_repository / "deleted.py").unlink()
+    (git_repository / "README.md").write_text("Not Python\n")
+    _git("add", "README.md")
+
+    assert get_changed_files(ref="HEAD") == ["changed.py"]
+
+
+def test_get_changed_files_untracked(git_repository):
+    (git_repository / "new.py").write_text("x = 1\n")
+    (git_repository / "ignored.py").write_text("x = 1\n")
+    (git_repository / ".gitignore").write_text("ignored.py\n")
+
+    assert get_changed_files(ref="HEAD") == ["new.py"]
+
+
+def test_get_changed_files_relative_to_working_directory(git_repository, monkeypatch):
+    (git_repository / "package").mkdir()
+    (git_repository / "package" / "module.py").write_text("x = 1\n")
+    _git("add", "package")
+    (git_repository / "changed.py").write_text("a = 10\n")
+    monkeypatch.chdir(git_repository / "package")
+
+    assert get_changed_files(ref="HEAD") == ["module.py"]
+
+
+def test_get_changed_files_unknown_ref(git_repository):
+    with pytest.raises(GitCommandError, match=r"failed"):
+        get_changed_files(ref="does-not-exist")
+
+
+def test_get_changed_lines(git_repository):
+    (git_repository / "changed.py").write_text("a = 1\nb = 20\nc = 3\nd = 4\n")
+
+    assert get_changed_lines(ref="HEAD") == {"changed.py": [(2, 2), (4, 4)]}
+
+
+def test_get_changed_lines_untracked(git_repository):
+    (git_repository / "new.py").write_text("x = 1\n")
+
+    assert get_changed_lines(ref="HEAD") == {"new.py": [(1, sys.maxsize)]}
+
+
+def test_get_changed_lines_path_with_spaces(git_repository):
+    (git_repository / "with space.py").write_text("x = 1\n")
+    _git("add", "with space.py")
+    _git("commit", "--quiet", "-m", "Add file with space")
+    (git_repository / "with space.py").write_text("x = 10\n")
+
+    assert get_changed_lines(ref="HEAD") == {"with space.py": [(1, 1)]}
+
+
+def test_parse_changed_lines():
+    diff = (
+        "diff --git module.py module.py\n"
+        "--- module.py\n"
+        "+++ module.py\n"
+        "@@ -10 +10 @@ def function():\n"
+        "-    return 1\n"
+        "+    return 2\n"
+        "@@ -1,0 +2,3 @@\n"
+        "+import os\n"
+        "+import re\n"
+        "+import sys\n"
+        "@@ -20,2 +22,0 @@\n"
+        "-x = 1\n"
+        "-y = 2\n"
+        "diff --git with space.py with space.py\n"
+        "--- with space.py\t\n"
+        "+++ with space.py\t\n"
+        "@@ -3 +3 @@\n"
+        "-x = 1\n"
+        "+x = 2\n"
+        "diff --git removed.py removed.py\n"
+        "--- removed.py\n"
+        "+++ /dev/null\n"
+        "@@ -1 +0,0 @@\n"
+        "-x = 1\n"
+    )
+
+    assert parse_changed_lines(diff=diff) == {"module.py": [(2, 4), (10, 10)], "with space.py": [(3, 3)]}
+
+
+def test_select_changed_filenames(git_repository):
+    (git_repository / "changed.py").write_text("a = 10\n")
+    (git_repository / "deleted.py").unlink()
+
+    assert select_changed_filenames(filenames=["unchanged.py", "./changed.py"], ref="HEAD") == ["./changed.py"]
+
+
+def test_select_changed_filenames_without_filenames(git_repository):
+    (git_repository / "changed.py").write_text("a = 10\n")
+
+    assert select_changed_filenames(filenames=[], ref="HEAD") == ["changed.py"]
+
+
+def test_filter_occurrences_on_changed_lines():
+    occurrences = [
+        _build_occurrence(filename="module.py", line_number=line_number) for line_number in (1, 2, 4, 5, 10, 11)
+    ]
+    occurrences.append(_build_occurrence(filename="./module.py", line_number=3))
+    occurrences.append(_build_occurrence(filename="other.py", line_number=2))
+
+    filtered_occurrences = filter_occurrences_on_changed_lines(
+        occurrences=occurrences, changed_lines={"module.py": [(2, 4), (10, 10)]}
+    )
+
+    assert [(occurrence.filename, occurrence.line_number) for occurrence in filtered_occurrences] == [
+        ("module.py", 2),
+        ("module.py", 4),
+        ("module.py", 10),
+        ("./module.py", 3),
+    ]
@@ -0,0 +1,46 @@
+import re
+
+import pytest
+
+from boa_restrictor.cli.globs import compile_globs, translate_glob
+
+
+@pytest.mark.parametrize(
+    ("pattern", "path", "is_matching"),
+    [
+        ("*.py", "module.py", True),
+        ("*.py", "package/module.py", False),
+        ("src/*.py", "src/module.py", True),
+        ("src/*.py", "src/package/module.py", False),
+        ("**/migrations", "migrations", True),
+        ("**/migrations", "app/sub/migrations", True),
+        ("**/*_pb2.py", "api/v1/service_pb2.py", True),
+        ("src/**/generated", "src/generated", True),
+        ("src/**/generated", "src/a/b/generated", True),
+        ("src/**/generated", "other/generated", False),
+        ("vendor/**", "vendor/package/module.py", True),
+        ("vendor/**", "vendor", False),
+        ("module_?.py", "module_1.py", True),
+        ("module_?.py", "module_/.py", False),
+        ("module_[0-4].py", "module_3.py", True),
+        ("module_[!0-4].py", "module_3.py", False),
+        ("file\\*.py", "file*.py", True),
+        ("file\\*.py", "file1.py", False),
+        ("a+b.py", "a+b.py", True),
+    ],
+)
+def test_translate_glob(pattern, path, is_matching):
+    assert (re.fullmatch(translate_glob(pattern), path) is not None) is is_matching
+
+
+def test_compile_globs_any_pattern_matches():
+    regex = compile_globs(["migrations", "/vendor/", "**/*_pb2.py"])
+
+    assert regex.fullmatch("migrations")
+    assert regex.fullmatch("vendor")
+    assert regex.fullmatch("api/service_pb2.py")
+    assert not regex.fullmatch("app/migrations")
+
+
+def test_compile_globs_without_patterns():
+    assert compile_globs([]) is None
@@ -0,0 +1,122 @@
+import ast
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from boa_restrictor.rules.registry import BOA_RESTRICTOR_RULE_REGISTRY
+
+REPOSITORY_ROOT = Path(__file__).parents[2]
+
+# Upper bounds for importing the CLI from a cold interpreter and for a whole run linting a single file, about twice
+# what they take on a developer machine (around 25ms and 35ms). Importing anything heavy at startup again, like the
+# daemon's "socketserver", "multiprocessing" or "xml" for output formats which weren't chosen, blows them.
+IMPORT_TIME_BUDGET_MICROSECONDS = 50_000
+RUN_TIME_BUDGET_MICROSECONDS = 70_000
+
+# Only needed by some modes or output formats, a plain run mustn't import them
+DEFERRED_MODULES = frozenset(
+    {
+        "boa_restrictor.cli.daemon",
+        "boa_restrictor.cli.lsp",
+        "boa_restrictor.cli.watch",
+        "boa_restrictor.cli.baseline",
+        "boa_restrictor.cli.git_diff",
+        "multiprocessing",
+        "socketserver",
+        "subprocess",
+        "xml.sax.saxutils",
+    }
+)
+
+RULE_PACKAGES = ("boa_restrictor.rules.python.", "boa_restrictor.rules.django.")
+
+
+# Runs the CLI and finally reports its run time, including the import, and the imported rule modules. They can't be
+# taken from the "-X importtime" output, as it doesn't cover modules imported via `importlib.import_module()`.
+_RUN_SCRIPT = """
+import sys
+import time
+start = time.perf_counter_ns()
+from boa_restrictor.cli.main import main
+try:
+    sys.exit(main(argv={argv!r}))
+finally:
+    print((time.perf_counter_ns() - start) // 1000, file=sys.stderr)
+    print(sorted(name for name in sys.modules if name.startswith(RULE_PACKAGES)), file=sys.stderr)
+"""
+
+
+def _run_with_import_times(
+    *, argv: list[str], cwd: Path
+) -> tuple[subprocess.CompletedProcess, dict[str, int], int, set[str]]:
+    # Returns the finished process, the cumulative import time of the modules imported at startup and the run time in
+    # microseconds, and all rule modules imported during the run
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            f"RULE_PACKAGES = {RULE_PACKAGES!r}\n{_RUN_SCRIPT.format(argv=argv)}",
+        ],
+        capture_output=True,
+        cwd=cwd,
+        env={**os.environ, "PYTHONPATH": str(REPOSITORY_ROOT)},
+        text=True,
+        check=False,
+    )
+
+    *import_time_lines, run_time_line, rule_modules_line = result.stderr.splitlines()
+    import_times = {}
+    for line in import_time_lines:
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_time, module_name = line.removeprefix("import time:").split("|")
+        import_times[module_name.strip()] = int(cumulative_time)
+    return result, import_times, int(run_time_line), set(ast.literal_eval(rule_modules_line))
+
+
+def test_import_time_help(tmp_path):
+    result, import_times, _, rule_modules = _run_with_import_times(argv=["--help"], cwd=tmp_path)
+
+    assert result.returncode == 0
+    assert rule_modules == set()
+    assert import_times.keys() & DEFERRED_MODULES == set()
+    assert import_times["boa_restrictor.cli.main"] < IMPORT_TIME_BUDGET_MICROSECONDS
+
+
+def test_import_time_no_rules_apply(tmp_path):
+    excluded_rule_ids = ", ".join(
+        f'"{rule_registration.rule_id}"' for rule_registration in BOA_RESTRICTOR_RULE_REGISTRY
+    )
+    (tmp_path / "pyproject.toml").write_text(
+        f"[tool.boa-restrictor]\nenable_django_rules = false\nexclude = [{excluded_rule_ids}]\n"
+    )
+    (tmp_path / "module.py").write_text("def function(a):\n    return a\n")
+
+    result, import_times, run_time, rule_modules = _run_with_import_times(argv=["module.py"], cwd=tmp_path)
+
+    assert result.returncode == 0
+    assert result.stdout == ""
+    assert rule_modules == set()
+    assert import_times.keys() & DEFERRED_MODULES == set()
+    assert import_times["boa_restrictor.cli.main"] < IMPORT_TIME_BUDGET_MICROSECONDS
+    assert run_time < RUN_TIME_BUDGET_MICROSECONDS
+
+
+def test_import_time_only_enabled_rule_modules_imported(tmp_path):
+    excluded_rule_ids = ", ".join(
+        f'"{rule_registration.rule_id}"'
+        for rule_registration in BOA_RESTRICTOR_RULE_REGISTRY
+        if rule_registration.rule_id != "PBR001"
+    )
+    (tmp_path / "pyproject.toml").write_text(
+        f"[tool.boa-restrictor]\nenable_django_rules = false\nexclude = [{excluded_rule_ids}]\n"
+    )
+    (tmp_path / "module.py").write_text("def function(a):\n    return a\n")
+
+    result, _, _, rule_modules = _run_with_import_times(argv=["module.py"], cwd=tmp_path)
+
+    assert "PBR001" in result.stdout
+    assert rule_modules == {"boa_restrictor.rules.python.asterisk_required"}
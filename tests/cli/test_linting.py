@@ -0,0 +1,485 @@
+import sys
+import warnings
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from boa_restrictor.cli import linting
+from boa_restrictor.cli.cache import ResultCache
+from boa_restrictor.cli.configuration import compile_execution_plan
+from boa_restrictor.cli.linting import WorkerSetup, iter_file_occurrences, lint_file, lint_files, resolve_rules
+from boa_restrictor.cli.path_filter import RelativePathResolver
+from boa_restrictor.cli.plugins import RuleEntryPoint
+from boa_restrictor.cli.rule_signatures import RuleSignatureFile
+from boa_restrictor.exceptions.custom_rules import DuplicateRuleIdError
+from boa_restrictor.exceptions.syntax_errors import BoaRestrictorParsingError
+from boa_restrictor.rules import (
+    BOA_RESTRICTOR_RULES,
+    AsteriskRequiredRule,
+    NoLoopsInTestsRule,
+    ReturnStatementRequiresTypeHintRule,
+)
+from tests.fixtures.custom_rule_module import SampleCustomRule
+
+REPOSITORY_ROOT = Path(__file__).parents[2]
+
+
+def test_resolve_rules_builtin_and_custom_rules():
+    rules = resolve_rules(
+        configuration={"custom_rules": ["tests.fixtures.custom_rule_module.SampleCustomRule"]},
+        config_anchor_dir=REPOSITORY_ROOT,
+    )
+
+    assert AsteriskRequiredRule in rules
+    assert rules[-1] is SampleCustomRule
+
+
+def test_resolve_rules_duplicate_rule_ids():
+    with pytest.raises(DuplicateRuleIdError):
+        resolve_rules(
+            configuration={
+                "custom_rules": [
+                    "tests.fixtures.custom_rule_module.SampleCustomRule",
+                    "tests.fixtures.custom_rule_module.RuleClashingWithSample",
+                ]
+            },
+            config_anchor_dir=REPOSITORY_ROOT,
+        )
+
+
+def test_resolve_rules_plugin_rules(tmp_path):
+    rule_entry_point = RuleEntryPoint(
+        name="TST001", value="tests.fixtures.custom_rule_module:SampleCustomRule", distribution_name="tests"
+    )
+
+    with mock.patch.object(
+        linting, "discover_rule_entry_points", return_value=(rule_entry_point,)
+    ) as mocked_discover_rule_entry_points:
+        rules = resolve_rules(
+            configuration={"enable_django_rules": False}, config_anchor_dir=REPOSITORY_ROOT, cache_dir=tmp_path
+        )
+
+    mocked_discover_rule_entry_points.assert_called_once_with(cache_dir=tmp_path)
+    assert rules == (*BOA_RESTRICTOR_RULES, SampleCustomRule)
+
+
+def test_resolve_rules_plugin_rules_disabled():
+    with mock.patch.object(linting, "discover_rule_entry_points") as mocked_discover_rule_entry_points:
+        rules = resolve_rules(
+            configuration={"enable_django_rules": False, "enable_plugin_rules": False},
+            config_anchor_dir=REPOSITORY_ROOT,
+        )
+
+    mocked_discover_rule_entry_points.assert_not_called()
+    assert rules == BOA_RESTRICTOR_RULES
+
+
+def test_resolve_rules_given_rule_entry_points_not_discovered_again():
+    rule_entry_point = RuleEntryPoint(
+        name="TST001", value="tests.fixtures.custom_rule_module:SampleCustomRule", distribution_name="tests"
+    )
+
+    with mock.patch.object(linting, "discover_rule_entry_points") as mocked_discover_rule_entry_points:
+        rules = resolve_rules(
+            configuration={"enable_django_rules": False},
+            config_anchor_dir=REPOSITORY_ROOT,
+            rule_entry_points=(rule_entry_point,),
+        )
+
+    mocked_discover_rule_entry_points.assert_not_called()
+    assert rules == (*BOA_RESTRICTOR_RULES, SampleCustomRule)
+
+
+def test_resolve_rules_plugin_rule_ids_must_be_unique():
+    rule_entry_point = RuleEntryPoint(
+        name="TST001", value="tests.fixtures.custom_rule_module:SampleCustomRule", distribution_name="tests"
+    )
+
+    with (
+        mock.patch.object(linting, "discover_rule_entry_points", return_value=(rule_entry_point,)),
+        pytest.raises(DuplicateRuleIdError),
+    ):
+        resolve_rules(
+            configuration={"custom_rules": ["tests.fixtures.custom_rule_module.RuleClashingWithSample"]},
+            config_anchor_dir=REPOSITORY_ROOT,
+        )
+
+
+def test_resolve_rules_declared_custom_rule_imported_when_a_file_needs_it(tmp_path):
+    module_name = f"declared_rule_module_{tmp_path.name}"
+    (tmp_path / f"{module_name}.py").write_text(
+        "from boa_restrictor.common.rule import Rule\n\n\n"
+        "class DeclaredRule(Rule):\n"
+        '    RULE_ID = "DCL001"\n'
+        '    RULE_LABEL = "Declared rule."\n\n'
+        "    def check(self):\n"
+        "        return []\n"
+    )
+    for directory in ("models", "views"):
+        (tmp_path / directory).mkdir()
+        (tmp_path / directory / "user.py").write_text("x = 1\n")
+    configuration = {
+        "enable_django_rules": False,
+        "exclude": [rule_class.RULE_ID for rule_class in BOA_RESTRICTOR_RULES],
+        "custom_rules": [{"path": f"{module_name}.DeclaredRule", "rule_id": "DCL001", "include-paths": ["models/*"]}],
+    }
+    execution_plan = compile_execution_plan(
+        configuration=configuration,
+        rules=resolve_rules(configuration=configuration, config_anchor_dir=tmp_path, cache_dir=tmp_path / "cache"),
+        config_anchor_dir=tmp_path,
+    )
+
+    try:
+        lint_file(filename=str(tmp_path / "views" / "user.py"), execution_plan=execution_plan)
+        assert module_name not in sys.modules
+
+        lint_file(filename=str(tmp_path / "models" / "user.py"), execution_plan=execution_plan)
+        assert module_name in sys.modules
+        assert (
+            RuleSignatureFile(cache_dir=tmp_path / "cache")
+            .get_signature(
+                dotted_path=f"{module_name}.DeclaredRule", source_hash=execution_plan.rules[0].get_source_hash()
+            )
+            .rule_id
+            == "DCL001"
+        )
+    finally:
+        sys.modules.pop(module_name, None)
+
+
+def test_resolve_rules_declared_custom_rule_skipped_without_import_if_trigger_keywords_missing(tmp_path):
+    module_name = f"declared_rule_module_{tmp_path.name}"
+    (tmp_path / f"{module_name}.py").write_text(
+        "from boa_restrictor.common.rule import Rule\n\n\n"
+        "class DeclaredRule(Rule):\n"
+        '    RULE_ID = "DCL001"\n'
+        '    RULE_LABEL = "Declared rule."\n'
+        '    TRIGGER_KEYWORDS = ("models",)\n\n'
+        "    def check(self):\n"
+        "        return []\n"
+    )
+    (tmp_path / "plain.py").write_text("x = 1\n")
+    (tmp_path / "with_models.py").write_text("from django.db import models\n")
+    configuration = {
+        "enable_django_rules": False,
+        "exclude": [rule_class.RULE_ID for rule_class in BOA_RESTRICTOR_RULES],
+        "custom_rules": [{"path": f"{module_name}.DeclaredRule", "rule_id": "DCL001", "trigger_keywords": ["models"]}],
+    }
+    execution_plan = compile_execution_plan(
+        configuration=configuration,
+        rules=resolve_rules(configuration=configuration, config_anchor_dir=tmp_path, cache_dir=tmp_path / "cache"),
+        config_anchor_dir=tmp_path,
+    )
+
+    try:
+        lint_file(filename=str(tmp_path / "plain.py"), execution_plan=execution_plan)
+        assert module_name not in sys.modules
+
+        lint_file(filename=str(tmp_path / "with_models.py"), execution_plan=execution_plan)
+        assert module_name in sys.modules
+    finally:
+        sys.modules.pop(module_name, None)
+
+
+def test_lint_file_occurrences(tmp_path):
+    file_path = tmp_path / "module.py"
+    file_path.write_text("def function(a):\n    return a\n\ndef other(a):  # noqa: PBR001\n    return a\n")
+    execution_plan = compile_execution_plan(configuration={}, rules=(AsteriskRequiredRule,))
+
+    occurrences = lint_file(filename=str(file_path), execution_plan=execution_plan)
+
+    assert [(occurrence.rule_id, occurrence.line_number) for occurrence in occurrences] == [("PBR001", 1)]
+
+
+def test_lint_file_boa_directive_ranges(tmp_path):
+    file_path = tmp_path / "module.py"
+    file_path.write_text(
+        "# boa: disable=PBR001\ndef function(a):\n    return a\n# boa: enable=PBR001\ndef other(a):\n    return a\n"
+    )
+    execution_plan = compile_execution_plan(configuration={}, rules=(AsteriskRequiredRule,))
+
+    occurrences = lint_file(filename=str(file_path), execution_plan=execution_plan)
+
+    assert [(occurrence.rule_id, occurrence.line_number) for occurrence in occurrences] == [("PBR001", 5)]
+
+
+def test_lint_file_boa_disable_file_skips_rule(tmp_path):
+    file_path = tmp_path / "module.py"
+    file_path.write_text("def function(a):\n    return a\n# boa: disable-file=PBR001\n")
+    execution_plan = compile_execution_plan(configuration={}, rules=(AsteriskRequiredRule,))
+
+    with mock.patch.object(AsteriskRequiredRule, "check") as mocked_check:
+        occurrences = lint_file(filename=str(file_path), execution_plan=execution_plan)
+
+    assert occurrences == []
+    mocked_check.assert_not_called()
+
+
+def test_lint_files_serial_below_threshold(tmp_path):
+    file_path = tmp_path / "module.py"
+    file_path.write_text("x = 1\n")
+    execution_plan = compile_execution_plan(configuration={}, rules=(AsteriskRequiredRule,))
+
+    with mock.patch("concurrent.futures.ProcessPoolExecutor") as mocked_executor:
+        lint_files(
+            filenames=[str(file_path)] * (linting.PARALLEL_FILE_COUNT_THRESHOLD - 1),
+            execution_plan=execution_plan,
+            worker_setup=WorkerSetup(configuration={}, config_anchor_dir=tmp_path),
+            jobs=4,
+        )
+
+    mocked_executor.assert_not_called()
+
+
+def test_lint_files_serial_with_single_job(tmp_path):
+    file_path = tmp_path / "module.py"
+    file_path.write_text("x = 1\n")
+    execution_plan = compile_execution_plan(configuration={}, rules=(AsteriskRequiredRule,))
+
+    with mock.patch("concurrent.futures.ProcessPoolExecutor") as mocked_executor:
+        lint_files(
+            filenames=[str(file_path)] * linting.PARALLEL_FILE_COUNT_THRESHOLD,
+            execution_plan=execution_plan,
+            worker_setup=WorkerSetup(configuration={}, config_anchor_dir=tmp_path),
+            jobs=1,
+        )
+
+    mocked_executor.assert_not_called()
+
+
+def test_lint_files_parallel_matches_serial_order(tmp_path):
+    filenames = []
+    for index in range(linting.PARALLEL_FILE_COUNT_THRESHOLD):
+        file_path = tmp_path / f"module_{index}.py"
+        file_path.write_text("def function(a):\n    return a\n" * (index % 3))
+        filenames.append(str(file_path))
+    configuration = {"exclude": ["PBR002"]}
+    execution_plan = compile_execution_plan(
+        configuration=configuration, rules=resolve_rules(configuration=configuration, config_anchor_dir=tmp_path)
+    )
+
+    serial_occurrences = lint_files(
+        filenames=filenames,
+        execution_plan=execution_plan,
+        worker_setup=WorkerSetup(configuration=configuration, config_anchor_dir=tmp_path),
+    )
+    parallel_occurrences = lint_files(
+        filenames=filenames,
+        execution_plan=execution_plan,
+        worker_setup=WorkerSetup(configuration=configuration, config_anchor_dir=tmp_path),
+        jobs=2,
+    )
+
+    assert len(serial_occurrences) > 0
+    assert parallel_occurrences == serial_occurrences
+
+
+def test_iter_file_occurrences_parallel_takes_bounded_number_of_filenames(tmp_path):
+    file_path = tmp_path / "module.py"
+    file_path.write_text("def function(a):\n    return a\n")
+    execution_plan = compile_execution_plan(configuration={}, rules=(AsteriskRequiredRule,))
+    taken_filenames = []
+
+    def iter_filenames():
+        for _ in range(10_000):
+            taken_filenames.append(str(file_path))
+            yield str(file_path)
+
+    occurrences_per_file = iter_file_occurrences(
+        filenames=iter_filenames(),
+        execution_plan=execution_plan,
+        worker_setup=WorkerSetup(configuration={}, config_anchor_dir=tmp_path),
+        jobs=2,
+    )
+    first_occurrences = next(occurrences_per_file)
+    occurrences_per_file.close()
+
+    assert first_occurrences[0].rule_id == "PBR001"
+    assert len(taken_filenames) <= (
+        linting.PARALLEL_FILE_COUNT_THRESHOLD
+        + 2 * linting.PARALLEL_PENDING_CHUNKS_PER_JOB * linting.PARALLEL_CHUNK_SIZE
+    )
+
+
+def test_lint_files_parallel_syntax_error_matches_serial(tmp_path):
+    filenames = []
+    for index in range(linting.PARALLEL_FILE_COUNT_THRESHOLD):
+        file_path = tmp_path / f"module_{index}.py"
+        file_path.write_text("x = (\n" if index == 1 else "x = 1\n")
+        filenames.append(str(file_path))
+    execution_plan = compile_execution_plan(
+        configuration={}, rules=resolve_rules(configuration={}, config_anchor_dir=tmp_path)
+    )
+
+    with pytest.raises(BoaRestrictorParsingError) as serial_error:
+        lint_files(
+            filenames=filenames,
+            execution_plan=execution_plan,
+            worker_setup=WorkerSetup(configuration={}, config_anchor_dir=tmp_path),
+        )
+    with pytest.raises(BoaRestrictorParsingError) as parallel_error:
+        lint_files(
+            filenames=filenames,
+            execution_plan=execution_plan,
+            worker_setup=WorkerSetup(configuration={}, config_anchor_dir=tmp_path),
+            jobs=2,
+        )
+
+    assert parallel_error.value.filename == filenames[1]
+    assert str(parallel_error.value) == str(serial_error.value)
+
+
+def test_initialize_worker_resolves_custom_rules_without_warnings():
+    configuration = {
+        "exclude": ["TYPO001"],
+        "custom_rules": ["tests.fixtures.custom_rule_module.SampleCustomRule"],
+    }
+
+    with warnings.catch_warnings(record=True) as caught_warnings:
+        warnings.simplefilter("always")
+        linting._initialize_worker(WorkerSetup(configuration=configuration, config_anchor_dir=REPOSITORY_ROOT))
+
+    assert caught_warnings == []
+    assert SampleCustomRule in linting._worker_execution_plan.rules
+    assert ReturnStatementRequiresTypeHintRule in linting._worker_execution_plan.rules
+
+
+def test_initialize_worker_uses_rule_entry_points_of_main_process():
+    rule_entry_point = RuleEntryPoint(
+        name="TST001", value="tests.fixtures.custom_rule_module:SampleCustomRule", distribution_name="tests"
+    )
+
+    with mock.patch.object(linting, "discover_rule_entry_points") as mocked_discover_rule_entry_points:
+        linting._initialize_worker(
+            WorkerSetup(configuration={}, config_anchor_dir=REPOSITORY_ROOT, rule_entry_points=(rule_entry_point,))
+        )
+
+    mocked_discover_rule_entry_points.assert_not_called()
+    assert SampleCustomRule in linting._worker_execution_plan.rules
+
+
+def test_lint_files_unchanged_files_taken_from_cache(tmp_path):
+    file_path = tmp_path / "module.py"
+    file_path.write_text("def function(a):\n    return a\n")
+    execution_plan = compile_execution_plan(configuration={}, rules=(AsteriskRequiredRule,))
+    result_cache = ResultCache(
+        cache_dir=tmp_path / "cache",
+        run_fingerprint="fingerprint",
+        relative_path_resolver=RelativePathResolver(anchor_dir=tmp_path),
+    )
+    occurrences = lint_files(
+        filenames=[str(file_path)],
+        execution_plan=execution_plan,
+        worker_setup=WorkerSetup(configuration={}, config_anchor_dir=tmp_path),
+        result_cache=result_cache,
+    )
+
+    with mock.patch.object(linting, "lint_file") as mocked_lint_file:
+        cached_occurrences = lint_files(
+            filenames=[str(file_path)],
+            execution_plan=execution_plan,
+            worker_setup=WorkerSetup(configuration={}, config_anchor_dir=tmp_path),
+            result_cache=result_cache,
+        )
+
+    mocked_lint_file.assert_not_called()
+    assert len(occurrences) == 1
+    assert cached_occurrences == occurrences
+
+
+def test_lint_files_files_without_rules_not_cached(tmp_path):
+    file_path = tmp_path / "module.py"
+    file_path.write_text("x = 1\n")
+    execution_plan = compile_execution_plan(configuration={}, rules=(NoLoopsInTestsRule,))
+    result_cache = ResultCache(
+        cache_dir=tmp_path / "cache",
+        run_fingerprint="fingerprint",
+        relative_path_resolver=RelativePathResolver(anchor_dir=tmp_path),
+    )
+
+    with mock.patch.object(result_cache, "lookup") as mocked_lookup:
+        lint_files(
+            filenames=[str(file_path)],
+            execution_plan=execution_plan,
+            worker_setup=WorkerSetup(configuration={}, config_anchor_dir=tmp_path),
+            result_cache=result_cache,
+        )
+
+    mocked_lookup.assert_not_called()
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_lint_files_lazy_filenames_mixed_with_cached_ones(tmp_path, jobs):
+    filenames = []
+    for index in range(linting.PARALLEL_FILE_COUNT_THRESHOLD + 1):
+        file_path = tmp_path / f"module_{index}.py"
+        file_path.write_text(f"def function_{index}(a):\n    return a\n")
+        filenames.append(str(file_path))
+    execution_plan = compile_execution_plan(configuration={}, rules=(AsteriskRequiredRule,))
+    worker_setup = WorkerSetup(configuration={"exclude": ["PBR002"]}, config_anchor_dir=tmp_path)
+    result_cache = ResultCache(
+        cache_dir=tmp_path / "cache",
+        run_fingerprint="fingerprint",
+        relative_path_resolver=RelativePathResolver(anchor_dir=tmp_path),
+    )
+    # Every third file is taken from the cache
+    lint_files(
+        filenames=filenames[::3], execution_plan=execution_plan, worker_setup=worker_setup, result_cache=result_cache
+    )
+
+    occurrences = lint_files(
+        filenames=(filename for filename in filenames),
+        execution_plan=execution_plan,
+        worker_setup=worker_setup,
+        jobs=jobs,
+        result_cache=result_cache,
+    )
+
+    assert [str(occurrence.file_path) for occurrence in occurrences] == filenames
+
+
+def test_iter_file_occurrences_yields_per_file(tmp_path):
+    filenames = []
+    for index in range(3):
+        file_path = tmp_path / f"module_{index}.py"
+        file_path.write_text("def function(a):\n    return a\n\ndef other_function(b):\n    return b\n")
+        filenames.append(str(file_path))
+    execution_plan = compile_execution_plan(configuration={}, rules=(AsteriskRequiredRule,))
+
+    file_occurrences = list(
+        iter_file_occurrences(
+            filenames=filenames,
+            execution_plan=execution_plan,
+            worker_setup=WorkerSetup(configuration={}, config_anchor_dir=tmp_path),
+        )
+    )
+
+    assert [
+        [(str(occurrence.file_path), occurrence.line_number) for occurrence in occurrences]
+        for occurrences in file_occurrences
+    ] == [[(filename, 1), (filename, 4)] for filename in filenames]
+
+
+def test_iter_file_occurrences_saves_cache_once_exhausted(tmp_path):
+    file_path = tmp_path / "module.py"
+    file_path.write_text("def function(a):\n    return a\n")
+    execution_plan = compile_execution_plan(configuration={}, rules=(AsteriskRequiredRule,))
+    result_cache = ResultCache(
+        cache_dir=tmp_path / "cache",
+        run_fingerprint="fingerprint",
+        relative_path_resolver=RelativePathResolver(anchor_dir=tmp_path),
+    )
+    file_occurrences = iter_file_occurrences(
+        filenames=[str(file_path)],
+        execution_plan=execution_plan,
+        worker_setup=WorkerSetup(configuration={}, config_anchor_dir=tmp_path),
+        result_cache=result_cache,
+    )
+
+    with mock.patch.object(result_cache, "save") as mocked_save:
+        next(file_occurrences)
+        mocked_save.assert_not_called()
+
+        assert list(file_occurrences) == []
+        mocked_save.assert_called_once()
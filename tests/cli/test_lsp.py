@@ -0,0 +1,281 @@
+from io import BytesIO
+from unittest import mock
+
+import pytest
+
+from boa_restrictor.cli import lsp
+from boa_restrictor.cli.daemon import DaemonState
+from boa_restrictor.cli.lsp import LanguageServer, SuppressionCommentCache, read_message, uri_to_filename, write_message
+from boa_restrictor.rules import AsteriskRequiredRule
+
+SOURCE_CODE_WITH_OCCURRENCE = "def function(a):\n    return a\n"
+
+
+@pytest.fixture
+def project_dir(tmp_path, monkeypatch):
+    (tmp_path / "pyproject.toml").write_text('[tool.boa-restrictor]\nexclude = ["PBR002"]\n')
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def _encode_messages(*messages: dict) -> BytesIO:
+    stream = BytesIO()
+    for message in messages:
+        write_message(stream, message)
+    stream.seek(0)
+    return stream
+
+
+def _decode_messages(stream: BytesIO) -> list[dict]:
+    stream.seek(0)
+    messages = []
+    while (message := read_message(stream)) is not None:
+        messages.append(message)
+    return messages
+
+
+def _build_server(*, project_dir, messages: tuple[dict, ...] = (), debounce_delay: float = 0) -> LanguageServer:
+    return LanguageServer(
+        state=DaemonState(config_path=str(project_dir / "pyproject.toml")),
+        reader=_encode_messages(*messages),
+        writer=BytesIO(),
+        debounce_delay=debounce_delay,
+    )
+
+
+def _did_open(*, uri: str, text: str) -> dict:
+    return {
+        "jsonrpc": "2.0",
+        "method": "textDocument/didOpen",
+        "params": {"textDocument": {"uri": uri, "languageId": "python", "version": 1, "text": text}},
+    }
+
+
+def _did_change(*, uri: str, text: str) -> dict:
+    return {
+        "jsonrpc": "2.0",
+        "method": "textDocument/didChange",
+        "params": {"textDocument": {"uri": uri, "version": 2}, "contentChanges": [{"text": text}]},
+    }
+
+
+def _published_diagnostics(server: LanguageServer) -> list[list[dict]]:
+    return [
+        message["params"]["diagnostics"]
+        for message in _decode_messages(server.writer)
+        if message.get("method") == "textDocument/publishDiagnostics"
+    ]
+
+
+def test_read_and_write_message_roundtrip():
+    stream = _encode_messages({"jsonrpc": "2.0", "method": "initialized", "params": {"text": "äöü"}})
+
+    assert read_message(stream) == {"jsonrpc": "2.0", "method": "initialized", "params": {"text": "äöü"}}
+    assert read_message(stream) is None
+
+
+def test_uri_to_filename_within_working_directory():
+    assert uri_to_filename(uri="file:///project/app/my%20module.py", working_dir="/project") == "app/my module.py"
+
+
+def test_uri_to_filename_outside_working_directory():
+    assert uri_to_filename(uri="file:///other/module.py", working_dir="/project") == "/other/module.py"
+
+
+def test_suppression_comment_cache_reused_if_only_other_lines_change():
+    suppression_comment_cache = SuppressionCommentCache()
+    suppression_comment_cache.get(uri="file:///a.py", source_code="x = 1  # noqa: PBR001\ny = 2\n", filename="a.py")
+
+    with mock.patch.object(lsp, "get_suppression_comments") as mocked_get_suppression_comments:
+        noqa_comments = suppression_comment_cache.get(
+            uri="file:///a.py", source_code="x = 1  # noqa: PBR001\ny = 3\n", filename="a.py"
+        )
+
+    mocked_get_suppression_comments.assert_not_called()
+    assert noqa_comments.noqa_comments == [(1, {"PBR001"})]
+
+
+def test_suppression_comment_cache_collected_again_if_noqa_line_moves():
+    suppression_comment_cache = SuppressionCommentCache()
+    suppression_comment_cache.get(uri="file:///a.py", source_code="x = 1  # noqa: PBR001\n", filename="a.py")
+
+    noqa_comments = suppression_comment_cache.get(
+        uri="file:///a.py", source_code="y = 2\nx = 1  # noqa: PBR001\n", filename="a.py"
+    )
+
+    assert noqa_comments.noqa_comments == [(2, {"PBR001"})]
+
+
+def test_suppression_comment_cache_collected_again_if_string_delimiters_change():
+    suppression_comment_cache = SuppressionCommentCache()
+    suppression_comment_cache.get(uri="file:///a.py", source_code="x = 1\n# noqa: PBR001\ny = 2\n", filename="a.py")
+
+    noqa_comments = suppression_comment_cache.get(
+        uri="file:///a.py", source_code='x = """\n# noqa: PBR001\n"""\n', filename="a.py"
+    )
+
+    assert noqa_comments.noqa_comments == []
+
+
+def test_suppression_comment_cache_collected_again_if_line_continuation_changes():
+    suppression_comment_cache = SuppressionCommentCache()
+    suppression_comment_cache.get(uri="file:///a.py", source_code='x = "a"\n# noqa: PBR001"\n', filename="a.py")
+
+    noqa_comments = suppression_comment_cache.get(
+        uri="file:///a.py", source_code='x = "a \\\n# noqa: PBR001"\n', filename="a.py"
+    )
+
+    assert noqa_comments.noqa_comments == []
+
+
+def test_suppression_comment_cache_skips_tokenizing_without_noqa():
+    with mock.patch.object(lsp, "get_suppression_comments") as mocked_get_suppression_comments:
+        suppression_comments = SuppressionCommentCache().get(
+            uri="file:///a.py", source_code="x = 1  # comment\n", filename="a.py"
+        )
+
+    assert suppression_comments.noqa_comments == []
+    assert suppression_comments.boa_directives == []
+
+    mocked_get_suppression_comments.assert_not_called()
+
+
+def test_suppression_comment_cache_collected_again_if_boa_directive_changes():
+    suppression_comment_cache = SuppressionCommentCache()
+    suppression_comment_cache.get(uri="file:///a.py", source_code="# boa: disable=PBR001\nx = 1\n", filename="a.py")
+
+    suppression_comments = suppression_comment_cache.get(
+        uri="file:///a.py", source_code="# boa: disable=PBR002\nx = 1\n", filename="a.py"
+    )
+
+    assert [boa_directive.rule_ids for boa_directive in suppression_comments.boa_directives] == [frozenset({"PBR002"})]
+
+
+def test_language_server_initialize_and_shutdown(project_dir):
+    server = _build_server(
+        project_dir=project_dir,
+        messages=(
+            {"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {}},
+            {"jsonrpc": "2.0", "method": "initialized", "params": {}},
+            {"jsonrpc": "2.0", "id": 2, "method": "shutdown"},
+            {"jsonrpc": "2.0", "method": "exit"},
+        ),
+    )
+
+    server.serve()
+
+    responses = _decode_messages(server.writer)
+    assert responses[0]["result"]["capabilities"]["textDocumentSync"] == lsp.TEXT_DOCUMENT_SYNC_FULL
+    assert responses[1] == {"jsonrpc": "2.0", "id": 2, "result": None}
+    assert server.is_shutdown is True
+
+
+def test_language_server_unknown_request(project_dir):
+    server = _build_server(project_dir=project_dir)
+
+    server.handle_message({"jsonrpc": "2.0", "id": 1, "method": "textDocument/hover", "params": {}})
+
+    assert _decode_messages(server.writer)[0]["error"]["code"] == lsp.METHOD_NOT_FOUND_ERROR_CODE
+
+
+def test_language_server_publishes_diagnostics_on_open(project_dir):
+    server = _build_server(project_dir=project_dir)
+
+    server.handle_message(_did_open(uri=(project_dir / "module.py").as_uri(), text=SOURCE_CODE_WITH_OCCURRENCE))
+
+    assert _published_diagnostics(server) == [
+        [
+            {
+                "range": {"start": {"line": 0, "character": 0}, "end": {"line": 0, "character": 16}},
+                "severity": lsp.DIAGNOSTIC_SEVERITY_WARNING,
+                "code": "PBR001",
+                "source": "boa-restrictor",
+                "message": AsteriskRequiredRule.RULE_LABEL,
+            }
+        ]
+    ]
+
+
+def test_language_server_relints_changed_document(project_dir):
+    uri = (project_dir / "module.py").as_uri()
+    server = _build_server(project_dir=project_dir)
+    server.handle_message(_did_open(uri=uri, text=SOURCE_CODE_WITH_OCCURRENCE))
+
+    server.handle_message(_did_change(uri=uri, text="def function(*, a):\n    return a\n"))
+
+    assert [len(diagnostics) for diagnostics in _published_diagnostics(server)] == [1, 0]
+
+
+def test_language_server_debounces_changes(project_dir):
+    uri = (project_dir / "module.py").as_uri()
+    server = _build_server(project_dir=project_dir, debounce_delay=0.05)
+    server.handle_message(_did_open(uri=uri, text="x = 1\n"))
+
+    for index in range(5):
+        server.handle_message(_did_change(uri=uri, text=f"x = {index}\n" + SOURCE_CODE_WITH_OCCURRENCE))
+    pending_lint = server._pending_lints[uri]
+    pending_lint.join()
+
+    assert [len(diagnostics) for diagnostics in _published_diagnostics(server)] == [0, 1]
+
+
+def test_language_server_keeps_diagnostics_on_syntax_error(project_dir):
+    uri = (project_dir / "module.py").as_uri()
+    server = _build_server(project_dir=project_dir)
+    server.handle_message(_did_open(uri=uri, text=SOURCE_CODE_WITH_OCCURRENCE))
+
+    server.handle_message(_did_change(uri=uri, text="def function(a:\n"))
+
+    assert len(_published_diagnostics(server)) == 1
+
+
+def test_language_server_clears_diagnostics_on_close(project_dir):
+    uri = (project_dir / "module.py").as_uri()
+    server = _build_server(project_dir=project_dir)
+    server.handle_message(_did_open(uri=uri, text=SOURCE_CODE_WITH_OCCURRENCE))
+
+    server.handle_message(
+        {"jsonrpc": "2.0", "method": "textDocument/didClose", "params": {"textDocument": {"uri": uri}}}
+    )
+
+    assert _published_diagnostics(server)[-1] == []
+    assert uri not in server.documents
+
+
+def test_language_server_reports_invalid_configuration(project_dir):
+    uri = (project_dir / "module.py").as_uri()
+    server = _build_server(project_dir=project_dir)
+    (project_dir / "pyproject.toml").write_text("[tool.boa-restrictor\n")
+
+    server.handle_message(_did_open(uri=uri, text=SOURCE_CODE_WITH_OCCURRENCE))
+
+    messages = _decode_messages(server.writer)
+    assert messages[0]["method"] == "window/showMessage"
+    assert "TomlParsingError" in messages[0]["params"]["message"]
+    assert len(messages[1]["params"]["diagnostics"]) == 1
+
+
+def test_language_server_uses_noqa_comments(project_dir):
+    server = _build_server(project_dir=project_dir)
+
+    server.handle_message(
+        _did_open(uri=(project_dir / "module.py").as_uri(), text="def function(a):  # noqa: PBR001\n    return a\n")
+    )
+
+    assert _published_diagnostics(server) == [[]]
+
+
+def test_language_server_save_cancels_debounced_lint(project_dir):
+    uri = (project_dir / "module.py").as_uri()
+    server = _build_server(project_dir=project_dir, debounce_delay=60)
+    server.handle_message(_did_open(uri=uri, text="x = 1\n"))
+    server.handle_message(_did_change(uri=uri, text=SOURCE_CODE_WITH_OCCURRENCE))
+    pending_lint = server._pending_lints[uri]
+
+    server.handle_message(
+        {"jsonrpc": "2.0", "method": "textDocument/didSave", "params": {"textDocument": {"uri": uri}}}
+    )
+    pending_lint.join(timeout=1)
+
+    assert not pending_lint.is_alive()
+    assert [len(diagnostics) for diagnostics in _published_diagnostics(server)] == [0, 1]
@@ -1,21 +1,46 @@
 import argparse
 import os
 import sys
+import warnings
 from io import StringIO
 from pathlib import Path
 from unittest import mock
 
 import pytest
 
-from boa_restrictor.cli.main import main
+from boa_restrictor.cli.main import main, parse_job_count
+from boa_restrictor.cli.plugins import RuleEntryPoint
+from boa_restrictor.common.noqa import SuppressionComments
 from boa_restrictor.common.rule import Rule
 from boa_restrictor.exceptions.custom_rules import DuplicateRuleIdError
 from boa_restrictor.projections.occurrence import Occurrence
 from boa_restrictor.rules import BOA_RESTRICTOR_RULES, DJANGO_BOA_RULES, AsteriskRequiredRule
 from tests.fixtures.custom_rule_module import SampleCustomRule
 
+# A test module living in both the "api" and the "views" layer, so every built-in rule applies to it
+ALL_RULES_APPLICABLE_FILENAME = "app/api/views/tests/test_file.py"
+# Source code containing the trigger keywords of every built-in rule
+ALL_RULES_TRIGGERING_SOURCE_CODE = "# " + " ".join(
+    keyword for rule in BOA_RESTRICTOR_RULES + DJANGO_BOA_RULES for keyword in rule.TRIGGER_KEYWORDS
+)
+
 
-@mock.patch.object(argparse.ArgumentParser, "parse_args")
+@mock.patch.object(
+    argparse.ArgumentParser,
+    "parse_args",
+    return_value=argparse.Namespace(
+        filenames=[],
+        config="pyproject.toml",
+        jobs=1,
+        cache_dir=None,
+        watch=False,
+        changed_since=None,
+        diff_lines=False,
+        baseline=None,
+        write_baseline=False,
+        format="text",
+    ),
+)
 def test_main_arguments_parsed(mocked_parse_args):
     main(
         argv=(
@@ -32,13 +57,13 @@ def test_main_arguments_parsed(mocked_parse_args):
 
 
 @mock.patch("boa_restrictor.cli.main.load_configuration", return_value={"exclude": ["PBR001"]})
-@mock.patch("builtins.open", mock.mock_open(read_data="# test file"))
+@mock.patch("builtins.open", mock.mock_open(read_data=ALL_RULES_TRIGGERING_SOURCE_CODE))
 @mock.patch.object(Rule, "run_check")
 @mock.patch.object(AsteriskRequiredRule, "run_check")
 def test_main_exclude_config_active(mocked_run_checks_asterisk, mocked_rule_run_checks, *args):
     main(
         argv=(
-            os.path.abspath(sys.argv[0]),
+            ALL_RULES_APPLICABLE_FILENAME,
             "--config",
             "pyproject.toml",
         )
@@ -51,13 +76,13 @@ def test_main_exclude_config_active(mocked_run_checks_asterisk, mocked_rule_run_
 
 
 @mock.patch("boa_restrictor.cli.main.load_configuration", return_value={"per-file-excludes": {"*.py": ["PBR001"]}})
-@mock.patch("builtins.open", mock.mock_open(read_data="# test file"))
+@mock.patch("builtins.open", mock.mock_open(read_data=ALL_RULES_TRIGGERING_SOURCE_CODE))
 @mock.patch.object(Rule, "run_check")
 @mock.patch.object(AsteriskRequiredRule, "run_check")
 def test_main_per_file_exclude_config_active(mocked_run_checks_asterisk, mocked_rule_run_checks, *args):
     main(
         argv=(
-            "test_file.py",
+            ALL_RULES_APPLICABLE_FILENAME,
             "--config",
             "pyproject.toml",
         )
@@ -71,7 +96,7 @@ def test_main_per_file_exclude_config_active(mocked_run_checks_asterisk, mocked_
 
 @mock.patch("boa_restrictor.cli.main.load_configuration", return_value={})
 @mock.patch("builtins.open", mock.mock_open(read_data="# test file"))
-@mock.patch("boa_restrictor.cli.main.get_rules")
+@mock.patch("boa_restrictor.cli.linting.get_rules")
 def test_main_django_rules_default_enabled(mocked_get_rule, *args):
     main(
         argv=(
@@ -81,12 +106,12 @@ def test_main_django_rules_default_enabled(mocked_get_rule, *args):
         )
     )
 
-    mocked_get_rule.assert_called_with(use_django_rules=True)
+    mocked_get_rule.assert_called_with(use_django_rules=True, excluded_rule_ids=frozenset())
 
 
 @mock.patch("boa_restrictor.cli.main.load_configuration", return_value={"enable_django_rules": True})
 @mock.patch("builtins.open", mock.mock_open(read_data="# test file"))
-@mock.patch("boa_restrictor.cli.main.get_rules")
+@mock.patch("boa_restrictor.cli.linting.get_rules")
 def test_main_django_rules_enabled(mocked_get_rule, *args):
     main(
         argv=(
@@ -96,12 +121,12 @@ def test_main_django_rules_enabled(mocked_get_rule, *args):
         )
     )
 
-    mocked_get_rule.assert_called_with(use_django_rules=True)
+    mocked_get_rule.assert_called_with(use_django_rules=True, excluded_rule_ids=frozenset())
 
 
 @mock.patch("boa_restrictor.cli.main.load_configuration", return_value={"enable_django_rules": False})
 @mock.patch("builtins.open", mock.mock_open(read_data="# test file"))
-@mock.patch("boa_restrictor.cli.main.get_rules")
+@mock.patch("boa_restrictor.cli.linting.get_rules")
 def test_main_django_rules_disabled(mocked_get_rule, *args):
     main(
         argv=(
@@ -111,13 +136,16 @@ def test_main_django_rules_disabled(mocked_get_rule, *args):
         )
     )
 
-    mocked_get_rule.assert_called_with(use_django_rules=False)
+    mocked_get_rule.assert_called_with(use_django_rules=False, excluded_rule_ids=frozenset())
 
 
 def test_main_noqa_comments_called():
-    with mock.patch("boa_restrictor.cli.main.get_noqa_comments", return_value=[]) as mocked_get_noqa_comments:
+    with mock.patch(
+        "boa_restrictor.common.suppressions.get_suppression_comments",
+        return_value=SuppressionComments(noqa_comments=[], boa_directives=[]),
+    ) as mocked_get_suppression_comments:
         with mock.patch("boa_restrictor.cli.main.load_configuration", return_value={}):
-            with mock.patch("builtins.open", mock.mock_open(read_data="# test file")):
+            with mock.patch("builtins.open", mock.mock_open(read_data="# test file  # noqa: PBR001")):
                 main(
                     argv=(
                         os.path.abspath(sys.argv[0]),
@@ -126,7 +154,116 @@ def test_main_noqa_comments_called():
                     )
                 )
 
-                mocked_get_noqa_comments.assert_called_once()
+                mocked_get_suppression_comments.assert_called_once()
+
+
+@mock.patch("boa_restrictor.cli.main.load_configuration", return_value={})
+@mock.patch("builtins.open", mock.mock_open(read_data="def function(a):\n    pass\n"))
+def test_main_file_context_created_once_per_file(*args):
+    with mock.patch("boa_restrictor.cli.linting.FileContext") as mocked_file_context:
+        with mock.patch.object(Rule, "run_check", return_value=[]) as mocked_run_check:
+            main(
+                argv=(
+                    "file_one.py",
+                    "file_two.py",
+                    "--config",
+                    "pyproject.toml",
+                )
+            )
+
+    assert mocked_file_context.call_count == 2  # noqa: PLR2004
+    # Every rule gets handed the shared context
+    assert mocked_run_check.call_args.kwargs["context"] is mocked_file_context.return_value
+
+
+@mock.patch("boa_restrictor.cli.main.load_configuration", return_value={})
+@mock.patch("builtins.open", mock.mock_open(read_data=ALL_RULES_TRIGGERING_SOURCE_CODE))
+@mock.patch.object(Rule, "run_check")
+def test_main_rules_not_applicable_to_path_skipped(mocked_run_check, *args):
+    main(
+        argv=(
+            "app/views.py",
+            "--config",
+            "pyproject.toml",
+        )
+    )
+
+    assert mocked_run_check.call_count == len(BOA_RESTRICTOR_RULES) + len(DJANGO_BOA_RULES) - 4, (
+        "We expect the three test-only rules and the API-layer rule to be skipped."
+    )
+
+
+@mock.patch(
+    "boa_restrictor.cli.main.load_configuration",
+    return_value={
+        "exclude": [
+            rule.RULE_ID
+            for rule in BOA_RESTRICTOR_RULES + DJANGO_BOA_RULES
+            if rule.is_applicable(file_path=Path("app/models.py"))
+        ]
+    },
+)
+@mock.patch("boa_restrictor.cli.main.discover_enabled_rule_entry_points", return_value=())
+def test_main_file_not_read_if_no_rule_applies(*args):
+    with mock.patch("builtins.open") as mocked_open:
+        with mock.patch("boa_restrictor.cli.linting.parse_source_code_or_fail") as mocked_parse:
+            with mock.patch(
+                "boa_restrictor.common.suppressions.get_suppression_comments"
+            ) as mocked_get_suppression_comments:
+                result = main(
+                    argv=(
+                        "app/models.py",
+                        "--config",
+                        "pyproject.toml",
+                    )
+                )
+
+    assert result is False
+    mocked_open.assert_not_called()
+    mocked_parse.assert_not_called()
+    mocked_get_suppression_comments.assert_not_called()
+
+
+@mock.patch("boa_restrictor.cli.main.load_configuration", return_value={})
+@mock.patch("builtins.open", mock.mock_open(read_data="# test file"))
+@mock.patch.object(Rule, "run_check")
+def test_main_rules_without_trigger_keywords_skipped(mocked_run_check, *args):
+    main(
+        argv=(
+            ALL_RULES_APPLICABLE_FILENAME,
+            "--config",
+            "pyproject.toml",
+        )
+    )
+
+    assert mocked_run_check.call_count == len(
+        [rule for rule in BOA_RESTRICTOR_RULES + DJANGO_BOA_RULES if not rule.TRIGGER_KEYWORDS]
+    )
+
+
+@mock.patch(
+    "boa_restrictor.cli.main.load_configuration",
+    return_value={
+        "exclude": [rule.RULE_ID for rule in BOA_RESTRICTOR_RULES + DJANGO_BOA_RULES if not rule.TRIGGER_KEYWORDS]
+    },
+)
+@mock.patch("builtins.open", mock.mock_open(read_data="((("))
+def test_main_file_not_parsed_if_no_rule_triggered(*args):
+    with mock.patch("boa_restrictor.cli.linting.parse_source_code_or_fail") as mocked_parse:
+        with mock.patch(
+            "boa_restrictor.common.suppressions.get_suppression_comments"
+        ) as mocked_get_suppression_comments:
+            result = main(
+                argv=(
+                    ALL_RULES_APPLICABLE_FILENAME,
+                    "--config",
+                    "pyproject.toml",
+                )
+            )
+
+    assert result is False
+    mocked_parse.assert_not_called()
+    mocked_get_suppression_comments.assert_not_called()
 
 
 @mock.patch("boa_restrictor.cli.main.load_configuration", return_value={})
@@ -173,8 +310,9 @@ def test_main_occurrences_are_written_to_cli():
                     # We have more than one rule
                     assert mocked_run_checks.call_count > 1
 
-                    # We expect one line per occurrence
-                    assert mocked_write.call_count == mocked_run_checks.call_count
+                    # We expect one line per occurrence, written at once for the whole file
+                    mocked_write.assert_called_once()
+                    assert mocked_write.call_args.args[0].count("\n") == mocked_run_checks.call_count
 
 
 @mock.patch("boa_restrictor.cli.main.load_configuration", return_value={})
@@ -208,24 +346,24 @@ def test_main_occurrences_cli_output_correctly_formatted(mocked_load_config):
     assert "(PBR000) One to rule them all." in actual_output
 
 
-@mock.patch("boa_restrictor.cli.main.load_configuration", return_value={"per-file-excludes": {"*.py": ["PBR001"]}})
+@mock.patch(
+    "boa_restrictor.cli.main.load_configuration",
+    return_value={"exclude": ["TYPO001"], "per-file-excludes": {"*.py": ["TYPO002"]}},
+)
 @mock.patch("builtins.open", mock.mock_open(read_data="# test file"))
-@mock.patch("boa_restrictor.cli.main.is_rule_excluded_per_file", return_value=True)
-@mock.patch.object(AsteriskRequiredRule, "run_check")
-def test_main_per_file_exclusion_skips_rule(mocked_run_check, mocked_is_excluded, *args):
-    """Test that line 59 continue statement is executed when per-file exclusion matches"""
+@mock.patch.object(warnings, "warn")
+def test_main_invalid_rules_warned_once_per_run(mocked_warn, *args):
     main(
         argv=(
-            os.path.abspath(sys.argv[0]),
+            "file_one.py",
+            "file_two.py",
             "--config",
             "pyproject.toml",
         )
     )
 
-    # Verify the rule was excluded via per-file config
-    mocked_is_excluded.assert_called()
-    # Verify that the rule check was NOT called for the excluded rule
-    mocked_run_check.assert_not_called()
+    # We expect one warning per invalid rule, regardless of the number of files and rules
+    assert mocked_warn.call_count == 2  # noqa: PLR2004
 
 
 CUSTOM_RULE_PATH = "tests.fixtures.custom_rule_module.SampleCustomRule"
@@ -357,6 +495,7 @@ def test_main_custom_rule_noqa_uses_exact_match_not_substring(*args):
         ],
     },
 )
+@mock.patch("boa_restrictor.cli.main.discover_enabled_rule_entry_points", return_value=())
 def test_main_aborts_on_duplicate_rule_ids_before_reading_files(*args):
     """A RULE_ID clash among loaded rules must abort main() before any file is opened."""
     with mock.patch("builtins.open") as mocked_open:
@@ -424,3 +563,212 @@ def test_main_custom_rule_violation_appears_in_stdout(*args):
     assert "TST001" in output
     assert "Sample custom rule for tests." in output
     assert result is True
+
+
+def test_parse_job_count_number():
+    assert parse_job_count("4") == 4  # noqa: PLR2004
+
+
+def test_parse_job_count_auto():
+    assert parse_job_count("auto") >= 1
+
+
+@pytest.mark.parametrize("value", ["0", "-1", "many"])
+def test_parse_job_count_invalid(value):
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_job_count(value)
+
+
+@mock.patch("boa_restrictor.cli.main.load_configuration", return_value={})
+@mock.patch("boa_restrictor.cli.main.iter_file_occurrences", return_value=iter([]))
+def test_main_jobs_passed_to_linting(mocked_iter_file_occurrences, *args):
+    main(argv=("file.py", "--jobs", "3"))
+
+    assert mocked_iter_file_occurrences.call_args.kwargs["jobs"] == 3  # noqa: PLR2004
+
+
+@mock.patch("boa_restrictor.cli.main.load_configuration", return_value={})
+@mock.patch("boa_restrictor.cli.main.iter_file_occurrences", return_value=iter([]))
+def test_main_rule_entry_points_discovered_once(mocked_iter_file_occurrences, *args):
+    rule_entry_point = RuleEntryPoint(
+        name="TST001", value="tests.fixtures.custom_rule_module:SampleCustomRule", distribution_name="tests"
+    )
+
+    with mock.patch(
+        "boa_restrictor.cli.main.discover_enabled_rule_entry_points", return_value=(rule_entry_point,)
+    ) as mocked_discover_enabled_rule_entry_points:
+        main(argv=("file.py", "--jobs", "3"))
+
+    mocked_discover_enabled_rule_entry_points.assert_called_once_with(configuration={}, cache_dir=None)
+    assert mocked_iter_file_occurrences.call_args.kwargs["worker_setup"].rule_entry_points == (rule_entry_point,)
+    assert SampleCustomRule in mocked_iter_file_occurrences.call_args.kwargs["execution_plan"].rules
+
+
+@mock.patch("boa_restrictor.cli.main.load_configuration", return_value={"exclude": ["PBR002"]})
+def test_main_directory_arguments(mocked_load_configuration, tmp_path, monkeypatch):
+    (tmp_path / "src" / "build").mkdir(parents=True)
+    (tmp_path / "src" / "module.py").write_text("def function(a):\n    return a\n")
+    (tmp_path / "src" / "build" / "module.py").write_text("def function(a):\n    return a\n")
+    (tmp_path / ".gitignore").write_text("build/\n")
+    monkeypatch.chdir(tmp_path)
+
+    with mock.patch("sys.stdout", new=StringIO()) as mocked_stdout:
+        result = main(argv=(".",))
+
+    assert result is True
+    assert mocked_stdout.getvalue() == (
+        f'"{os.path.join("src", "module.py")}:1": ({AsteriskRequiredRule.RULE_ID}) {AsteriskRequiredRule.RULE_LABEL}\n'
+    )
+
+
+@mock.patch("boa_restrictor.cli.main.load_configuration", return_value={})
+@mock.patch("boa_restrictor.cli.main.iter_file_occurrences", return_value=iter([]))
+@mock.patch("boa_restrictor.cli.git_diff.select_changed_filenames", return_value=["changed.py"])
+def test_main_changed_since(mocked_select_changed_filenames, mocked_iter_file_occurrences, *args):
+    main(argv=("changed.py", "unchanged.py", "--changed-since", "main"))
+
+    mocked_select_changed_filenames.assert_called_once_with(filenames=["changed.py", "unchanged.py"], ref="main")
+    assert mocked_iter_file_occurrences.call_args.kwargs["filenames"] == ["changed.py"]
+
+
+@mock.patch("boa_restrictor.cli.main.load_configuration", return_value={})
+@mock.patch("boa_restrictor.cli.git_diff.select_changed_filenames", return_value=["changed.py"])
+@mock.patch("boa_restrictor.cli.git_diff.get_changed_lines", return_value={"changed.py": [(3, 4)]})
+def test_main_diff_lines(*args):
+    occurrences = [
+        Occurrence(
+            rule_id="PBR001",
+            rule_label="Label",
+            filename="changed.py",
+            file_path=Path("changed.py"),
+            identifier=None,
+            line_number=line_number,
+        )
+        for line_number in (1, 4)
+    ]
+
+    with (
+        mock.patch("boa_restrictor.cli.main.iter_file_occurrences", return_value=iter([occurrences])),
+        mock.patch("sys.stdout", new=StringIO()) as mocked_stdout,
+    ):
+        result = main(argv=("--changed-since", "main", "--diff-lines"))
+
+    assert result is True
+    assert mocked_stdout.getvalue() == '"changed.py:4": (PBR001) Label\n'
+
+
+def test_main_occurrences_written_per_file():
+    occurrences_per_file = [
+        [
+            Occurrence(
+                rule_id="PBR001",
+                rule_label="Label",
+                filename=filename,
+                file_path=Path(filename),
+                identifier=None,
+                line_number=line_number,
+            )
+            for line_number in (1, 2)
+        ]
+        for filename in ("first.py", "second.py")
+    ]
+    written_outputs = []
+
+    def iter_file_occurrences(**kwargs):
+        for file_occurrences in occurrences_per_file:
+            yield file_occurrences
+            # Occurrences of a file are written before the next file is linted
+            written_outputs.append(mocked_stdout.getvalue())
+
+    with (
+        mock.patch("boa_restrictor.cli.main.load_configuration", return_value={}),
+        mock.patch("boa_restrictor.cli.main.iter_file_occurrences", new=iter_file_occurrences),
+        mock.patch("sys.stdout", new=StringIO()) as mocked_stdout,
+    ):
+        result = main(argv=("first.py", "second.py"))
+
+    assert result is True
+    assert written_outputs == [
+        '"first.py:1": (PBR001) Label\n"first.py:2": (PBR001) Label\n',
+        '"first.py:1": (PBR001) Label\n"first.py:2": (PBR001) Label\n'
+        '"second.py:1": (PBR001) Label\n"second.py:2": (PBR001) Label\n',
+    ]
+
+
+@mock.patch("boa_restrictor.cli.main.load_configuration", return_value={})
+@mock.patch("boa_restrictor.cli.main.iter_file_occurrences", return_value=iter([[], []]))
+def test_main_no_occurrences(*args):
+    with mock.patch("sys.stdout", new=StringIO()) as mocked_stdout:
+        result = main(argv=("first.py", "second.py"))
+
+    assert result is False
+    assert mocked_stdout.getvalue() == ""
+
+
+@mock.patch("boa_restrictor.cli.main.load_configuration", return_value={})
+@mock.patch("boa_restrictor.cli.main.iter_file_occurrences", return_value=iter([]))
+def test_main_format(*args):
+    with mock.patch("sys.stdout", new=StringIO()) as mocked_stdout:
+        result = main(argv=("file.py", "--format", "junit"))
+
+    assert result is False
+    assert mocked_stdout.getvalue() == (
+        '<?xml version="1.0" encoding="utf-8"?>\n<testsuites name="boa-restrictor">\n</testsuites>\n'
+    )
+
+
+@mock.patch("boa_restrictor.cli.main.load_configuration", return_value={"exclude": ["PBR002"]})
+def test_main_baseline(mocked_load_configuration, tmp_path, monkeypatch):
+    (tmp_path / "module.py").write_text("def function(a):\n    return a\n")
+    monkeypatch.chdir(tmp_path)
+
+    with mock.patch("sys.stdout", new=StringIO()) as mocked_stdout:
+        assert main(argv=("module.py", "--baseline", "baseline.json", "--write-baseline")) is False
+        assert main(argv=("module.py", "--baseline", "baseline.json")) is False
+
+    (tmp_path / "module.py").write_text("def function(a):\n    return a\n\ndef other_function(b):\n    return b\n")
+    with mock.patch("sys.stdout", new=StringIO()) as mocked_stdout:
+        assert main(argv=("module.py", "--baseline", "baseline.json")) is True
+
+    assert (
+        mocked_stdout.getvalue()
+        == f'"module.py:4": ({AsteriskRequiredRule.RULE_ID}) {AsteriskRequiredRule.RULE_LABEL}\n'
+    )
+
+
+def test_main_write_baseline_requires_baseline():
+    with mock.patch("sys.stderr", new=StringIO()), pytest.raises(SystemExit):
+        main(argv=("file.py", "--write-baseline"))
+
+
+def test_main_diff_lines_requires_changed_since():
+    with mock.patch("sys.stderr", new=StringIO()), pytest.raises(SystemExit):
+        main(argv=("file.py", "--diff-lines"))
+
+
+@pytest.mark.parametrize(
+    "option",
+    [
+        ["--jobs", "2"],
+        ["--cache-dir", ".cache"],
+        ["--format", "sarif"],
+        ["--changed-since", "main"],
+        ["--baseline", "baseline.json"],
+    ],
+)
+@mock.patch("boa_restrictor.cli.watch.Watcher")
+def test_main_watch_rejects_options_it_would_ignore(mocked_watcher, option):
+    with mock.patch("sys.stderr", new=StringIO()) as mocked_stderr, pytest.raises(SystemExit):
+        main(argv=("src", "--watch", *option))
+
+    assert f'"--watch" can\'t be combined with "{option[0]}"' in mocked_stderr.getvalue()
+    mocked_watcher.assert_not_called()
+
+
+@mock.patch("boa_restrictor.cli.watch.Watcher")
+def test_main_watch(mocked_watcher, tmp_path):
+    result = main(argv=("src", "--watch", "--config", "pyproject.toml"))
+
+    assert result is False
+    assert mocked_watcher.call_args.kwargs["paths"] == ["src"]
+    mocked_watcher.return_value.run.assert_called_once()
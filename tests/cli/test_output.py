@@ -0,0 +1,170 @@
+import json
+import xml.etree.ElementTree as ET
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from boa_restrictor.cli.output import (
+    OUTPUT_WRITERS,
+    GithubOutputWriter,
+    JsonLinesOutputWriter,
+    JunitOutputWriter,
+    SarifOutputWriter,
+    TextOutputWriter,
+    create_output_writer,
+)
+from boa_restrictor.projections.occurrence import Occurrence
+from boa_restrictor.rules import AsteriskRequiredRule
+
+
+def _create_occurrence(*, line_number: int, filename: str = "module.py", identifier: str | None = None) -> Occurrence:
+    return Occurrence(
+        rule_id="PBR001",
+        rule_label="Label",
+        filename=filename,
+        file_path=Path(filename),
+        identifier=identifier,
+        line_number=line_number,
+    )
+
+
+def _write(*, output_writer_class, occurrences_per_file, **kwargs) -> str:
+    stream = StringIO()
+    output_writer = output_writer_class(stream=stream, **kwargs)
+    output_writer.open()
+    for occurrences in occurrences_per_file:
+        output_writer.write_file_occurrences(occurrences)
+    output_writer.close()
+    return stream.getvalue()
+
+
+OCCURRENCES_PER_FILE = [
+    [
+        _create_occurrence(line_number=1, filename="first.py", identifier="function"),
+        _create_occurrence(line_number=2, filename="first.py"),
+    ],
+    [],
+    [_create_occurrence(line_number=3, filename="second.py")],
+]
+
+
+def test_text_output_writer_single_write_per_file():
+    stream = StringIO()
+    output_writer = TextOutputWriter(stream=stream)
+
+    with mock.patch.object(stream, "write", wraps=stream.write) as mocked_write:
+        output_writer.write_file_occurrences([_create_occurrence(line_number=1), _create_occurrence(line_number=2)])
+
+    mocked_write.assert_called_once()
+    assert stream.getvalue() == '"module.py:1": (PBR001) Label\n"module.py:2": (PBR001) Label\n'
+
+
+def test_text_output_writer_no_occurrences():
+    stream = StringIO()
+    output_writer = TextOutputWriter(stream=stream)
+
+    with mock.patch.object(stream, "write") as mocked_write:
+        output_writer.write_file_occurrences([])
+        output_writer.close()
+
+    mocked_write.assert_not_called()
+
+
+def test_json_lines_output_writer():
+    output = _write(output_writer_class=JsonLinesOutputWriter, occurrences_per_file=OCCURRENCES_PER_FILE)
+
+    assert [json.loads(line) for line in output.splitlines()] == [
+        {
+            "rule_id": "PBR001",
+            "rule_label": "Label",
+            "filename": "first.py",
+            "file_path": "first.py",
+            "line_number": 1,
+            "identifier": "function",
+        },
+        {
+            "rule_id": "PBR001",
+            "rule_label": "Label",
+            "filename": "first.py",
+            "file_path": "first.py",
+            "line_number": 2,
+            "identifier": None,
+        },
+        {
+            "rule_id": "PBR001",
+            "rule_label": "Label",
+            "filename": "second.py",
+            "file_path": "second.py",
+            "line_number": 3,
+            "identifier": None,
+        },
+    ]
+
+
+def test_sarif_output_writer():
+    output = _write(
+        output_writer_class=SarifOutputWriter, occurrences_per_file=OCCURRENCES_PER_FILE, rules=(AsteriskRequiredRule,)
+    )
+
+    sarif_log = json.loads(output)
+    assert sarif_log["version"] == "2.1.0"
+    (run,) = sarif_log["runs"]
+    assert run["tool"]["driver"]["rules"] == [
+        {"id": AsteriskRequiredRule.RULE_ID, "shortDescription": {"text": AsteriskRequiredRule.RULE_LABEL}}
+    ]
+    assert [
+        (
+            result["ruleId"],
+            result["locations"][0]["physicalLocation"]["artifactLocation"]["uri"],
+            result["locations"][0]["physicalLocation"]["region"]["startLine"],
+        )
+        for result in run["results"]
+    ] == [("PBR001", "first.py", 1), ("PBR001", "first.py", 2), ("PBR001", "second.py", 3)]
+    assert run["results"][0]["locations"][0]["logicalLocations"] == [{"name": "function"}]
+
+
+def test_sarif_output_writer_no_occurrences():
+    output = _write(output_writer_class=SarifOutputWriter, occurrences_per_file=[[]], rules=())
+
+    assert json.loads(output)["runs"][0]["results"] == []
+
+
+def test_github_output_writer():
+    occurrence = Occurrence(
+        rule_id="PBR001",
+        rule_label="50% of the label,\nsplit",
+        filename="module,1.py",
+        file_path=Path("src/module,1.py"),
+        identifier=None,
+        line_number=7,
+    )
+
+    output = _write(output_writer_class=GithubOutputWriter, occurrences_per_file=[[occurrence]])
+
+    assert output == "::error file=src/module%2C1.py,line=7,title=PBR001::50%25 of the label,%0Asplit\n"
+
+
+def test_junit_output_writer():
+    output = _write(output_writer_class=JunitOutputWriter, occurrences_per_file=OCCURRENCES_PER_FILE)
+
+    test_suites = ET.fromstring(output)
+    assert [
+        (test_suite.get("name"), test_suite.get("failures"), [test_case.get("name") for test_case in test_suite])
+        for test_suite in test_suites
+    ] == [("first.py", "2", ["PBR001:1", "PBR001:2"]), ("second.py", "1", ["PBR001:3"])]
+    assert test_suites[0][0][0].get("message") == "Label"
+
+
+def test_junit_output_writer_no_occurrences():
+    output = _write(output_writer_class=JunitOutputWriter, occurrences_per_file=[])
+
+    assert len(ET.fromstring(output)) == 0
+
+
+@pytest.mark.parametrize("output_format", OUTPUT_WRITERS)
+def test_create_output_writer(output_format):
+    output_writer = create_output_writer(output_format=output_format, stream=StringIO(), rules=())
+
+    assert isinstance(output_writer, OUTPUT_WRITERS[output_format])
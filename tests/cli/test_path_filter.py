@@ -0,0 +1,100 @@
+import os
+from unittest import mock
+
+from boa_restrictor.cli.path_filter import PathFilter, RelativePathResolver
+
+
+def test_path_filter_without_globs_includes_everything(tmp_path):
+    path_filter = PathFilter(relative_path_resolver=RelativePathResolver(anchor_dir=tmp_path))
+
+    assert path_filter.is_active is False
+    assert path_filter.is_included(filename=str(tmp_path / "module.py")) is True
+
+
+def test_path_filter_exclude_paths(tmp_path):
+    path_filter = PathFilter(
+        relative_path_resolver=RelativePathResolver(anchor_dir=tmp_path),
+        exclude_paths=["**/migrations", "vendor", "**/*_pb2.py"],
+    )
+
+    assert path_filter.is_included(filename=str(tmp_path / "app" / "migrations" / "0001_initial.py")) is False
+    assert path_filter.is_included(filename=str(tmp_path / "vendor" / "package" / "module.py")) is False
+    assert path_filter.is_included(filename=str(tmp_path / "api" / "service_pb2.py")) is False
+    assert path_filter.is_included(filename=str(tmp_path / "app" / "vendor" / "module.py")) is True
+    assert path_filter.is_included(filename=str(tmp_path / "app" / "models.py")) is True
+
+
+def test_path_filter_include_paths(tmp_path):
+    path_filter = PathFilter(
+        relative_path_resolver=RelativePathResolver(anchor_dir=tmp_path),
+        include_paths=["src", "scripts/*.py"],
+        exclude_paths=["src/legacy"],
+    )
+
+    assert path_filter.is_included(filename=str(tmp_path / "src" / "package" / "module.py")) is True
+    assert path_filter.is_included(filename=str(tmp_path / "scripts" / "deploy.py")) is True
+    assert path_filter.is_included(filename=str(tmp_path / "scripts" / "sub" / "deploy.py")) is False
+    assert path_filter.is_included(filename=str(tmp_path / "tests" / "test_module.py")) is False
+    assert path_filter.is_included(filename=str(tmp_path / "src" / "legacy" / "module.py")) is False
+
+
+def test_path_filter_relative_to_anchor(tmp_path, monkeypatch):
+    (tmp_path / "project").mkdir()
+    monkeypatch.chdir(tmp_path / "project")
+    path_filter = PathFilter(
+        relative_path_resolver=RelativePathResolver(anchor_dir=tmp_path), exclude_paths=["project/generated"]
+    )
+
+    assert path_filter.is_included(filename=os.path.join("generated", "module.py")) is False
+    assert path_filter.is_included(filename="module.py") is True
+
+
+def test_path_filter_files_outside_of_anchor(tmp_path):
+    anchor_dir = tmp_path / "project"
+
+    assert (
+        PathFilter(
+            relative_path_resolver=RelativePathResolver(anchor_dir=anchor_dir), exclude_paths=["**"]
+        ).is_included(filename=str(tmp_path / "module.py"))
+        is True
+    )
+    assert (
+        PathFilter(
+            relative_path_resolver=RelativePathResolver(anchor_dir=anchor_dir), include_paths=["**"]
+        ).is_included(filename=str(tmp_path / "module.py"))
+        is False
+    )
+
+
+def test_path_filter_is_directory_excluded(tmp_path):
+    path_filter = PathFilter(
+        relative_path_resolver=RelativePathResolver(anchor_dir=tmp_path), exclude_paths=["**/migrations"]
+    )
+
+    assert path_filter.is_directory_excluded(directory=str(tmp_path / "app" / "migrations")) is True
+    assert path_filter.is_directory_excluded(directory=str(tmp_path / "app" / "migrations" / "sub")) is True
+    assert path_filter.is_directory_excluded(directory=str(tmp_path / "app")) is False
+
+
+def test_path_filter_directory_verdict_memoized(tmp_path):
+    path_filter = PathFilter(
+        relative_path_resolver=RelativePathResolver(anchor_dir=tmp_path), exclude_paths=["**/migrations"]
+    )
+    path_filter.is_included(filename=str(tmp_path / "app" / "a.py"))
+
+    with mock.patch("os.path.relpath") as mocked_relpath:
+        path_filter.is_included(filename=str(tmp_path / "app" / "b.py"))
+
+    mocked_relpath.assert_not_called()
+
+
+def test_relative_path_resolver(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    relative_path_resolver = RelativePathResolver(anchor_dir=tmp_path / "project")
+
+    assert relative_path_resolver.get_relative_path(filename=os.path.join("project", "src", "module.py")) == (
+        "src/module.py"
+    )
+    assert relative_path_resolver.get_relative_path(filename=str(tmp_path / "project" / "module.py")) == "module.py"
+    assert relative_path_resolver.get_relative_path(filename="module.py") is None
+    assert relative_path_resolver.get_relative_directory(directory="project") == ""
@@ -0,0 +1,50 @@
+from unittest import mock
+
+from boa_restrictor.cli.path_filter import RelativePathResolver
+from boa_restrictor.cli.per_file_excludes import PerFileExcludes
+
+
+def test_per_file_excludes_all_matching_patterns_found(tmp_path):
+    per_file_excludes = PerFileExcludes(
+        patterns={"*.py": ["PBR001"], "*/scripts/*": ["PBR002"], "*.toml": ["PBR003"], "*/scripts/run.py": []},
+        relative_path_resolver=RelativePathResolver(anchor_dir=tmp_path),
+    )
+
+    assert per_file_excludes.get_matched_patterns(filename=str(tmp_path / "app" / "scripts" / "run.py")) == {0, 1, 3}
+    assert per_file_excludes.excluded_rule_ids[1] == frozenset({"PBR002"})
+
+
+def test_per_file_excludes_relative_to_anchor(tmp_path):
+    per_file_excludes = PerFileExcludes(
+        patterns={"scripts/*.py": ["PBR001"]}, relative_path_resolver=RelativePathResolver(anchor_dir=tmp_path)
+    )
+
+    assert per_file_excludes.get_matched_patterns(filename=str(tmp_path / "scripts" / "run.py")) == {0}
+    assert per_file_excludes.get_matched_patterns(filename=str(tmp_path / "app" / "scripts" / "run.py")) == set()
+
+
+def test_per_file_excludes_outside_of_anchor_matched_as_given(tmp_path):
+    per_file_excludes = PerFileExcludes(
+        patterns={"*/scripts/*.py": ["PBR001"]},
+        relative_path_resolver=RelativePathResolver(anchor_dir=tmp_path / "project"),
+    )
+
+    assert per_file_excludes.get_matched_patterns(filename=str(tmp_path / "scripts" / "run.py")) == {0}
+
+
+def test_per_file_excludes_without_patterns(tmp_path):
+    per_file_excludes = PerFileExcludes(patterns={}, relative_path_resolver=RelativePathResolver(anchor_dir=tmp_path))
+
+    assert per_file_excludes.get_matched_patterns(filename="module.py") == set()
+
+
+def test_per_file_excludes_directory_resolved_once(tmp_path):
+    per_file_excludes = PerFileExcludes(
+        patterns={"*.py": ["PBR001"]}, relative_path_resolver=RelativePathResolver(anchor_dir=tmp_path)
+    )
+    per_file_excludes.get_matched_patterns(filename=str(tmp_path / "app" / "one.py"))
+
+    with mock.patch("os.path.relpath") as mocked_relpath:
+        assert per_file_excludes.get_matched_patterns(filename=str(tmp_path / "app" / "two.py")) == {0}
+
+    mocked_relpath.assert_not_called()
@@ -0,0 +1,141 @@
+import json
+import sys
+from unittest import mock
+
+import pytest
+
+from boa_restrictor.cli import plugins
+from boa_restrictor.cli.plugins import (
+    RuleEntryPoint,
+    compute_environment_key,
+    discover_rule_entry_points,
+    get_rule_entry_points_filename,
+    get_user_cache_dir,
+)
+
+
+@pytest.fixture
+def site_dir(tmp_path, monkeypatch):
+    """
+    A directory on sys.path with a distribution registering a rule via an entry point.
+    """
+    site_dir = tmp_path / "site-packages"
+    _install_distribution(site_dir=site_dir, version="1.0", entry_points="SHR001 = shared_rules.naming:SharedRule\n")
+    monkeypatch.syspath_prepend(site_dir)
+    return site_dir
+
+
+def _install_distribution(*, site_dir, version, entry_points):
+    metadata_dir = site_dir / f"shared_rules-{version}.dist-info"
+    metadata_dir.mkdir(parents=True)
+    (metadata_dir / "METADATA").write_text(f"Metadata-Version: 2.1\nName: shared-rules\nVersion: {version}\n")
+    (metadata_dir / "entry_points.txt").write_text(f"[boa_restrictor.rules]\n{entry_points}")
+    return metadata_dir
+
+
+def test_rule_entry_point_module_path_and_attr_name():
+    rule_entry_point = RuleEntryPoint(
+        name="SHR001", value="shared_rules.naming : SharedRule", distribution_name="shared-rules"
+    )
+
+    assert rule_entry_point.module_path == "shared_rules.naming"
+    assert rule_entry_point.attr_name == "SharedRule"
+
+
+def test_discover_rule_entry_points(site_dir):
+    assert discover_rule_entry_points() == (
+        RuleEntryPoint(name="SHR001", value="shared_rules.naming:SharedRule", distribution_name="shared-rules"),
+    )
+
+
+def test_discover_rule_entry_points_sorted(site_dir):
+    (site_dir / "shared_rules-1.0.dist-info" / "entry_points.txt").write_text(
+        "[boa_restrictor.rules]\nSHR002 = shared_rules.naming:OtherRule\nSHR001 = shared_rules.naming:SharedRule\n"
+        "[console_scripts]\nshared = shared_rules.cli:main\n"
+    )
+
+    assert [rule_entry_point.name for rule_entry_point in discover_rule_entry_points()] == ["SHR001", "SHR002"]
+
+
+def test_discover_rule_entry_points_cached(site_dir, tmp_path):
+    cache_dir = tmp_path / "cache"
+    rule_entry_points = discover_rule_entry_points(cache_dir=cache_dir)
+
+    with mock.patch.object(plugins, "_scan_rule_entry_points") as mocked_scan_rule_entry_points:
+        cached_rule_entry_points = discover_rule_entry_points(cache_dir=cache_dir)
+
+    mocked_scan_rule_entry_points.assert_not_called()
+    assert cached_rule_entry_points == rule_entry_points
+    assert json.loads((cache_dir / get_rule_entry_points_filename()).read_text())["entry_points"] == [
+        {"name": "SHR001", "value": "shared_rules.naming:SharedRule", "distribution_name": "shared-rules"}
+    ]
+
+
+def test_discover_rule_entry_points_scanned_again_after_upgrade(site_dir, tmp_path):
+    cache_dir = tmp_path / "cache"
+    discover_rule_entry_points(cache_dir=cache_dir)
+    (site_dir / "shared_rules-1.0.dist-info").rename(site_dir / "shared_rules-1.1.dist-info")
+    (site_dir / "shared_rules-1.1.dist-info" / "entry_points.txt").write_text(
+        "[boa_restrictor.rules]\nSHR002 = shared_rules.naming:OtherRule\n"
+    )
+
+    assert [rule_entry_point.name for rule_entry_point in discover_rule_entry_points(cache_dir=cache_dir)] == ["SHR002"]
+
+
+def test_discover_rule_entry_points_invalid_cache_ignored(site_dir, tmp_path):
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    (cache_dir / get_rule_entry_points_filename()).write_text(
+        json.dumps({"environment_key": compute_environment_key(), "entry_points": [{"unknown": 1}]})
+    )
+
+    assert [rule_entry_point.name for rule_entry_point in discover_rule_entry_points(cache_dir=cache_dir)] == ["SHR001"]
+
+
+def test_compute_environment_key_changes_with_installed_distributions(site_dir):
+    environment_key = compute_environment_key()
+
+    assert compute_environment_key() == environment_key
+
+    _install_distribution(site_dir=site_dir, version="2.0", entry_points="")
+
+    assert compute_environment_key() != environment_key
+
+
+def test_discover_rule_entry_points_cached_in_user_cache_dir(site_dir, tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "user-cache"))
+    discover_rule_entry_points()
+
+    with mock.patch.object(plugins, "_scan_rule_entry_points") as mocked_scan_rule_entry_points:
+        rule_entry_points = discover_rule_entry_points()
+
+    mocked_scan_rule_entry_points.assert_not_called()
+    assert [rule_entry_point.name for rule_entry_point in rule_entry_points] == ["SHR001"]
+    assert (tmp_path / "user-cache" / "boa-restrictor" / get_rule_entry_points_filename()).is_file()
+
+
+def test_discover_rule_entry_points_unwritable_cache_dir(site_dir, tmp_path):
+    cache_dir = tmp_path / "cache"
+    cache_dir.write_text("not a directory")
+
+    assert [rule_entry_point.name for rule_entry_point in discover_rule_entry_points(cache_dir=cache_dir)] == ["SHR001"]
+
+
+def test_get_user_cache_dir_xdg_cache_home(monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", "/var/cache/user")
+
+    assert str(get_user_cache_dir()) == "/var/cache/user/boa-restrictor"
+
+
+def test_get_user_cache_dir_home(monkeypatch, tmp_path):
+    monkeypatch.delenv("XDG_CACHE_HOME", raising=False)
+    monkeypatch.setenv("HOME", str(tmp_path))
+
+    assert get_user_cache_dir() == tmp_path / ".cache" / "boa-restrictor"
+
+
+def test_get_rule_entry_points_filename_per_environment(monkeypatch):
+    filename = get_rule_entry_points_filename()
+    monkeypatch.setattr(sys, "prefix", "/other/venv")
+
+    assert get_rule_entry_points_filename() != filename
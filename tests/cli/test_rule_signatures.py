@@ -0,0 +1,80 @@
+import json
+
+from boa_restrictor.cli.custom_rules import RuleSignature
+from boa_restrictor.cli.rule_signatures import RULE_SIGNATURES_FILENAME, RuleSignatureFile
+
+SIGNATURE = RuleSignature(rule_id="MYP001", label="My rule.", trigger_keywords=("foo",))
+OTHER_SIGNATURE = RuleSignature(rule_id="MYP002", label="Other rule.")
+
+
+def test_rule_signature_file_record_and_get(tmp_path):
+    signature_file = RuleSignatureFile(cache_dir=tmp_path / "cache")
+
+    signature_file.record(dotted_path="myproject.MyRule", source_hash="abc", signature=SIGNATURE)
+
+    assert signature_file.get_signature(dotted_path="myproject.MyRule", source_hash="abc") == SIGNATURE
+    assert (
+        RuleSignatureFile(cache_dir=tmp_path / "cache").get_signature(dotted_path="myproject.MyRule", source_hash="abc")
+        == SIGNATURE
+    )
+    assert (tmp_path / "cache" / ".gitignore").read_text() == "*\n"
+
+
+def test_rule_signature_file_source_changed(tmp_path):
+    signature_file = RuleSignatureFile(cache_dir=tmp_path)
+    signature_file.record(dotted_path="myproject.MyRule", source_hash="abc", signature=SIGNATURE)
+
+    assert signature_file.get_signature(dotted_path="myproject.MyRule", source_hash="def") is None
+    assert signature_file.get_signature(dotted_path="myproject.OtherRule", source_hash="abc") is None
+
+
+def test_rule_signature_file_keeps_signatures_of_other_processes(tmp_path):
+    signature_file = RuleSignatureFile(cache_dir=tmp_path)
+    RuleSignatureFile(cache_dir=tmp_path).record(
+        dotted_path="myproject.OtherRule", source_hash="def", signature=OTHER_SIGNATURE
+    )
+
+    signature_file.record(dotted_path="myproject.MyRule", source_hash="abc", signature=SIGNATURE)
+
+    assert json.loads((tmp_path / RULE_SIGNATURES_FILENAME).read_text()) == {
+        "myproject.MyRule": {
+            "source_hash": "abc",
+            "rule_id": "MYP001",
+            "label": "My rule.",
+            "trigger_keywords": ["foo"],
+        },
+        "myproject.OtherRule": {
+            "source_hash": "def",
+            "rule_id": "MYP002",
+            "label": "Other rule.",
+            "trigger_keywords": [],
+        },
+    }
+
+
+def test_rule_signature_file_unchanged_signature_not_written(tmp_path):
+    signature_file = RuleSignatureFile(cache_dir=tmp_path)
+    signature_file.record(dotted_path="myproject.MyRule", source_hash="abc", signature=SIGNATURE)
+    (tmp_path / RULE_SIGNATURES_FILENAME).unlink()
+
+    signature_file.record(dotted_path="myproject.MyRule", source_hash="abc", signature=SIGNATURE)
+
+    assert not (tmp_path / RULE_SIGNATURES_FILENAME).exists()
+
+
+def test_rule_signature_file_invalid_file_ignored(tmp_path):
+    (tmp_path / RULE_SIGNATURES_FILENAME).write_text("[1, 2")
+
+    signature_file = RuleSignatureFile(cache_dir=tmp_path)
+
+    assert signature_file.get_signature(dotted_path="myproject.MyRule", source_hash="abc") is None
+
+
+def test_rule_signature_file_signature_of_older_version_ignored(tmp_path):
+    (tmp_path / RULE_SIGNATURES_FILENAME).write_text(
+        json.dumps({"myproject.MyRule": {"source_hash": "abc", "rule_id": "MYP001"}})
+    )
+
+    signature_file = RuleSignatureFile(cache_dir=tmp_path)
+
+    assert signature_file.get_signature(dotted_path="myproject.MyRule", source_hash="abc") is None
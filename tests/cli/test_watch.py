@@ -0,0 +1,225 @@
+import os
+import time
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from boa_restrictor.cli import watch
+from boa_restrictor.cli.configuration import compile_execution_plan
+from boa_restrictor.cli.daemon import DaemonState
+from boa_restrictor.cli.watch import PollingChangeWaiter, Watcher, scan_python_files
+
+SOURCE_CODE_WITH_OCCURRENCE = "def function(a):\n    return a\n"
+
+
+@pytest.fixture
+def project_dir(tmp_path, monkeypatch):
+    (tmp_path / "pyproject.toml").write_text('[tool.boa-restrictor]\nexclude = ["PBR002"]\n')
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def _touch(*, path: Path, content: str, mtime_ns: int) -> None:
+    path.write_text(content)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_scan_python_files(tmp_path):
+    (tmp_path / "app" / "__pycache__").mkdir(parents=True)
+    (tmp_path / ".venv").mkdir()
+    (tmp_path / "app" / "module.py").write_text("x = 1\n")
+    (tmp_path / "app" / "README.md").write_text("# Readme\n")
+    (tmp_path / "app" / "__pycache__" / "cached.py").write_text("x = 1\n")
+    (tmp_path / ".venv" / "installed.py").write_text("x = 1\n")
+    (tmp_path / "script.py").write_text("x = 1\n")
+
+    stat_index, directories = scan_python_files(paths=[str(tmp_path)])
+
+    assert sorted(stat_index) == [str(tmp_path / "app" / "module.py"), str(tmp_path / "script.py")]
+    assert sorted(directories) == [str(tmp_path), str(tmp_path / "app")]
+
+
+def test_scan_python_files_skips_gitignored_and_excluded_directories(tmp_path):
+    for directory in ("app", "build", "node_modules", "migrations"):
+        (tmp_path / directory).mkdir()
+        (tmp_path / directory / "module.py").write_text("x = 1\n")
+    (tmp_path / ".gitignore").write_text("build/\n")
+    path_filter = compile_execution_plan(
+        configuration={"exclude-paths": ["**/migrations"]}, rules=(), config_anchor_dir=tmp_path
+    ).path_filter
+
+    stat_index, directories = scan_python_files(paths=[str(tmp_path)], path_filter=path_filter)
+
+    assert sorted(stat_index) == [str(tmp_path / "app" / "module.py")]
+    assert sorted(directories) == [str(tmp_path), str(tmp_path / "app")]
+
+
+def test_scan_python_files_stat_record(tmp_path):
+    file_path = tmp_path / "module.py"
+    _touch(path=file_path, content="x = 1\n", mtime_ns=1_000_000_000)
+
+    stat_index, _ = scan_python_files(paths=[str(file_path)])
+
+    assert stat_index == {str(file_path): (1_000_000_000, 6, file_path.stat().st_ino)}
+
+
+def test_scan_python_files_missing_path(tmp_path):
+    assert scan_python_files(paths=[str(tmp_path / "missing.py")]) == ({}, [])
+
+
+def test_watcher_lints_all_files_initially(project_dir):
+    _touch(path=project_dir / "module.py", content=SOURCE_CODE_WITH_OCCURRENCE, mtime_ns=1_000_000_000)
+    _touch(path=project_dir / "other.py", content="x = 1\n", mtime_ns=1_000_000_000)
+    output = StringIO()
+    watcher = Watcher(paths=["."], state=DaemonState(config_path="pyproject.toml"), output=output)
+
+    assert watcher.lint_changed_files() == ["module.py", "other.py"]
+    assert output.getvalue().startswith('"module.py:1": (PBR001)')
+    assert output.getvalue().endswith("Linted 2 changed file(s), 1 occurrence(s) in 2 watched file(s).\n")
+
+
+def test_watcher_lints_only_changed_files(project_dir):
+    _touch(path=project_dir / "module.py", content="x = 1\n", mtime_ns=1_000_000_000)
+    _touch(path=project_dir / "other.py", content="x = 1\n", mtime_ns=1_000_000_000)
+    output = StringIO()
+    watcher = Watcher(paths=["."], state=DaemonState(config_path="pyproject.toml"), output=output)
+    watcher.lint_changed_files()
+    output.truncate(0)
+    output.seek(0)
+
+    _touch(path=project_dir / "module.py", content=SOURCE_CODE_WITH_OCCURRENCE, mtime_ns=2_000_000_000)
+
+    assert watcher.lint_changed_files() == ["module.py"]
+    assert output.getvalue() == (
+        '"module.py:1": (PBR001) Positional arguments in functions and methods are discouraged. Add an "*" as the '
+        "first argument.\n"
+        "Linted 1 changed file(s), 1 occurrence(s) in 2 watched file(s).\n"
+    )
+
+
+def test_watcher_nothing_printed_without_changes(project_dir):
+    _touch(path=project_dir / "module.py", content="x = 1\n", mtime_ns=1_000_000_000)
+    output = StringIO()
+    watcher = Watcher(paths=["."], state=DaemonState(config_path="pyproject.toml"), output=output)
+    watcher.lint_changed_files()
+    output.truncate(0)
+    output.seek(0)
+
+    with mock.patch.object(watch, "lint_file") as mocked_lint_file:
+        assert watcher.lint_changed_files() == []
+
+    mocked_lint_file.assert_not_called()
+    assert output.getvalue() == ""
+
+
+def test_watcher_forgets_removed_files(project_dir):
+    _touch(path=project_dir / "module.py", content=SOURCE_CODE_WITH_OCCURRENCE, mtime_ns=1_000_000_000)
+    watcher = Watcher(paths=["."], state=DaemonState(config_path="pyproject.toml"), output=StringIO())
+    watcher.lint_changed_files()
+
+    (project_dir / "module.py").unlink()
+    watcher.lint_changed_files()
+
+    assert watcher.stat_index == {}
+    assert watcher.occurrence_counts == {}
+
+
+def test_watcher_rescans_only_changed_directories(project_dir):
+    for directory in ("app", "lib"):
+        (project_dir / directory).mkdir()
+        _touch(path=project_dir / directory / "module.py", content="x = 1\n", mtime_ns=1_000_000_000)
+    watcher = Watcher(paths=["."], state=DaemonState(config_path="pyproject.toml"), output=StringIO())
+    watcher.lint_changed_files()
+
+    _touch(path=project_dir / "app" / "module.py", content="y = 1\n", mtime_ns=2_000_000_000)
+    _touch(path=project_dir / "lib" / "module.py", content="y = 1\n", mtime_ns=2_000_000_000)
+    (project_dir / "app" / "new.py").write_text("x = 1\n")
+
+    with mock.patch.object(watch, "find_python_files", wraps=watch.find_python_files) as mocked_find_python_files:
+        assert watcher.lint_changed_files(changed_directories={"app"}) == ["app/module.py", "app/new.py"]
+
+    assert mocked_find_python_files.call_args.kwargs["paths"] == ["app"]
+    assert sorted(watcher.stat_index) == ["app/module.py", "app/new.py", "lib/module.py"]
+    assert sorted(watcher.directories) == [".", "app", "lib"]
+
+
+def test_watcher_forgets_files_of_removed_directories(project_dir):
+    (project_dir / "app" / "models").mkdir(parents=True)
+    _touch(path=project_dir / "app" / "models" / "user.py", content="x = 1\n", mtime_ns=1_000_000_000)
+    watcher = Watcher(paths=["."], state=DaemonState(config_path="pyproject.toml"), output=StringIO())
+    watcher.lint_changed_files()
+
+    (project_dir / "app" / "models" / "user.py").unlink()
+    (project_dir / "app" / "models").rmdir()
+    watcher.lint_changed_files(changed_directories={"app"})
+
+    assert watcher.stat_index == {}
+    assert watcher.directories == [".", "app"]
+
+
+def test_watcher_relints_all_files_after_configuration_change(project_dir):
+    _touch(path=project_dir / "module.py", content="x = 1\n", mtime_ns=1_000_000_000)
+    _touch(path=project_dir / "other.py", content="x = 1\n", mtime_ns=1_000_000_000)
+    watcher = Watcher(paths=["."], state=DaemonState(config_path="pyproject.toml"), output=StringIO())
+    watcher.lint_changed_files()
+
+    (project_dir / "pyproject.toml").write_text('[tool.boa-restrictor]\nexclude = ["PBR001"]\n')
+
+    assert watcher.lint_changed_files() == ["module.py", "other.py"]
+
+
+def test_watcher_reports_syntax_errors_and_continues(project_dir):
+    _touch(path=project_dir / "broken.py", content="def broken(:\n", mtime_ns=1_000_000_000)
+    _touch(path=project_dir / "module.py", content=SOURCE_CODE_WITH_OCCURRENCE, mtime_ns=1_000_000_000)
+    output = StringIO()
+    watcher = Watcher(paths=["."], state=DaemonState(config_path="pyproject.toml"), output=output)
+
+    watcher.lint_changed_files()
+
+    assert 'Source code of file "broken.py" contains syntax errors.' in output.getvalue()
+    assert watcher.occurrence_counts == {"module.py": 1}
+
+
+def test_watcher_run_until_interrupted(project_dir):
+    watcher = Watcher(paths=["."], state=DaemonState(config_path="pyproject.toml"), output=StringIO())
+
+    with (
+        mock.patch.object(watch.InotifyChangeWaiter, "is_available", return_value=False),
+        mock.patch.object(PollingChangeWaiter, "wait", side_effect=[None, KeyboardInterrupt]) as mocked_wait,
+        mock.patch.object(Watcher, "lint_changed_files") as mocked_lint_changed_files,
+    ):
+        watcher.run()
+
+    assert mocked_wait.call_count == 2  # noqa: PLR2004
+    assert mocked_lint_changed_files.call_args_list == [
+        mock.call(changed_directories=None),
+        mock.call(changed_directories=None),
+    ]
+
+
+@pytest.mark.skipif(not watch.InotifyChangeWaiter.is_available(), reason="inotify is only available on Linux")
+def test_inotify_change_waiter_wakes_up_on_change(tmp_path):
+    change_waiter = watch.InotifyChangeWaiter(timeout=5)
+    change_waiter.watch_directories(directories=[str(tmp_path)])
+    (tmp_path / "module.py").write_text("x = 1\n")
+
+    started_at = time.monotonic()
+    changed_directories = change_waiter.wait()
+    change_waiter.close()
+
+    # Woken up by the change, not by the timeout
+    assert time.monotonic() - started_at < 5  # noqa: PLR2004
+    assert changed_directories == {str(tmp_path)}
+
+
+@pytest.mark.skipif(not watch.InotifyChangeWaiter.is_available(), reason="inotify is only available on Linux")
+def test_inotify_change_waiter_everything_changed_on_timeout(tmp_path):
+    change_waiter = watch.InotifyChangeWaiter(timeout=0.01)
+    change_waiter.watch_directories(directories=[str(tmp_path)])
+
+    changed_directories = change_waiter.wait()
+    change_waiter.close()
+
+    assert changed_directories is None
@@ -0,0 +1,67 @@
+import ast
+from pathlib import Path
+from unittest import mock
+
+from boa_restrictor.common.file_context import FileContext
+from boa_restrictor.common.node_index import NodeIndex
+from boa_restrictor.common.suppressions import Suppressions
+
+
+def test_file_context_node_index():
+    source_tree = ast.parse("class A:\n    pass")
+    context = FileContext(file_path=Path("my/file.py"), source_tree=source_tree)
+
+    assert isinstance(context.node_index, NodeIndex)
+    assert context.node_index[ast.ClassDef] == [source_tree.body[0]]
+
+
+def test_file_context_import_aliases():
+    context = FileContext(
+        file_path=Path("my/file.py"),
+        source_tree=ast.parse("import datetime as dt\nfrom django.utils import timezone\nfrom . import models"),
+    )
+
+    assert context.import_aliases == {"dt": "datetime", "timezone": "django.utils.timezone", "models": "models"}
+
+
+def test_file_context_classes_by_name():
+    source_tree = ast.parse("class A:\n    class Meta:\n        pass")
+    context = FileContext(file_path=Path("my/file.py"), source_tree=source_tree)
+
+    assert context.classes_by_name == {"A": source_tree.body[0], "Meta": source_tree.body[0].body[0]}
+
+
+def test_file_context_type_checking_import_lines():
+    context = FileContext(
+        file_path=Path("my/file.py"),
+        source_tree=ast.parse("from typing import TYPE_CHECKING\nif TYPE_CHECKING:\n    import django.db\nimport os"),
+    )
+
+    assert context.type_checking_import_lines == frozenset({3})
+
+
+def test_file_context_django_db_import_line_numbers():
+    context = FileContext(
+        file_path=Path("my/file.py"),
+        source_tree=ast.parse(
+            "from typing import TYPE_CHECKING\nif TYPE_CHECKING:\n    import django.db\nfrom django.db import models"
+        ),
+    )
+
+    assert context.django_db_import_line_numbers == [4]
+
+
+@mock.patch("boa_restrictor.common.file_context.NodeIndex")
+def test_file_context_facts_computed_once(mocked_node_index):
+    context = FileContext(file_path=Path("my/file.py"), source_tree=ast.parse(""))
+
+    assert context.node_index is context.node_index
+    mocked_node_index.assert_called_once()
+
+
+def test_file_context_suppressions():
+    suppressions = Suppressions.from_noqa_comments(noqa_comments=[(1, {"PBR001"})])
+    context = FileContext(file_path=Path("my/file.py"), source_tree=ast.parse("x = 1"), suppressions=suppressions)
+
+    assert context.suppressions is suppressions
+    assert not FileContext(file_path=Path("my/file.py"), source_tree=ast.parse("x = 1")).suppressions
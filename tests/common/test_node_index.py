@@ -0,0 +1,80 @@
+import ast
+
+from boa_restrictor.common.node_index import NodeIndex
+
+
+def test_node_index_groups_nodes_by_type():
+    source_tree = ast.parse("""import datetime
+
+class MyService:
+    def process(self):
+        return datetime.datetime.now()
+""")
+
+    node_index = NodeIndex(source_tree=source_tree)
+
+    assert [node.name for node in node_index[ast.ClassDef]] == ["MyService"]
+    assert [node.name for node in node_index[ast.FunctionDef]] == ["process"]
+    assert len(node_index[ast.Import]) == 1
+    assert len(node_index[ast.Call]) == 1
+    assert node_index[ast.Module] == [source_tree]
+
+
+def test_node_index_keeps_source_order():
+    source_tree = ast.parse("""def outer():
+    def inner():
+        pass
+
+def other():
+    pass
+""")
+
+    node_index = NodeIndex(source_tree=source_tree)
+
+    assert [node.name for node in node_index[ast.FunctionDef]] == ["outer", "inner", "other"]
+
+
+def test_node_index_missing_type_is_empty():
+    node_index = NodeIndex(source_tree=ast.parse("a = 1"))
+
+    assert node_index[ast.ClassDef] == []
+    assert ast.ClassDef not in node_index
+    assert ast.Assign in node_index
+
+
+def test_node_index_nodes_of_merges_types_in_source_order():
+    source_tree = ast.parse("""async def first():
+    def second():
+        pass
+
+async def third():
+    pass
+""")
+
+    node_index = NodeIndex(source_tree=source_tree)
+
+    assert [node.name for node in node_index.nodes_of(ast.FunctionDef, ast.AsyncFunctionDef)] == [
+        "first",
+        "second",
+        "third",
+    ]
+
+
+def test_node_index_nodes_of_single_type():
+    source_tree = ast.parse("class A:\n    pass")
+
+    node_index = NodeIndex(source_tree=source_tree)
+
+    assert node_index.nodes_of(ast.ClassDef) == [source_tree.body[0]]
+
+
+def test_node_index_nodes_of_without_types():
+    node_index = NodeIndex(source_tree=ast.parse("a = 1"))
+
+    assert node_index.nodes_of() == []
+
+
+def test_node_index_nodes_of_is_cached():
+    node_index = NodeIndex(source_tree=ast.parse("import a\nfrom b import c"))
+
+    assert node_index.nodes_of(ast.Import, ast.ImportFrom) is node_index.nodes_of(ast.Import, ast.ImportFrom)
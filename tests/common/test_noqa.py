@@ -1,6 +1,11 @@
+import ast
+import tokenize
+from unittest import mock
+
 import pytest
 
-from boa_restrictor.common.noqa import get_noqa_comments
+from boa_restrictor.common.node_index import NodeIndex
+from boa_restrictor.common.noqa import BoaDirective, get_noqa_comments, get_suppression_comments
 from boa_restrictor.exceptions.syntax_errors import BoaRestrictorParsingError
 
 
@@ -194,3 +199,89 @@ def test_get_noqa_comments_tokenize_error_is_reframed():
         get_noqa_comments(source_code=source_code, filename="broken.py")
 
     assert "broken.py" in str(exc_info.value)
+
+
+@pytest.mark.parametrize(
+    "source_code",
+    [
+        "x = 7  # noqa: PBR001\n",
+        "x = 7  # other pragma # NOQA:PBR001, PBR002\r\ny = 8  # noqa: PBR003\r\n",
+        'x = "# noqa: PBR001"\n',
+        'x = "#"  # noqa: PBR001\n',
+        "x = b'# noqa: PBR001'  # noqa: PBR002\n",
+        'x = f"{y} # noqa: PBR001"  # noqa: PBR002\n',
+        'def function():\n    """\n    Docs # noqa: PBR001\n    """\n    return 1  # noqa: PBR002\n',
+        'x = (\n    "# first"  # noqa: PBR001\n    "second"  # noqa: PBR002\n)\n',
+        'x = """# noqa: PBR001\n"""; y = "#"  # noqa: PBR002\n',
+        'x = "ä#"  # noqa: PBR001\n',
+        "x = 1\ry = 2  # noqa: PBR001\n",
+        "x = 1  # noqa: PBR001",
+    ],
+)
+def test_get_noqa_comments_node_index_matches_tokenizer(source_code):
+    node_index = NodeIndex(source_tree=ast.parse(source_code))
+
+    assert get_noqa_comments(source_code=source_code, node_index=node_index) == get_noqa_comments(
+        source_code=source_code
+    )
+
+
+def test_get_noqa_comments_node_index_tokenizes_only_ambiguous_lines():
+    source_code = 'x = 1  # noqa: PBR001\nx = """\n# noqa: PBR002\n"""\ny = 2\n'
+    node_index = NodeIndex(source_tree=ast.parse(source_code))
+
+    with mock.patch.object(tokenize, "generate_tokens", wraps=tokenize.generate_tokens) as mocked_generate_tokens:
+        result = get_noqa_comments(source_code=source_code, node_index=node_index)
+
+    assert result == [(1, {"PBR001"})]
+    mocked_generate_tokens.assert_called_once()
+    # Only the lines of the string containing the ambiguous "#"
+    assert mocked_generate_tokens.call_args.args[0].__self__.getvalue() == 'x = """\n# noqa: PBR002\n"""\n'
+
+
+def test_get_noqa_comments_node_index_without_noqa_not_tokenized():
+    source_code = 'x = "#"  # Great!\n'
+    node_index = NodeIndex(source_tree=ast.parse(source_code))
+
+    with mock.patch.object(tokenize, "generate_tokens") as mocked_generate_tokens:
+        assert get_noqa_comments(source_code=source_code, node_index=node_index) == []
+
+    mocked_generate_tokens.assert_not_called()
+
+
+def test_get_suppression_comments_parses_boa_directives():
+    source_code = (
+        "# boa: disable=PBR001, PBR002\n"
+        "x = 1  # BOA:Enable=PBR001 -- back on\n"
+        "# boa: disable-file=DBR001\n"
+        "y = 2  # noqa: PBR003\n"
+    )
+
+    suppression_comments = get_suppression_comments(source_code=source_code)
+
+    assert suppression_comments.noqa_comments == [(4, {"PBR003"})]
+    assert suppression_comments.boa_directives == [
+        BoaDirective(line_number=1, action="disable", rule_ids=frozenset({"PBR001", "PBR002"})),
+        BoaDirective(line_number=2, action="enable", rule_ids=frozenset({"PBR001"})),
+        BoaDirective(line_number=3, action="disable-file", rule_ids=frozenset({"DBR001"})),
+    ]
+
+
+def test_get_suppression_comments_ignores_unknown_boa_directive():
+    suppression_comments = get_suppression_comments(source_code="# boa: silence=PBR001\n# boa disable=PBR001\n")
+
+    assert suppression_comments.boa_directives == []
+
+
+@pytest.mark.parametrize(
+    "source_code",
+    [
+        'x = "# boa: disable=PBR001"\n',
+        'x = """\n# boa: disable-file=PBR001\n"""  # boa: enable=PBR001\n',
+        "# boa: disable=PBR001\ny = 1  # noqa: PBR002  # boa: enable=PBR001\n",
+    ],
+)
+def test_get_suppression_comments_node_index_matches_tokenizer(source_code):
+    assert get_suppression_comments(
+        source_code=source_code, node_index=NodeIndex(source_tree=ast.parse(source_code))
+    ) == get_suppression_comments(source_code=source_code)
@@ -0,0 +1,63 @@
+from boa_restrictor.common.prefilter import KeywordPrefilter
+from boa_restrictor.common.rule import Rule
+
+
+class NowRule(Rule):
+    TRIGGER_KEYWORDS = ("now",)
+
+
+class AssertBooleanRule(Rule):
+    TRIGGER_KEYWORDS = ("assertTrue", "assertFalse")
+
+
+class AssertRule(Rule):
+    TRIGGER_KEYWORDS = ("assert",)
+
+
+class AlwaysRule(Rule):
+    pass
+
+
+def test_find_keywords_finds_all_contained_keywords():
+    prefilter = KeywordPrefilter(rule_classes=(NowRule, AssertBooleanRule, AlwaysRule))
+
+    keywords = prefilter.find_keywords(source_code="x = datetime.now()\nself.assertFalse(x)")
+
+    assert keywords == {"now", "assertFalse"}
+
+
+def test_find_keywords_nothing_found():
+    prefilter = KeywordPrefilter(rule_classes=(NowRule, AssertBooleanRule))
+
+    assert prefilter.find_keywords(source_code="x = 1") == frozenset()
+
+
+def test_find_keywords_without_any_keywords():
+    prefilter = KeywordPrefilter(rule_classes=(AlwaysRule,))
+
+    assert prefilter.find_keywords(source_code="x = datetime.now()") == frozenset()
+
+
+def test_find_keywords_prefix_keyword_found_inside_longer_one():
+    prefilter = KeywordPrefilter(rule_classes=(AssertBooleanRule, AssertRule))
+
+    assert prefilter.find_keywords(source_code="self.assertTrue(x)") == {"assertTrue", "assert"}
+
+
+def test_find_keywords_overlapping_keywords():
+    class OverlappingRule(Rule):
+        TRIGGER_KEYWORDS = ("nowhere", "here")
+
+    prefilter = KeywordPrefilter(rule_classes=(OverlappingRule, NowRule))
+
+    assert prefilter.find_keywords(source_code="# nowhere") == {"nowhere", "now", "here"}
+
+
+def test_is_triggered():
+    assert KeywordPrefilter.is_triggered(rule_class=NowRule, keywords=frozenset({"now"})) is True
+    assert KeywordPrefilter.is_triggered(rule_class=AssertBooleanRule, keywords=frozenset({"assertFalse"})) is True
+    assert KeywordPrefilter.is_triggered(rule_class=NowRule, keywords=frozenset({"assertFalse"})) is False
+
+
+def test_is_triggered_without_keywords_always():
+    assert KeywordPrefilter.is_triggered(rule_class=AlwaysRule, keywords=frozenset()) is True
@@ -4,6 +4,7 @@ from unittest import mock
 
 import pytest
 
+from boa_restrictor.common.file_context import FileContext
 from boa_restrictor.common.rule import Rule
 
 
@@ -27,3 +28,55 @@ def test_init_variables_set():
 def test_check_not_implemented():
     with pytest.raises(NotImplementedError):
         Rule.run_check(file_path=Path("my/file.py"), source_tree=ast.parse("a=1"))
+
+
+def test_init_node_index_built_if_omitted():
+    parsed_source_code = ast.parse("class A:\n    pass\ndef b():\n    pass")
+
+    class ClassRule(Rule):
+        NODE_TYPES = (ast.ClassDef,)
+
+    rule = ClassRule(file_path=Path("my/file.py"), source_tree=parsed_source_code)
+
+    assert rule.node_index[ast.FunctionDef] == [parsed_source_code.body[1]]
+    assert rule.nodes == [parsed_source_code.body[0]]
+
+
+def test_init_context_passed_is_used():
+    parsed_source_code = ast.parse("class A:\n    pass")
+    context = FileContext(file_path=Path("my/file.py"), source_tree=parsed_source_code)
+
+    rule = Rule(file_path=Path("my/file.py"), source_tree=parsed_source_code, context=context)
+
+    assert rule.context is context
+    assert rule.node_index is context.node_index
+
+
+def test_init_context_created_if_omitted():
+    parsed_source_code = ast.parse("class A:\n    pass")
+
+    rule = Rule(file_path=Path("my/file.py"), source_tree=parsed_source_code)
+
+    assert rule.context.file_path == Path("my/file.py")
+    assert rule.context.source_tree is parsed_source_code
+
+
+def test_nodes_empty_without_node_types():
+    rule = Rule(file_path=Path("my/file.py"), source_tree=ast.parse("class A:\n    pass"))
+
+    assert rule.nodes == []
+
+
+def test_is_applicable_by_default():
+    assert Rule.is_applicable(file_path=Path("my/file.py")) is True
+
+
+@mock.patch.object(Rule, "check")
+def test_run_check_skips_not_applicable_file(mocked_check):
+    class TestOnlyRule(Rule):
+        @classmethod
+        def is_applicable(cls, *, file_path: Path) -> bool:
+            return False
+
+    assert TestOnlyRule.run_check(file_path=Path("my/file.py"), source_tree=ast.parse("a=1")) == []
+    mocked_check.assert_not_called()
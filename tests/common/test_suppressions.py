@@ -0,0 +1,133 @@
+import ast
+from pathlib import Path
+from unittest import mock
+
+from boa_restrictor.common import suppressions as suppressions_module
+from boa_restrictor.common.node_index import NodeIndex
+from boa_restrictor.common.noqa import SuppressionComments
+from boa_restrictor.common.suppressions import Suppressions
+from boa_restrictor.projections.occurrence import Occurrence
+
+
+def _create_occurrence(*, rule_id: str, line_number: int) -> Occurrence:
+    return Occurrence(
+        rule_id=rule_id,
+        rule_label="Label",
+        filename="module.py",
+        file_path=Path("module.py"),
+        identifier=None,
+        line_number=line_number,
+    )
+
+
+def test_suppressions_from_noqa_comments():
+    suppressions = Suppressions.from_noqa_comments(noqa_comments=[(1, {"PBR001", "PBR002"}), (3, {"PBR001"})])
+
+    assert suppressions.get_suppressed_lines(rule_id="PBR001") == frozenset({1, 3})
+    assert suppressions.get_suppressed_lines(rule_id="PBR002") == frozenset({1})
+    assert suppressions.get_suppressed_lines(rule_id="PBR003") == frozenset()
+
+
+def test_suppressions_is_suppressed():
+    suppressions = Suppressions.collect(source_code="x = 1  # noqa: PBR001\ny = 2\n")
+
+    assert suppressions.is_suppressed(rule_id="PBR001", line_number=1) is True
+    assert suppressions.is_suppressed(rule_id="PBR001", line_number=2) is False
+    assert suppressions.is_suppressed(rule_id="PBR0011", line_number=1) is False
+
+
+def test_suppressions_collect_without_noqa_skips_tokenizing():
+    with mock.patch.object(suppressions_module, "get_suppression_comments") as mocked_get_suppression_comments:
+        suppressions = Suppressions.collect(source_code="x = 1  # Great!\n")
+
+    mocked_get_suppression_comments.assert_not_called()
+    assert not suppressions
+
+
+def test_suppressions_collect_uses_suppression_comments_getter():
+    suppression_comments_getter = mock.Mock(
+        return_value=SuppressionComments(noqa_comments=[(2, {"PBR001"})], boa_directives=[])
+    )
+
+    suppressions = Suppressions.collect(
+        source_code="x = 1  # NOQA\n", filename="module.py", suppression_comments_getter=suppression_comments_getter
+    )
+
+    suppression_comments_getter.assert_called_once_with(
+        source_code="x = 1  # NOQA\n", filename="module.py", node_index=None
+    )
+    assert suppressions.is_suppressed(rule_id="PBR001", line_number=2) is True
+
+
+def test_suppressions_filter_occurrences():
+    suppressions = Suppressions.from_noqa_comments(noqa_comments=[(1, {"PBR001"})])
+    occurrences = [
+        _create_occurrence(rule_id="PBR001", line_number=1),
+        _create_occurrence(rule_id="PBR002", line_number=1),
+        _create_occurrence(rule_id="PBR001", line_number=2),
+    ]
+
+    assert suppressions.filter_occurrences(occurrences=occurrences) == occurrences[1:]
+
+
+def test_suppressions_boa_directive_ranges():
+    suppressions = Suppressions.collect(
+        source_code=(
+            "a = 1\n"
+            "# boa: disable=PBR001, PBR002\n"
+            "b = 2\n"
+            "# boa: enable=PBR001\n"
+            "c = 3\n"
+            "d = 4  # boa: disable=PBR001\n"
+            "e = 5\n"
+        )
+    )
+
+    assert [
+        line_number
+        for line_number in range(1, 8)
+        if suppressions.is_suppressed(rule_id="PBR001", line_number=line_number)
+    ] == [2, 3, 6, 7]
+    assert [
+        line_number
+        for line_number in range(1, 8)
+        if suppressions.is_suppressed(rule_id="PBR002", line_number=line_number)
+    ] == [2, 3, 4, 5, 6, 7]
+    assert suppressions.is_suppressed(rule_id="PBR003", line_number=3) is False
+
+
+def test_suppressions_boa_directive_repeated_and_unmatched():
+    suppressions = Suppressions.collect(
+        source_code=(
+            "# boa: enable=PBR001\n"
+            "# boa: disable=PBR001\n"
+            "# boa: disable=PBR001\n"
+            "# boa: enable=PBR001\n"
+            "# boa: enable=PBR001\n"
+            "a = 1\n"
+        )
+    )
+
+    assert [
+        line_number
+        for line_number in range(1, 7)
+        if suppressions.is_suppressed(rule_id="PBR001", line_number=line_number)
+    ] == [2, 3]
+
+
+def test_suppressions_boa_directive_in_string_ignored():
+    source_code = 'x = """\n# boa: disable-file=PBR001\n"""\n'
+
+    suppressions = Suppressions.collect(
+        source_code=source_code, node_index=NodeIndex(source_tree=ast.parse(source_code))
+    )
+
+    assert not suppressions
+
+
+def test_suppressions_disable_file():
+    suppressions = Suppressions.collect(source_code="x = 1\n# boa: disable-file=PBR001 -- legacy module\n")
+
+    assert suppressions.disabled_rule_ids == frozenset({"PBR001"})
+    assert suppressions.is_suppressed(rule_id="PBR001", line_number=1) is True
+    assert suppressions.is_suppressed(rule_id="PBR002", line_number=1) is False
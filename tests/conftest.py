@@ -0,0 +1,12 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def user_cache_dir(tmp_path_factory, monkeypatch):
+    """
+    Keep the user's cache directory (see `boa_restrictor.cli.plugins.get_user_cache_dir()`) out of the tests, also
+    for the CLI run in subprocesses.
+    """
+    user_cache_dir = tmp_path_factory.mktemp("user-cache")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(user_cache_dir))
+    return user_cache_dir
@@ -0,0 +1,10 @@
+import pytest
+
+from boa_restrictor.exceptions.baseline import InvalidBaselineError
+
+
+def test_invalid_baseline_error():
+    exception = InvalidBaselineError(path="baseline.json", reason="it is outdated")
+
+    with pytest.raises(InvalidBaselineError, match=r'Baseline file "baseline.json" can\'t be used: it is outdated'):
+        raise exception
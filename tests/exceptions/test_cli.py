@@ -0,0 +1,10 @@
+import pytest
+
+from boa_restrictor.exceptions.cli import InvalidJobCountError
+
+
+def test_invalid_job_count_error():
+    exception = InvalidJobCountError(value="many")
+
+    with pytest.raises(InvalidJobCountError, match=r'invalid job count "many", expected a positive number or "auto"'):
+        raise exception
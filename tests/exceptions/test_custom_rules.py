@@ -4,8 +4,11 @@ from boa_restrictor.exceptions.custom_rules import (
     CustomRuleConfigurationError,
     CustomRuleError,
     CustomRuleImportError,
+    CustomRuleMetadataMismatchError,
     CustomRuleValidationError,
     DuplicateRuleIdError,
+    InvalidCustomRuleDeclarationError,
+    InvalidRuleEntryPointError,
 )
 
 
@@ -16,6 +19,9 @@ from boa_restrictor.exceptions.custom_rules import (
         CustomRuleImportError,
         CustomRuleValidationError,
         DuplicateRuleIdError,
+        InvalidCustomRuleDeclarationError,
+        CustomRuleMetadataMismatchError,
+        InvalidRuleEntryPointError,
     ],
 )
 def test_custom_rule_errors_inherit_from_base(exc_cls):
@@ -29,3 +35,29 @@ def test_custom_rule_error_inherits_from_value_error():
 def test_custom_rule_error_carries_message():
     with pytest.raises(CustomRuleError, match="boom"):
         raise CustomRuleError("boom")
+
+
+def test_invalid_custom_rule_declaration_error_message():
+    with pytest.raises(InvalidCustomRuleDeclarationError, match=r"Invalid custom rule declaration .* \"rule_id\" is"):
+        raise InvalidCustomRuleDeclarationError(value={"path": "myproject.MyRule"}, reason='"rule_id" is required.')
+
+
+def test_custom_rule_metadata_mismatch_error_message():
+    with pytest.raises(CustomRuleMetadataMismatchError, match=r'declared with rule_id "MYP002" .* sets "MYP001"'):
+        raise CustomRuleMetadataMismatchError(
+            dotted_path="myproject.MyRule", key="rule_id", declared_value="MYP002", value="MYP001"
+        )
+
+
+def test_custom_rule_metadata_mismatch_error_message_list():
+    with pytest.raises(
+        CustomRuleMetadataMismatchError, match=r'declared with trigger_keywords \["foo"\] .* sets \["foo", "bar"\]'
+    ):
+        raise CustomRuleMetadataMismatchError(
+            dotted_path="myproject.MyRule", key="trigger_keywords", declared_value=["foo"], value=["foo", "bar"]
+        )
+
+
+def test_invalid_rule_entry_point_error_message():
+    with pytest.raises(InvalidRuleEntryPointError, match=r'"MYP001 = myproject" of distribution "myproject"'):
+        raise InvalidRuleEntryPointError(name="MYP001", value="myproject", distribution_name="myproject")
@@ -1,3 +1,5 @@
+import pickle
+
 import pytest
 
 from boa_restrictor.exceptions.syntax_errors import BoaRestrictorParsingError
@@ -8,3 +10,12 @@ def test_parsing_error():
 
     with pytest.raises(BoaRestrictorParsingError, match=r'Source code of file "my_file" contains syntax errors.'):
         raise exception
+
+
+def test_parsing_error_pickle_roundtrip():
+    exception = BoaRestrictorParsingError(filename="my_file")
+
+    unpickled_exception = pickle.loads(pickle.dumps(exception))
+
+    assert unpickled_exception.filename == "my_file"
+    assert str(unpickled_exception) == str(exception)
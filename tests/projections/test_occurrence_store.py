@@ -0,0 +1,136 @@
+import pickle
+import sys
+from pathlib import Path
+
+import pytest
+
+from boa_restrictor.projections.occurrence import Occurrence
+from boa_restrictor.projections.occurrence_store import OccurrenceStore
+
+
+def _create_occurrence(*, rule_id: str = "PBR001", filename: str = "module.py", line_number: int = 1, identifier=None):
+    return Occurrence(
+        rule_id=rule_id,
+        rule_label=f"Label of {rule_id}",
+        filename=filename,
+        file_path=Path("src") / filename,
+        identifier=identifier,
+        line_number=line_number,
+    )
+
+
+OCCURRENCES = [
+    _create_occurrence(rule_id="PBR002", filename="b.py", line_number=7, identifier="function"),
+    _create_occurrence(rule_id="PBR001", filename="a.py", line_number=3),
+    _create_occurrence(rule_id="PBR002", filename="a.py", line_number=3, identifier="Class"),
+    _create_occurrence(rule_id="PBR001", filename="b.py", line_number=100_000),
+]
+
+
+def test_occurrence_store_iteration_returns_occurrences():
+    occurrence_store = OccurrenceStore(OCCURRENCES)
+
+    assert len(occurrence_store) == len(OCCURRENCES)
+    assert list(occurrence_store) == OCCURRENCES
+    assert occurrence_store[-1] == OCCURRENCES[-1]
+
+
+def test_occurrence_store_interns_rules_and_files():
+    occurrence_store = OccurrenceStore(OCCURRENCES)
+
+    rules = {(occurrence.rule_id, occurrence.rule_label) for occurrence in occurrence_store}
+    file_paths = {id(occurrence.file_path) for occurrence in occurrence_store}
+    assert len(rules) == 2  # noqa: PLR2004
+    assert len(file_paths) == 2  # noqa: PLR2004
+
+
+def test_occurrence_store_empty():
+    occurrence_store = OccurrenceStore()
+
+    assert not occurrence_store
+    assert list(occurrence_store) == []
+    assert occurrence_store.count_by_rule() == {}
+
+
+def test_occurrence_store_sort():
+    occurrence_store = OccurrenceStore(OCCURRENCES)
+
+    occurrence_store.sort()
+
+    assert [(occurrence.filename, occurrence.line_number, occurrence.rule_id) for occurrence in occurrence_store] == [
+        ("a.py", 3, "PBR001"),
+        ("a.py", 3, "PBR002"),
+        ("b.py", 7, "PBR002"),
+        ("b.py", 100_000, "PBR001"),
+    ]
+    assert occurrence_store[1].identifier == "Class"
+
+
+def test_occurrence_store_group_by_file():
+    occurrence_store = OccurrenceStore(OCCURRENCES)
+
+    assert list(occurrence_store.group_by_file()) == [
+        (Path("src/b.py"), [OCCURRENCES[0], OCCURRENCES[3]]),
+        (Path("src/a.py"), [OCCURRENCES[1], OCCURRENCES[2]]),
+    ]
+
+
+def test_occurrence_store_counts():
+    occurrence_store = OccurrenceStore(OCCURRENCES)
+
+    assert occurrence_store.count_by_rule() == {"PBR002": 2, "PBR001": 2}
+    assert occurrence_store.count_by_file() == {Path("src/b.py"): 2, Path("src/a.py"): 2}
+
+
+def test_occurrence_store_pickle():
+    occurrence_store = OccurrenceStore(OCCURRENCES)
+
+    assert pickle.loads(pickle.dumps(occurrence_store)) == occurrence_store
+
+
+def test_occurrence_store_bytes_round_trip():
+    occurrence_store = OccurrenceStore(OCCURRENCES)
+
+    restored_occurrence_store = OccurrenceStore.from_bytes(occurrence_store.to_bytes())
+
+    assert restored_occurrence_store == occurrence_store
+    assert list(restored_occurrence_store) == OCCURRENCES
+    assert restored_occurrence_store.count_by_file() == occurrence_store.count_by_file()
+
+
+def test_occurrence_store_bytes_round_trip_keeps_interning():
+    restored_occurrence_store = OccurrenceStore.from_bytes(OccurrenceStore(OCCURRENCES).to_bytes())
+
+    restored_occurrence_store.append(_create_occurrence(rule_id="PBR001", filename="a.py", line_number=5))
+
+    assert len(restored_occurrence_store._rules) == 2  # noqa: PLR2004
+    assert len(restored_occurrence_store._files) == 2  # noqa: PLR2004
+
+
+def test_occurrence_store_bytes_round_trip_empty():
+    assert list(OccurrenceStore.from_bytes(OccurrenceStore().to_bytes())) == []
+
+
+def test_occurrence_store_bytes_compact():
+    occurrences = [_create_occurrence(line_number=line_number) for line_number in range(1, 1001)]
+
+    data = OccurrenceStore(occurrences).to_bytes()
+
+    # The rule label and paths are only stored once, every further occurrence takes up four integers
+    assert len(data) < 1000 * 4 * 4 + 500
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        OccurrenceStore(OCCURRENCES).to_bytes()[:-1],
+        OccurrenceStore(OCCURRENCES).to_bytes().replace(b'"version": 1', b'"version": 0'),
+        OccurrenceStore(OCCURRENCES)
+        .to_bytes()
+        .replace(sys.byteorder.encode(), b"big" if sys.byteorder == "little" else b"little"),
+        b"not serialized occurrences",
+    ],
+)
+def test_occurrence_store_from_bytes_invalid(data):
+    with pytest.raises(ValueError):
+        OccurrenceStore.from_bytes(data)
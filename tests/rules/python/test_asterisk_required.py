@@ -192,3 +192,18 @@ def test_lambda_not_matched():
     occurrences = AsteriskRequiredRule.run_check(file_path=Path("/path/to/file/my_file.py"), source_tree=source_tree)
 
     assert len(occurrences) == 0
+
+
+def test_nested_functions_reported_in_source_order():
+    source_tree = ast.parse("""def outer(a):
+    def inner(b):
+        def innermost(c):
+            pass
+
+    def other(d):
+        pass
+""")
+
+    occurrences = AsteriskRequiredRule.run_check(file_path=Path("/path/to/file/my_file.py"), source_tree=source_tree)
+
+    assert [occurrence.identifier for occurrence in occurrences] == ["outer", "inner", "innermost", "other"]
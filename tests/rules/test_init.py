@@ -1,9 +1,18 @@
+import ast
 import importlib
 import inspect
+import subprocess
+import sys
 from pathlib import Path
 
+import pytest
+
+from boa_restrictor import rules as rules_module
 from boa_restrictor.common.rule import Rule
-from boa_restrictor.rules import BOA_RESTRICTOR_RULES, DJANGO_BOA_RULES, get_rules
+from boa_restrictor.rules import BOA_RESTRICTOR_RULES, DJANGO_BOA_RULES, get_rule_registrations, get_rules
+from boa_restrictor.rules.registry import BOA_RESTRICTOR_RULE_REGISTRY, DJANGO_BOA_RULE_REGISTRY
+
+REPOSITORY_ROOT = Path(__file__).parents[2]
 
 
 def _concrete_rule_classes_on_disk() -> set[type[Rule]]:
@@ -41,3 +50,45 @@ def test_get_rules_django_rules_enabled():
 
 def test_get_rules_django_rules_disabled():
     assert get_rules(use_django_rules=False) == BOA_RESTRICTOR_RULES
+
+
+def test_get_rules_excluded_rules_skipped():
+    assert get_rules(use_django_rules=False, excluded_rule_ids={"PBR002", "PBR010"}) == tuple(
+        rule_class for rule_class in BOA_RESTRICTOR_RULES if rule_class.RULE_ID not in {"PBR002", "PBR010"}
+    )
+
+
+def test_get_rule_registrations_django_rules_disabled():
+    assert get_rule_registrations(use_django_rules=False) == BOA_RESTRICTOR_RULE_REGISTRY
+
+
+def test_get_rule_registrations_django_rules_enabled():
+    assert get_rule_registrations(use_django_rules=True) == BOA_RESTRICTOR_RULE_REGISTRY + DJANGO_BOA_RULE_REGISTRY
+
+
+def test_rules_module_unknown_attribute():
+    with pytest.raises(AttributeError, match=r"has no attribute 'UnknownRule'"):
+        rules_module.UnknownRule  # noqa: B018
+
+
+def test_get_rules_excluded_rule_modules_not_imported():
+    """
+    The modules of excluded rules must not be imported at all, so they can't slow down starting the linter.
+    """
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys; from boa_restrictor.rules import get_rules; "
+            "get_rules(use_django_rules=False, excluded_rule_ids={'PBR002'}); "
+            "print(sorted(name for name in sys.modules if name.startswith('boa_restrictor.rules.python.')))",
+        ],
+        capture_output=True,
+        check=True,
+        cwd=REPOSITORY_ROOT,
+        text=True,
+    )
+
+    imported_modules = set(ast.literal_eval(result.stdout))
+    assert "boa_restrictor.rules.python.asterisk_required" in imported_modules
+    assert "boa_restrictor.rules.python.return_type_hints" not in imported_modules
@@ -0,0 +1,30 @@
+import pytest
+
+from boa_restrictor.rules.python.asterisk_required import AsteriskRequiredRule
+from boa_restrictor.rules.registry import BOA_RESTRICTOR_RULE_REGISTRY, DJANGO_BOA_RULE_REGISTRY, RuleRegistration
+
+
+def test_rule_registration_load():
+    rule_registration = RuleRegistration(
+        rule_id="PBR001",
+        module_path="boa_restrictor.rules.python.asterisk_required",
+        class_name="AsteriskRequiredRule",
+    )
+
+    assert rule_registration.load() is AsteriskRequiredRule
+
+
+@pytest.mark.parametrize("rule_registration", BOA_RESTRICTOR_RULE_REGISTRY + DJANGO_BOA_RULE_REGISTRY)
+def test_rule_registry_matches_rule_classes(rule_registration):
+    rule_class = rule_registration.load()
+
+    assert rule_class.__name__ == rule_registration.class_name
+    assert rule_class.RULE_ID == rule_registration.rule_id
+
+
+def test_rule_registry_rule_ids_unique():
+    rule_ids = [
+        rule_registration.rule_id for rule_registration in BOA_RESTRICTOR_RULE_REGISTRY + DJANGO_BOA_RULE_REGISTRY
+    ]
+
+    assert len(rule_ids) == len(set(rule_ids))